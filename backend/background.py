@@ -0,0 +1,49 @@
+"""
+Periodic background work shared by the app's workers: one asyncio task per worker, started and
+stopped from the FastAPI lifespan
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+class PeriodicTask:
+    """Runs run_once() and then wait() in a loop, in a single asyncio task between start() and stop().
+
+    A failed run is logged under the subclass's module logger and the loop carries on; override
+    wait() to wake up early, e.g. on an event.
+    """
+
+    failure_message = "Background task failed"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self):
+        raise NotImplementedError
+
+    async def wait(self):
+        await asyncio.sleep(self.interval)
+
+    async def _run(self):
+        logger = logging.getLogger(type(self).__module__)
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.warning(f"⚠️  {self.failure_message}: {e}")
+            await self.wait()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,3 @@
+"""
+Offline benchmark and load-test suite, see bench_pipeline.py and load.py
+"""
@@ -0,0 +1,117 @@
+"""
+Micro-benchmarks for the game generation pipeline, fully offline
+
+Covers fixture RSS fetching (cold and conditional 304), spaCy noun extraction, the game pipeline's
+parse and level-gate stages, corruption and whole-game generation. Run from backend/:
+
+    python -m benchmarks.bench_pipeline                  # compare against benchmarks/baselines.json
+    python -m benchmarks.bench_pipeline --save-baseline  # record this machine's numbers
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import sys
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List
+
+import feedparser
+
+from benchmarks.common import DEFAULT_TOLERANCE, FIXTURE_DIR, fixture_feed_server, measure, report
+import game_pipeline
+from data_pipeline import PIPE_STREAM_BATCH_SIZE, FrenchNewsProcessor
+from feed_fetcher import AsyncFeedFetcher
+from headline_store import HeadlineStore
+from challenge_pool import LANGUAGE_LEVELS
+
+SUITE = "pipeline"
+
+def fixture_headlines() -> List[str]:
+    return [
+        entry.title
+        for path in sorted(FIXTURE_DIR.glob("*.xml"))
+        for entry in feedparser.parse(str(path)).entries
+    ]
+
+def bench_feeds(repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    loop = asyncio.new_event_loop()
+    try:
+        with fixture_feed_server() as urls:
+            def cold_fetch():
+                fetcher = AsyncFeedFetcher(feeds=urls)
+                loop.run_until_complete(fetcher.fetch_all())
+                loop.run_until_complete(fetcher.aclose())
+
+            warm_fetcher = AsyncFeedFetcher(feeds=urls)
+            results["feed_fetch_cold"] = measure(cold_fetch, repeat)
+            results["feed_fetch_not_modified"] = measure(
+                lambda: loop.run_until_complete(warm_fetcher.fetch_all()), repeat
+            )
+            loop.run_until_complete(warm_fetcher.aclose())
+    finally:
+        loop.close()
+    return results
+
+def bench_nlp(processor: FrenchNewsProcessor, headlines: List[str], repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    cycle = itertools.cycle(headlines)
+    results["extract_nouns_with_gender"] = measure(lambda: processor.extract_nouns_with_gender(next(cycle)), repeat)
+
+    # The stages generate_game_data chains, each measured over the whole fixture pool
+    parse = game_pipeline.parse(processor.nlp, PIPE_STREAM_BATCH_SIZE)
+    results[f"parse_stage[{len(headlines)}]"] = measure(
+        lambda: game_pipeline.take(game_pipeline.run(headlines, [parse]), len(headlines)), max(1, repeat // 20)
+    )
+
+    parsed = game_pipeline.take(game_pipeline.run(headlines, [parse]), len(headlines))
+    for level in LANGUAGE_LEVELS:
+        results[f"level_gate[{level}]"] = measure(
+            lambda: list(game_pipeline.level_gate(level, OrderedDict())(iter(parsed))), repeat
+        )
+
+    targeted = game_pipeline.take(game_pipeline.run(headlines, [
+        parse,
+        game_pipeline.extract_nouns(processor._nouns_from_doc),
+        game_pipeline.select_target(
+            lambda headline, doc, nouns: processor._select_target_noun(headline, doc, nouns, "intermediate")
+        ),
+    ]), len(headlines))
+
+    corruptible = itertools.cycle(targeted)
+    def corrupt():
+        record = next(corruptible)
+        processor.corrupt_sentence(record["headline"], record["target_noun"])
+    results["corrupt_sentence"] = measure(corrupt, repeat)
+
+    results["generate_game_data[10]"] = measure(
+        lambda: processor.generate_game_data(10, "beginner"), max(1, repeat // 20)
+    )
+    return results
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations per micro-benchmark")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed regression ratio")
+    args = parser.parse_args(argv)
+
+    random.seed(0)
+    headlines = fixture_headlines()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HeadlineStore(Path(tmp) / "headlines.db")
+        store.add([(headline, "fixture") for headline in headlines])
+        processor = FrenchNewsProcessor(headline_store=store)
+        processor.use_agent = False  # Benchmark our own code path, not LLM round trips
+
+        results = bench_feeds(max(1, args.repeat // 10))
+        results.update(bench_nlp(processor, headlines, args.repeat))
+        store.close()
+
+    return report(SUITE, results, args.save_baseline, args.tolerance)
+
+if __name__ == "__main__":
+    sys.exit(main())
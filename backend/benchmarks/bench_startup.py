@@ -0,0 +1,108 @@
+"""
+Cold-start benchmark: import time of main, time to the first served request and time to readiness
+
+Each run is a fresh interpreter with throwaway databases and fixture feeds. The first request is a
+vocabulary game, which must not wait for spaCy or LangChain; readiness is /health turning 200 once
+the NLP engine has loaded. Heavy modules found in sys.modules right after importing main are
+reported as eager imports. Run from backend/:
+
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --importtime   # also list the slowest imports
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.common import DEFAULT_TOLERANCE, fixture_feed_server, report, summarize
+from benchmarks.load import configure_local_env
+
+SUITE = "startup"
+BACKEND_DIR = Path(__file__).parent.parent
+HEAVY_MODULES = ("spacy", "feedparser", "bs4", "mistralai", "langchain_core", "langchain_mistralai", "langgraph")
+READY_TIMEOUT = 180.0
+
+PROBE = f"""
+import asyncio, json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+eager = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+
+async def probe():
+    import httpx
+    result = {{}}
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://probe") as client:
+            response = await client.post("/api/start-game", json={{"mode": "vocabulary"}})
+            response.raise_for_status()
+            result["first_request_s"] = time.perf_counter() - started
+            while time.perf_counter() - started < {READY_TIMEOUT}:
+                if (await client.get("/health")).status_code == 200:
+                    result["ready_s"] = time.perf_counter() - started
+                    break
+                await asyncio.sleep(0.05)
+    return result
+
+result = asyncio.run(probe())
+result.update(import_s=imported - started, eager_imports=eager)
+print("PROBE " + json.dumps(result))
+"""
+
+def run_probe(env: Dict[str, str], importtime: bool) -> Dict:
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", PROBE]
+    completed = subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+    line = next(line for line in completed.stdout.splitlines() if line.startswith("PROBE "))
+    result = json.loads(line[len("PROBE "):])
+    if importtime:
+        result["importtime"] = completed.stderr
+    return result
+
+def slowest_imports(importtime_output: str, top: int = 15) -> List[str]:
+    """Top-level packages by cumulative import time from -X importtime output"""
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # Nested imports are indented further
+            rows.append((int(cumulative), name.strip()))
+    return [f"{name:<28} {micros / 1000:>9.1f} ms" for micros, name in sorted(rows, reverse=True)[:top]]
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start")
+    parser.add_argument("--importtime", action="store_true", help="Print the slowest top-level imports of the last run")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed regression ratio")
+    args = parser.parse_args(argv)
+
+    samples: Dict[str, List[float]] = {"import_main": [], "first_request": [], "ready": []}
+    eager = set()
+    last = {}
+    with tempfile.TemporaryDirectory() as tmp, fixture_feed_server() as feed_urls:
+        configure_local_env(Path(tmp), feed_urls, mistral_latency=0.0)
+        os.environ["MISTRAL_BACKEND"] = "mistral"  # Production import path, no key so no API calls
+        for run in range(args.runs):
+            last = run_probe(dict(os.environ), importtime=args.importtime and run == args.runs - 1)
+            samples["import_main"].append(last["import_s"])
+            samples["first_request"].append(last["first_request_s"])
+            if "ready_s" in last:
+                samples["ready"].append(last["ready_s"])
+            eager.update(last["eager_imports"])
+
+    results = {name: summarize(values, sum(values)) for name, values in samples.items() if values}
+    if eager:
+        print(f"⚠️  Imported eagerly by main: {', '.join(sorted(eager))}")
+    if "importtime" in last:
+        print("\n".join(slowest_imports(last["importtime"])))
+    return report(SUITE, results, args.save_baseline, args.tolerance)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Shared benchmark helpers: latency summaries, stored baselines and a local fixture RSS server
+"""
+
+import contextlib
+import functools
+import http.server
+import json
+import math
+import platform
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Sequence
+
+BENCHMARK_DIR = Path(__file__).parent
+FIXTURE_DIR = BENCHMARK_DIR / "fixtures"
+BASELINE_PATH = BENCHMARK_DIR / "baselines.json"
+DEFAULT_TOLERANCE = 0.25  # Allowed slowdown before a result counts as a regression
+NOISE_FLOOR_MS = 0.05  # Latency differences below this are timer noise, whatever the ratio
+
+def percentile(sorted_samples: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted sample"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+def summarize(samples: List[float], wall_seconds: float) -> Dict[str, float]:
+    """Throughput and latency percentiles (in ms) for per-operation timings in seconds"""
+    ordered = sorted(samples)
+    return {
+        "ops": len(ordered),
+        "throughput_per_s": round(len(ordered) / wall_seconds, 2) if wall_seconds else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+    }
+
+def measure(func: Callable[[], object], repeat: int, warmup: int = 3) -> Dict[str, float]:
+    """Call func repeatedly and summarize the per-call latency"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, time.perf_counter() - started)
+
+def print_results(results: Dict[str, Dict[str, float]]):
+    print(f"{'benchmark':<34} {'ops':>7} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, result in results.items():
+        print(f"{name:<34} {result['ops']:>7} {result['throughput_per_s']:>10} "
+              f"{result['p50_ms']:>9} {result['p95_ms']:>9} {result['p99_ms']:>9}")
+
+def load_baselines(path: Path = BASELINE_PATH) -> Dict[str, Dict]:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+def save_baselines(suite: str, results: Dict[str, Dict[str, float]], path: Path = BASELINE_PATH):
+    """Record results as the suite's baseline, with the machine they were measured on"""
+    baselines = load_baselines(path)
+    baselines[suite] = {
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": f"{platform.system()} {platform.machine()} / Python {platform.python_version()}",
+        "results": results
+    }
+    path.write_text(json.dumps(baselines, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+def compare_to_baseline(suite: str, results: Dict[str, Dict[str, float]], tolerance: float = DEFAULT_TOLERANCE,
+                        path: Path = BASELINE_PATH) -> List[str]:
+    """Return a description of every metric that regressed beyond tolerance or has no baseline"""
+    baseline = load_baselines(path).get(suite, {}).get("results", {})
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            regressions.append(f"{name}: no baseline")
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            slower = result[metric] - previous[metric]
+            if previous[metric] and slower > NOISE_FLOOR_MS and result[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name} {metric}: {previous[metric]} -> {result[metric]}")
+        if previous["mean_ms"] < NOISE_FLOOR_MS:
+            continue  # Throughput of microsecond operations mostly measures the timer
+        if previous["throughput_per_s"] and result["throughput_per_s"] < previous["throughput_per_s"] * (1 - tolerance):
+            regressions.append(f"{name} throughput_per_s: {previous['throughput_per_s']} -> {result['throughput_per_s']}")
+    return regressions
+
+def report(suite: str, results: Dict[str, Dict[str, float]], save: bool, tolerance: float) -> int:
+    """Print results, then save them or check them against the stored baseline; returns an exit code"""
+    print_results(results)
+    if save:
+        save_baselines(suite, results)
+        print(f"💾 Saved {suite} baseline to {BASELINE_PATH.name}")
+        return 0
+    if suite not in load_baselines():
+        print(f"❌ No {suite} baseline in {BASELINE_PATH.name}, record one with --save-baseline")
+        return 2
+    regressions = compare_to_baseline(suite, results, tolerance)
+    for regression in regressions:
+        print(f"❌ Regression: {regression}")
+    if not regressions:
+        print(f"✅ No regressions beyond {tolerance:.0%} against the {suite} baseline")
+    return 1 if regressions else 0
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+@contextlib.contextmanager
+def fixture_feed_server(directory: Path = FIXTURE_DIR) -> Iterator[List[str]]:
+    """Serve the fixture RSS files on localhost and yield their URLs.
+
+    SimpleHTTPRequestHandler answers If-Modified-Since with 304, so conditional GETs are exercised too.
+    """
+    handler = functools.partial(_QuietHandler, directory=str(directory))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        port = server.server_address[1]
+        yield [f"http://127.0.0.1:{port}/{feed.name}" for feed in sorted(directory.glob("*.xml"))]
+    finally:
+        server.shutdown()
+        server.server_close()
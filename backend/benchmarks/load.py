@@ -0,0 +1,158 @@
+"""
+End-to-end load driver: plays full 10-challenge games against /api/start-game and /api/submit-answer
+
+By default the app runs in-process (ASGI transport, lifespan included) with fixture RSS feeds, the
+fake Mistral client and throwaway databases, so results only depend on this code and this machine.
+Pass --url to drive a running server instead. Run from backend/:
+
+    python -m benchmarks.load --games 200 --concurrency 20
+    python -m benchmarks.load --url http://localhost:8000 --games 500
+    python -m benchmarks.load --save-baseline
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import AsyncIterator, Dict, List
+
+import httpx
+
+from benchmarks.common import DEFAULT_TOLERANCE, fixture_feed_server, report, summarize
+
+READY_TIMEOUT = 180.0
+POOL_SETTLE_CHECKS = 6
+
+def configure_local_env(tmp: Path, feed_urls: List[str], mistral_latency: float):
+    """Point every external dependency at local stand-ins, before main is imported"""
+    os.environ.update({
+        "MISTRAL_BACKEND": "fake",
+        "MISTRAL_API_KEY": "",  # Keeps .env from enabling the LangChain agent
+        "FAKE_MISTRAL_LATENCY_SECONDS": str(mistral_latency),
+        "RSS_FEED_URLS": ",".join(feed_urls),
+        "HEADLINE_DB_PATH": str(tmp / "headlines.db"),
+        "EXPLANATION_DB_PATH": str(tmp / "explanations.db"),
+        "SESSION_DB_PATH": str(tmp / "sessions.db"),
+        "VOCATINDER_SIGNING_KEY": "benchmark",
+    })
+
+@contextlib.asynccontextmanager
+async def local_client(mistral_latency: float) -> AsyncIterator[httpx.AsyncClient]:
+    with tempfile.TemporaryDirectory() as tmp, fixture_feed_server() as feed_urls:
+        configure_local_env(Path(tmp), feed_urls, mistral_latency)
+        import main  # Reads the environment above at import time
+
+        async with main.lifespan(main.app):
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                yield client
+
+async def wait_until_ready(client: httpx.AsyncClient, level: str, min_pool: int):
+    """Wait for the NLP engine and, for news games, a stocked challenge pool.
+
+    A small feed set may never fill min_pool challenges for a level, so a non-empty pool that has
+    stopped growing for POOL_SETTLE_CHECKS checks counts as stocked too.
+    """
+    deadline = time.monotonic() + READY_TIMEOUT
+    last_size, unchanged = -1, 0
+    while time.monotonic() < deadline:
+        response = await client.get("/health")
+        if response.status_code == 200:
+            size = response.json().get("challenge_pool", {}).get(level, 0)
+            unchanged = unchanged + 1 if size == last_size else 0
+            last_size = size
+            if min_pool == 0 or size >= min_pool or (size and unchanged >= POOL_SETTLE_CHECKS):
+                return
+        await asyncio.sleep(0.5)
+    raise TimeoutError("Service did not become ready in time")
+
+def choose(game_round: Dict, accuracy: float) -> str:
+    """Answer correctly with the given probability ("right" means correct grammar / masculine)"""
+    correct = "right" if game_round["correct_answer"] else "left"
+    if random.random() < accuracy:
+        return correct
+    return "left" if correct == "right" else "right"
+
+async def play_game(client: httpx.AsyncClient, level: str, mode: str, accuracy: float,
+                    samples: Dict[str, List[float]]):
+    game_start = time.perf_counter()
+    start = time.perf_counter()
+    response = await client.post("/api/start-game", json={"language_level": level, "mode": mode})
+    samples["start-game"].append(time.perf_counter() - start)
+    response.raise_for_status()
+
+    game_round = response.json()
+    while game_round:
+        start = time.perf_counter()
+        response = await client.post(
+            "/api/submit-answer",
+            json={"round_id": game_round["round_id"], "user_choice": choose(game_round, accuracy)}
+        )
+        samples["submit-answer"].append(time.perf_counter() - start)
+        response.raise_for_status()
+        game_round = response.json()["next_round"]
+    samples["full-game"].append(time.perf_counter() - game_start)
+
+async def drive(client: httpx.AsyncClient, games: int, concurrency: int, level: str, mode: str,
+                accuracy: float) -> Dict[str, Dict[str, float]]:
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(games):
+        queue.put_nowait(None)
+
+    async def player():
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            try:
+                await play_game(client, level, mode, accuracy, samples)
+            except httpx.HTTPError:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(player() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    if errors:
+        print(f"⚠️  {errors} of {games} games failed")
+    return {name: summarize(values, wall) for name, values in samples.items()}
+
+async def run(args) -> Dict[str, Dict[str, float]]:
+    min_pool = 0 if args.mode == "vocabulary" else 10
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=60.0) as client:
+            await wait_until_ready(client, args.level, min_pool)
+            return await drive(client, args.games, args.concurrency, args.level, args.mode, args.accuracy)
+
+    async with local_client(args.mistral_latency) as client:
+        await wait_until_ready(client, args.level, min_pool)
+        return await drive(client, args.games, args.concurrency, args.level, args.mode, args.accuracy)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Drive a running server instead of an in-process app")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--level", default="beginner")
+    parser.add_argument("--mode", default="news", choices=("news", "vocabulary"))
+    parser.add_argument("--accuracy", type=float, default=0.7, help="Share of correct answers, wrong ones need explanations")
+    parser.add_argument("--mistral-latency", type=float, default=0.3, help="Fake Mistral time to first token (in-process only)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed regression ratio")
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    results = asyncio.run(run(args))
+    suite = f"load-{'http' if args.url else 'inprocess'}-{args.mode}"
+    return report(suite, results, args.save_baseline, args.tolerance)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Pre-generated pool of ready challenges per language level, kept topped up by a background producer
+"""
+
+import asyncio
+import logging
+import os
+import random
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+from background import PeriodicTask
+from data_pipeline import FrenchNewsProcessor, FALLBACK_SENTENCES
+from telemetry import stage
+
+logger = logging.getLogger(__name__)
+
+LANGUAGE_LEVELS = ("beginner", "intermediate", "advanced")
+POOL_HIGH_WATER = int(os.getenv("CHALLENGE_POOL_HIGH_WATER", "60"))
+POOL_LOW_WATER = int(os.getenv("CHALLENGE_POOL_LOW_WATER", "20"))
+PRODUCER_INTERVAL = int(os.getenv("CHALLENGE_POOL_INTERVAL_SECONDS", "60"))
+
+def normalize_level(language_level: str) -> str:
+    """Map unknown levels to advanced, like the headline level filter does"""
+    return language_level if language_level in LANGUAGE_LEVELS else "advanced"
+
+def fallback_challenges(count: int) -> List[Dict]:
+    """Build challenges from the bundled fallback sentences"""
+    challenges = []
+    for _ in range(count):
+        fallback = random.choice(FALLBACK_SENTENCES)
+        corrupted_sentence, is_correct = FrenchNewsProcessor.corrupt_sentence(
+            fallback["original_sentence"],
+            fallback["target_noun"]
+        )
+        challenges.append({
+            "original_sentence": fallback["original_sentence"],
+            "display_sentence": corrupted_sentence,
+            "target_noun": fallback["target_noun"],
+            "is_correct": is_correct
+        })
+    return challenges
+
+class ChallengePool:
+    def __init__(self, levels=LANGUAGE_LEVELS, high_water: int = POOL_HIGH_WATER, low_water: int = POOL_LOW_WATER):
+        self.high_water = high_water
+        self.low_water = low_water
+        self._pools: Dict[str, Deque[Dict]] = {level: deque() for level in levels}
+        # Sentences currently queued per level, so one game never gets the same headline twice
+        self._queued: Dict[str, set] = {level: set() for level in levels}
+        self._refill_needed: Optional[asyncio.Event] = None
+
+    @property
+    def refill_needed(self) -> asyncio.Event:
+        if self._refill_needed is None:
+            self._refill_needed = asyncio.Event()
+        return self._refill_needed
+
+    def size(self, language_level: str) -> int:
+        return len(self._pools[normalize_level(language_level)])
+
+    def sizes(self) -> Dict[str, int]:
+        return {level: len(pool) for level, pool in self._pools.items()}
+
+    def deficit(self, language_level: str) -> int:
+        """How many challenges the level needs to reach the high-water mark"""
+        return max(0, self.high_water - self.size(language_level))
+
+    def add(self, language_level: str, challenges: List[Dict]) -> int:
+        """Queue new challenges for a level, skipping sentences already queued"""
+        level = normalize_level(language_level)
+        pool, queued = self._pools[level], self._queued[level]
+        added = 0
+        for challenge in challenges:
+            if len(pool) >= self.high_water:
+                break
+            sentence = challenge["original_sentence"]
+            if sentence in queued:
+                continue
+            queued.add(sentence)
+            pool.append(challenge)
+            added += 1
+        return added
+
+    def take(self, language_level: str, count: int) -> List[Dict]:
+        """Pop up to count ready challenges for a level"""
+        level = normalize_level(language_level)
+        pool, queued = self._pools[level], self._queued[level]
+        taken = []
+        while pool and len(taken) < count:
+            challenge = pool.popleft()
+            queued.discard(challenge["original_sentence"])
+            taken.append(challenge)
+
+        if len(pool) < self.low_water:
+            self.refill_needed.set()
+        return taken
+
+class ChallengeProducer(PeriodicTask):
+    """Refills the pool every interval, or as soon as a game start or ingest asks for a refill"""
+
+    failure_message = "Challenge producer failed"
+
+    def __init__(self, pool: ChallengePool, get_processor: Callable[[], FrenchNewsProcessor],
+                 interval: int = PRODUCER_INTERVAL):
+        super().__init__(interval)
+        self.pool = pool
+        self.get_processor = get_processor
+
+    async def fill_once(self) -> int:
+        """Top every level up towards the high-water mark"""
+        processor = await asyncio.to_thread(self.get_processor)
+        added = 0
+        for level in LANGUAGE_LEVELS:
+            deficit = self.pool.deficit(level)
+            if not deficit:
+                continue
+            with stage("generate_game"):
+                challenges = await asyncio.to_thread(processor.generate_game_data, deficit, level)
+            added += self.pool.add(level, challenges)
+        if added:
+            logger.info(f"🧩 Challenge pool topped up with {added} challenges {self.pool.sizes()}")
+        return added
+
+    async def run_once(self):
+        self.pool.refill_needed.clear()
+        await self.fill_once()
+
+    async def wait(self):
+        try:
+            await asyncio.wait_for(self.pool.refill_needed.wait(), timeout=self.interval)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,149 @@
+"""
+Sentence corruption engine: flips the gender agreement of one target noun in a single pass
+
+Agreement spans (determiner + agreeing adjectives of the noun) are computed once from the parsed
+spaCy Doc and stored on the noun record as (start, end, replacement) offsets. Corrupting a sentence
+is then a single splice over those offsets, with no re-parsing and no whole-sentence replace scans.
+"""
+
+import random
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Span = Tuple[int, int, str]
+
+# Determiners that carry gender, keyed by the noun's real gender
+DETERMINER_FLIPS = {
+    "masculine": {
+        "le": "la", "un": "une", "ce": "cette", "cet": "cette", "mon": "ma", "ton": "ta", "son": "sa",
+        "du": "de la", "au": "à la", "aucun": "aucune", "quel": "quelle", "nul": "nulle"
+    },
+    "feminine": {
+        "la": "le", "une": "un", "cette": "ce", "ma": "mon", "ta": "ton", "sa": "son",
+        "aucune": "aucun", "quelle": "quel", "nulle": "nul"
+    }
+}
+
+# Adjectives with an irregular other-gender form, masculine -> feminine
+ADJECTIVE_IRREGULARS = {
+    "vieux": "vieille", "blanc": "blanche", "franc": "franche", "sec": "sèche", "public": "publique",
+    "turc": "turque", "grec": "grecque", "long": "longue", "frais": "fraîche", "gros": "grosse",
+    "bas": "basse", "gras": "grasse", "épais": "épaisse", "faux": "fausse", "roux": "rousse",
+    "doux": "douce", "jaloux": "jalouse", "neuf": "neuve", "bref": "brève", "fou": "folle",
+    "mou": "molle", "nul": "nulle", "gentil": "gentille", "favori": "favorite", "aigu": "aiguë",
+    "malin": "maligne", "bénin": "bénigne", "muet": "muette", "net": "nette", "violet": "violette",
+    "complet": "complète", "secret": "secrète", "inquiet": "inquiète", "discret": "discrète",
+    "concret": "concrète", "sot": "sotte", "idiot": "idiote", "meilleur": "meilleure",
+    "majeur": "majeure", "mineur": "mineure", "cher": "chère", "amer": "amère",
+    "beau": "belle", "nouveau": "nouvelle", "jumeau": "jumelle", "rêveur": "rêveuse",
+    "travailleur": "travailleuse", "menteur": "menteuse", "trompeur": "trompeuse",
+    "moqueur": "moqueuse", "flatteur": "flatteuse", "prometteur": "prometteuse"
+}
+# Same form in both genders despite a flippable-looking ending
+INVARIABLE_ADJECTIVES = frozenset({"sale", "ovale", "super", "sévère", "sincère", "austère", "prospère"})
+
+# (ending, other-gender ending) rules, None marks endings whose other form can't be derived.
+# Adjectives matching no rule are left alone rather than given a made-up form.
+ADJECTIVE_FLIPS = {
+    "masculine": [
+        ("eau", "elle"), ("eux", "euse"), ("eil", "eille"), ("el", "elle"), ("en", "enne"),
+        ("on", "onne"), ("er", "ère"), ("if", "ive"), ("é", "ée"), ("i", "ie"), ("u", "ue"),
+        ("al", "ale"), ("in", "ine"), ("ant", "ante"), ("ent", "ente"), ("and", "ande"),
+        ("ond", "onde"), ("ard", "arde"), ("aud", "aude"), ("oid", "oide"), ("it", "ite"),
+        ("ut", "ute"), ("at", "ate"), ("ct", "cte"), ("rt", "rte"), ("is", "ise"),
+        ("ieur", "ieure"), ("eur", None), ("ur", "ure")
+    ],
+    "feminine": [
+        ("eille", "eil"), ("elle", "el"), ("euse", "eux"), ("enne", "en"), ("onne", "on"),
+        ("ière", "ier"), ("gère", "ger"), ("ère", None), ("ive", "if"), ("ée", "é"), ("ie", "i"),
+        ("que", None), ("gue", None), ("ue", "u"), ("ale", "al"), ("ine", "in"), ("ante", "ant"),
+        ("ente", "ent"), ("ande", "and"), ("onde", "ond"), ("arde", "ard"), ("aude", "aud"),
+        ("oide", "oid"), ("ette", "et"), ("ite", "it"), ("ute", "ut"), ("ate", "at"), ("cte", "ct"),
+        ("rte", "rt"), ("ise", "is"), ("ieure", "ieur"), ("eure", None), ("ure", "ur")
+    ]
+}
+# Longest endings first, so "ieur" is tried before "eur" and "ur"
+for _rules in ADJECTIVE_FLIPS.values():
+    _rules.sort(key=lambda rule: len(rule[0]), reverse=True)
+ADJECTIVE_IRREGULAR_FLIPS = {
+    "masculine": ADJECTIVE_IRREGULARS,
+    "feminine": {feminine: masculine for masculine, feminine in ADJECTIVE_IRREGULARS.items()}
+}
+
+GENDER_FEATURE = {"masculine": "Masc", "feminine": "Fem"}
+
+def _match_case(original: str, replacement: str) -> str:
+    return replacement[:1].upper() + replacement[1:] if original[:1].isupper() else replacement
+
+def flip_determiner(text: str, gender: str) -> Optional[str]:
+    flipped = DETERMINER_FLIPS[gender].get(text.lower())
+    return _match_case(text, flipped) if flipped else None
+
+def flip_adjective(text: str, gender: str) -> Optional[str]:
+    """Opposite-gender form of an adjective, or None when it is invariable or its form isn't known"""
+    lower = text.lower()
+    if lower in INVARIABLE_ADJECTIVES:
+        return None
+    irregular = ADJECTIVE_IRREGULAR_FLIPS[gender].get(lower)
+    if irregular:
+        return _match_case(text, irregular)
+    for ending, flipped in ADJECTIVE_FLIPS[gender]:
+        if lower.endswith(ending) and len(lower) > len(ending):
+            return text[:-len(ending)] + flipped if flipped else None
+    return None
+
+def agreement_spans(noun, gender: str) -> List[Span]:
+    """Offsets of the noun's own determiner and agreeing adjectives with their flipped forms"""
+    spans = []
+    for child in noun.children:
+        replacement = None
+        if child.dep_ in ("det", "case") or child.pos_ == "DET":
+            replacement = flip_determiner(child.text, gender)
+        elif child.dep_ == "amod" and child.pos_ == "ADJ":
+            # Only flip adjectives that actually agree with the noun's gender
+            # (the flip rules cover singular forms only)
+            adjective_gender = child.morph.get("Gender")
+            plural = "Plur" in child.morph.get("Number")
+            if not plural and (not adjective_gender or GENDER_FEATURE[gender] in adjective_gender):
+                replacement = flip_adjective(child.text, gender)
+        if replacement and replacement != child.text:
+            spans.append((child.idx, child.idx + len(child.text), replacement))
+    spans.sort()
+    return spans
+
+_WORD_BEFORE = re.compile(r"(\w+)\s+$")
+
+def text_spans(sentence: str, word: str, gender: str) -> List[Span]:
+    """Spans for sentences without a parse (fallback data): flip the word right before the noun"""
+    match = re.search(r"\b%s\b" % re.escape(word), sentence)
+    if not match:
+        return []
+    previous = _WORD_BEFORE.search(sentence[:match.start()])
+    if not previous:
+        return []
+    replacement = flip_determiner(previous.group(1), gender)
+    return [(previous.start(1), previous.end(1), replacement)] if replacement else []
+
+def apply_spans(sentence: str, spans: Iterable[Span]) -> str:
+    """Splice replacements into the sentence in one left-to-right pass"""
+    pieces = []
+    cursor = 0
+    for start, end, replacement in spans:
+        pieces.append(sentence[cursor:start])
+        pieces.append(replacement)
+        cursor = end
+    pieces.append(sentence[cursor:])
+    return "".join(pieces)
+
+def corrupt_sentence(sentence: str, target_noun: Dict, rng=random) -> Tuple[str, bool]:
+    """Randomly keep the sentence or flip the target noun's agreement, returns (sentence, is_correct)"""
+    if not rng.choice([True, False]):
+        return sentence, True  # Correct sentence
+
+    spans = target_noun.get("agreement_spans")
+    if spans is None:
+        spans = text_spans(sentence, target_noun["word"], target_noun["gender"])
+    if not spans:
+        return sentence, True  # Nothing visibly gendered to flip
+
+    return apply_spans(sentence, spans), False  # Incorrect sentence
@@ -2,97 +2,81 @@
 Data pipeline for scraping French news headlines and processing them for the game
 """
 
-import feedparser
-import spacy
+import logging
 import random
-import requests
-import feedparser
-from bs4 import BeautifulSoup
-from typing import List, Dict, Tuple
-from langchain_agent import FrenchGrammarAgent
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from nlp_models import get_nlp
+from headline_store import get_headline_store
+import corruption
+import game_pipeline
+from gender_lexicon import determine_gender
 import os
 import json
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# nlp.pipe settings for the parse stage
+PIPE_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "64"))
+PIPE_N_PROCESS = int(os.getenv("SPACY_N_PROCESS", "1"))
+# Smaller batches for the streaming game pipeline, so stopping early wastes little parsing
+PIPE_STREAM_BATCH_SIZE = int(os.getenv("SPACY_STREAM_BATCH_SIZE", "16"))
+# The LangChain stack is only imported when the agent is enabled and a Mistral key is set
+LANGCHAIN_AGENT_ENABLED = os.getenv("LANGCHAIN_AGENT", "1") == "1"
+
 class FrenchNewsProcessor:
-    def __init__(self):
-        # Load French spaCy model (download with: python -m spacy download fr_core_news_sm)
-        try:
-            self.nlp = spacy.load("fr_core_news_sm")
-        except OSError:
-            print("⚠️  French spaCy model not found. Run: python -m spacy download fr_core_news_sm")
-            raise
+    def __init__(self, nlp=None, headline_store=None, batch_size: int = PIPE_BATCH_SIZE, n_process: int = PIPE_N_PROCESS):
+        # Reuse a shared pipeline when given one, otherwise take it from the model registry
+        # (download with: python -m spacy download fr_core_news_sm)
+        self.nlp = nlp if nlp is not None else get_nlp()
+        self.batch_size = batch_size
+        # Recent headline difficulty, level gates band new headlines against it
+        self.difficulty_history: "OrderedDict[str, float]" = OrderedDict()
+        self.n_process = n_process
         
         # Initialize LangChain ReAct agent
         api_key = os.getenv("MISTRAL_API_KEY")
-        if api_key:
+        if api_key and LANGCHAIN_AGENT_ENABLED:
             try:
-                self.grammar_agent = FrenchGrammarAgent(api_key)
+                from langchain_agent import FrenchGrammarAgent
+                self.grammar_agent = FrenchGrammarAgent(api_key, nlp=self.nlp)
                 self.use_agent = True
-                print("✅ LangChain ReAct agent initialized with Mistral")
+                logger.info("✅ LangChain ReAct agent initialized with Mistral")
             except Exception as e:
-                print(f"⚠️  Failed to initialize LangChain agent: {e}")
+                logger.warning(f"⚠️  Failed to initialize LangChain agent: {e}")
                 self.use_agent = False
         else:
-            print("⚠️  MISTRAL_API_KEY not found, using fallback logic")
+            if api_key:
+                logger.info("LangChain agent disabled (LANGCHAIN_AGENT=0), using fallback logic")
+            else:
+                logger.warning("⚠️  MISTRAL_API_KEY not found, using fallback logic")
             self.use_agent = False
             
-        # Cache for headlines with timestamp
-        self._headline_cache = {"headlines": [], "timestamp": 0}
-        self._cache_duration = 300  # 5 minutes cache
+        # Headlines come from the shared store, never from live feeds on the request path
+        self.headline_store = headline_store if headline_store is not None else get_headline_store()
     
-    def scrape_french_news_rss(self, force_refresh: bool = False) -> List[str]:
-        """Scrape French news headlines from RSS feeds with smart caching"""
-        import time
-        
-        current_time = time.time()
-        
-        # Check if we have fresh cached headlines
-        if not force_refresh and self._headline_cache["headlines"] and \
-           (current_time - self._headline_cache["timestamp"]) < self._cache_duration:
-            print(f"📋 Using cached headlines ({len(self._headline_cache['headlines'])} available)")
-            return self._headline_cache["headlines"].copy()
-        
-        print("🔄 Scraping fresh headlines...")
-        rss_feeds = [
-            "https://www.lemonde.fr/rss/une.xml",
-            "https://www.franceinfo.fr/rss/une.xml",
-            "https://www.liberation.fr/rss/",
-            "https://rss.cnn.com/rss/edition.rss"  # Backup international feed
-        ]
-        
-        headlines = []
-        
-        for feed_url in rss_feeds:
-            try:
-                feed = feedparser.parse(feed_url)
-                for entry in feed.entries[:10]:  # Get first 10 headlines per feed
-                    headlines.append(entry.title)
-            except Exception as e:
-                print(f"Failed to fetch from {feed_url}: {e}")
-                continue
-        
-        # Update cache with fresh headlines
-        self._headline_cache = {
-            "headlines": headlines[:50],  # Store max 50 headlines
-            "timestamp": current_time
-        }
-        
-        print(f"✅ Cached {len(headlines[:50])} fresh headlines")
-        return headlines[:50]
+    def scrape_french_news_rss(self, limit: int = 50) -> List[str]:
+        """Read the latest headlines ingested by the background refresher"""
+        headlines = self.headline_store.recent(limit)
+        logger.debug(f"📋 Using stored headlines ({len(headlines)} available)")
+        return headlines
     
     def extract_nouns_with_gender(self, text: str) -> List[Dict]:
         """Extract French nouns with their grammatical gender using spaCy"""
         if not self.nlp:
             return []
         
-        doc = self.nlp(text)
+        return self._nouns_from_doc(self.nlp(text), text)
+    
+    def _nouns_from_doc(self, doc, text: str) -> List[Dict]:
+        """Extract gendered nouns from an already parsed headline"""
         nouns_with_gender = []
         
         for token in doc:
             if token.pos_ == "NOUN" and len(token.text) > 2:
-                # Determine gender based on article or morphological features
-                gender = self._determine_gender(token, doc)
+                # Determine gender from the lexicon, articles, morphology or ending rules
+                gender = determine_gender(token, doc)
                 if gender:
                     nouns_with_gender.append({
                         "word": token.text,
@@ -100,179 +84,76 @@ class FrenchNewsProcessor:
                         "gender": gender,
                         "article": "le" if gender == "masculine" else "la",
                         "position": token.idx,
-                        "sentence": text
+                        "sentence": text,
+                        "agreement_spans": corruption.agreement_spans(token, gender)
                     })
         
         return nouns_with_gender
     
-    def _determine_gender(self, token, doc) -> str:
-        """Determine gender of a noun based on context and morphology"""
-        # Look for articles before the noun
-        for i in range(max(0, token.i - 3), token.i):
-            prev_token = doc[i]
-            if prev_token.text.lower() in ["le", "du", "au", "un"]:
-                return "masculine"
-            elif prev_token.text.lower() in ["la", "de la", "à la", "une"]:
-                return "feminine"
-        
-        # Use morphological features if available
-        if hasattr(token, 'morph') and token.morph:
-            gender_feature = token.morph.get("Gender")
-            if gender_feature:
-                return "masculine" if "Masc" in gender_feature else "feminine"
-        
-        # Fallback: basic heuristics
-        word_lower = token.text.lower()
-        if word_lower.endswith(('tion', 'sion', 'ette', 'elle', 'ance', 'ence')):
-            return "feminine"
-        elif word_lower.endswith(('ment', 'age', 'isme', 'eau')):
-            return "masculine"
-        
-        return None
+    def _select_target_noun(self, headline: str, doc, nouns: List[Dict], language_level: str) -> Dict:
+        """Pick the target noun for a headline, reusing its parsed Doc"""
+        # Use LangChain ReAct agent for intelligent word selection
+        if self.use_agent:
+            try:
+                return self.grammar_agent.intelligent_word_selection(headline, language_level, doc=doc)
+            except Exception as e:
+                logger.warning(f"Agent failed, using fallback: {e}")
+        # Prefer nouns whose agreement can actually be flipped
+        return random.choice([noun for noun in nouns if noun["agreement_spans"]] or nouns)
     
-    def corrupt_sentence(self, sentence: str, target_noun: Dict) -> Tuple[str, bool]:
+    @staticmethod
+    def corrupt_sentence(sentence: str, target_noun: Dict) -> Tuple[str, bool]:
         """Corrupt a sentence by randomly flipping gender of target noun"""
-        should_corrupt = random.choice([True, False])
-        
-        if not should_corrupt:
-            return sentence, True  # Correct sentence
-        
-        # Flip the article/adjective gender
-        corrupted = sentence
-        original_gender = target_noun["gender"]
-        
-        # Replace articles
-        if original_gender == "masculine":
-            corrupted = corrupted.replace(" le ", " la ")
-            corrupted = corrupted.replace(" Le ", " La ")
-            corrupted = corrupted.replace(" un ", " une ")
-            corrupted = corrupted.replace(" Un ", " Une ")
-        else:
-            corrupted = corrupted.replace(" la ", " le ")
-            corrupted = corrupted.replace(" La ", " Le ")
-            corrupted = corrupted.replace(" une ", " un ")
-            corrupted = corrupted.replace(" Une ", " Un ")
-        
-        return corrupted, False  # Incorrect sentence
+        return corruption.corrupt_sentence(sentence, target_noun)
     
-    def generate_game_data(self, num_rounds: int = 20, language_level: str = "beginner") -> List[Dict]:
-        """Generate game data with corrupted and correct sentences - fresh scraping each time"""
-        print(f"🔄 Starting fresh headline scraping for {language_level} level...")
-        
-        # Always scrape fresh headlines
-        headlines = self.scrape_french_news_rss()
-        print(f"📰 Scraped {len(headlines)} fresh headlines")
-        
-        # Randomize headline order for variety
+    def stored_headlines(self, limit: int = 50) -> Iterator[str]:
+        """Default source: the newest stored headlines in random order, then any added meanwhile"""
+        headlines = self.scrape_french_news_rss(limit)
         random.shuffle(headlines)
+        yield from headlines
         
-        # Filter headlines by complexity based on language level
-        filtered_headlines = self._filter_headlines_by_level(headlines, language_level)
-        print(f"🎯 Filtered to {len(filtered_headlines)} headlines for {language_level} level")
-        
-        game_data = []
-        used_headlines = set()
-        
-        # Ensure we get enough unique headlines
-        while len(game_data) < num_rounds and len(used_headlines) < len(filtered_headlines):
-            for headline in filtered_headlines:
-                if len(game_data) >= num_rounds:
-                    break
-                    
-                # Skip if already used
-                if headline in used_headlines:
-                    continue
-                    
-                used_headlines.add(headline)
-                nouns = self.extract_nouns_with_gender(headline)
-                
-                if nouns:
-                    # Use LangChain ReAct agent for intelligent word selection
-                    if self.use_agent:
-                        try:
-                            target_noun = self.grammar_agent.intelligent_word_selection(headline, language_level)
-                            corrupted_sentence, is_correct = self.grammar_agent.intelligent_sentence_restructuring(headline, target_noun, language_level)
-                        except Exception as e:
-                            print(f"Agent failed, using fallback: {e}")
-                            target_noun = random.choice(nouns)
-                            corrupted_sentence, is_correct = self.corrupt_sentence(headline, target_noun)
-                    else:
-                        target_noun = random.choice(nouns)
-                        corrupted_sentence, is_correct = self.corrupt_sentence(headline, target_noun)
-                    
-                    game_data.append({
-                        "original_sentence": headline,
-                        "display_sentence": corrupted_sentence,
-                        "target_noun": target_noun,
-                        "is_correct": is_correct,
-                        "round_type": "sentence_check"
-                    })
-        
-        # If still not enough, scrape more feeds or use variations
-        if len(game_data) < num_rounds:
-            # Re-scrape to get fresh headlines
-            fresh_headlines = self.scrape_french_news_rss()
-            for headline in fresh_headlines:
-                if len(game_data) >= num_rounds:
-                    break
-                if headline not in used_headlines:
-                    nouns = self.extract_nouns_with_gender(headline)
-                    if nouns:
-                        # Use LangChain ReAct agent for intelligent word selection
-                        if self.use_agent:
-                            try:
-                                target_noun = self.grammar_agent.intelligent_word_selection(headline)
-                                corrupted_sentence, is_correct = self.grammar_agent.intelligent_sentence_restructuring(headline, target_noun)
-                            except Exception as e:
-                                print(f"Agent failed, using fallback: {e}")
-                                target_noun = random.choice(nouns)
-                                corrupted_sentence, is_correct = self.corrupt_sentence(headline, target_noun)
-                        else:
-                            target_noun = random.choice(nouns)
-                            corrupted_sentence, is_correct = self.corrupt_sentence(headline, target_noun)
-                        
-                        game_data.append({
-                            "original_sentence": headline,
-                            "display_sentence": corrupted_sentence,
-                            "target_noun": target_noun,
-                            "is_correct": is_correct,
-                            "round_type": "sentence_check"
-                        })
-        
-        return game_data
+        # Only pulled when the first read came up short, the refresher may have ingested more since
+        fresh_headlines = self.scrape_french_news_rss(limit)
+        random.shuffle(fresh_headlines)
+        yield from fresh_headlines
+    
+    def corrupt_for_level(self, headline: str, target_noun: Dict, language_level: str) -> Tuple[str, bool]:
+        if self.use_agent:
+            try:
+                return self.grammar_agent.intelligent_sentence_restructuring(headline, target_noun, language_level)
+            except Exception as e:
+                logger.warning(f"Agent failed, using fallback: {e}")
+        return self.corrupt_sentence(headline, target_noun)
+    
+    def default_stages(self, language_level: str = "beginner") -> List[game_pipeline.Stage]:
+        """source -> dedupe -> parse -> level gate -> noun extraction -> target selection -> corruption"""
+        return [
+            game_pipeline.dedupe(),
+            game_pipeline.parse(self.nlp, min(self.batch_size, PIPE_STREAM_BATCH_SIZE), self.n_process),
+            game_pipeline.level_gate(language_level, self.difficulty_history),
+            game_pipeline.extract_nouns(self._nouns_from_doc),
+            game_pipeline.select_target(
+                lambda headline, doc, nouns: self._select_target_noun(headline, doc, nouns, language_level)
+            ),
+            game_pipeline.corrupt(
+                lambda headline, target_noun: self.corrupt_for_level(headline, target_noun, language_level)
+            ),
+        ]
+    
+    def generate_game_data(self, num_rounds: int = 20, language_level: str = "beginner",
+                           source: Optional[Iterable[str]] = None,
+                           stages: Optional[Sequence[game_pipeline.Stage]] = None) -> List[Dict]:
+        """Pull challenges through the lazy stage pipeline, stopping as soon as num_rounds exist.
+        
+        source replaces the stored headlines (any iterable of headlines), stages replaces the
+        default chain, e.g. default_stages(level) with a custom stage inserted.
+        """
+        logger.debug(f"🔄 Generating {language_level} game from stored headlines...")
+        
+        source = source if source is not None else self.stored_headlines()
+        stages = stages if stages is not None else self.default_stages(language_level)
+        return game_pipeline.take(game_pipeline.run(source, stages), num_rounds)
     
-    def _filter_headlines_by_level(self, headlines: List[str], language_level: str) -> List[str]:
-        """Filter headlines based on complexity for different language levels"""
-        filtered = []
-        
-        for headline in headlines:
-            # Analyze headline complexity
-            doc = self.nlp(headline)
-            word_count = len([token for token in doc if token.is_alpha])
-            complex_words = len([token for token in doc if len(token.text) > 8])
-            subordinate_clauses = len([token for token in doc if token.dep_ in ["mark", "advcl"]])
-            
-            # Level-based filtering
-            if language_level == "beginner":
-                # Simple headlines: 3-10 words, minimal complex vocabulary
-                if 3 <= word_count <= 10 and complex_words <= 2 and subordinate_clauses == 0:
-                    filtered.append(headline)
-            elif language_level == "intermediate":
-                # Medium headlines: 5-15 words, some complex vocabulary
-                if 5 <= word_count <= 15 and complex_words <= 4:
-                    filtered.append(headline)
-            else:  # advanced
-                # All headlines acceptable, prefer longer/complex ones
-                if word_count >= 6:
-                    filtered.append(headline)
-        
-        # If filtering is too restrictive, return random subset of all headlines
-        if len(filtered) < 20:
-            print(f"⚠️  Filtering too restrictive for {language_level}, using broader selection")
-            random.shuffle(headlines)
-            return headlines[:50]  # Return larger pool for variety
-            
-        return filtered
 
 # Fallback data if scraping fails
 FALLBACK_SENTENCES = [
@@ -287,8 +168,8 @@ FALLBACK_SENTENCES = [
         "is_correct": True
     },
     {
-        "original_sentence": "Le voiture rouge est garée devant la maison.",
+        "original_sentence": "La voiture rouge est garée devant la maison.",
         "target_noun": {"word": "voiture", "gender": "feminine", "article": "la"},
-        "is_correct": False
+        "is_correct": True
     }
 ]
@@ -0,0 +1,35 @@
+"""
+Headline difficulty: a columnar feature matrix, a stored difficulty score and pool-relative levels
+
+Every parsed headline gets an absolute difficulty score (a weighted sum of its complexity features),
+computed for a whole parse batch with one matrix product. Levels are percentile bands of recent
+scores, so each level always gets a share of the pool.
+"""
+
+from typing import Dict, Sequence, Tuple
+import numpy as np
+
+FEATURES = ("word_count", "complex_words", "subordinate_clauses")
+# Long words and subordinate clauses make a headline harder than its length alone
+FEATURE_WEIGHTS = np.array([1.0, 2.0, 3.0], dtype=np.float32)
+
+# Percentile band of pool difficulty per level; bands overlap so neighbouring levels share headlines
+LEVEL_BANDS: Dict[str, Tuple[float, float]] = {
+    "beginner": (0.0, 40.0),
+    "intermediate": (25.0, 75.0),
+    "advanced": (60.0, 100.0),
+}
+LEVELS = tuple(LEVEL_BANDS)
+
+def feature_matrix(rows: Sequence[Sequence[float]]) -> np.ndarray:
+    """(n, len(FEATURES)) float32 matrix from per-headline feature tuples"""
+    return np.asarray(rows, dtype=np.float32).reshape(-1, len(FEATURES))
+
+def difficulty_scores(features: np.ndarray) -> np.ndarray:
+    return features @ FEATURE_WEIGHTS
+
+def level_cutoffs(scores: np.ndarray, level: str) -> Tuple[float, float]:
+    """Score range of a level's band within a pool, unknown levels count as advanced"""
+    low, high = LEVEL_BANDS.get(level, LEVEL_BANDS["advanced"])
+    cutoffs = np.percentile(scores, [low, high])
+    return float(cutoffs[0]), float(cutoffs[1])
@@ -0,0 +1,210 @@
+"""
+Two-tier (in-memory LRU + SQLite) cache for Mistral explanations, with a bulk pre-warm command
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from background import PeriodicTask
+
+EXPLANATION_DB_PATH = Path(os.getenv("EXPLANATION_DB_PATH", Path(__file__).parent / "explanations.db"))
+MEMORY_MAX_ENTRIES = int(os.getenv("EXPLANATION_CACHE_MEMORY_MAX", "2048"))
+DISK_MAX_ENTRIES = int(os.getenv("EXPLANATION_CACHE_DISK_MAX", "50000"))
+CACHE_TTL = int(os.getenv("EXPLANATION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))  # 30 days
+PRUNE_INTERVAL = int(os.getenv("EXPLANATION_CACHE_PRUNE_SECONDS", "300"))
+
+logger = logging.getLogger(__name__)
+
+_SELECT_EXPLANATION = "SELECT value, created_at FROM explanations WHERE key = ?"
+_UPSERT_EXPLANATION = "INSERT OR REPLACE INTO explanations (key, value, created_at) VALUES (?, ?, ?)"
+_DELETE_EXPIRED = "DELETE FROM explanations WHERE created_at < ?"
+_COUNT_EXPLANATIONS = "SELECT COUNT(*) FROM explanations"
+_DELETE_OLDEST = """DELETE FROM explanations WHERE key IN (
+    SELECT key FROM explanations ORDER BY created_at ASC LIMIT ?
+)"""
+
+def normalize(text: str) -> str:
+    """Canonical form used in cache keys: NFC, lowercase, single spaces"""
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+def make_key(kind: str, model: str, *parts: str) -> str:
+    raw = "\x1f".join([kind, model] + [normalize(part) for part in parts])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class ExplanationCache:
+    """Memory tier checked inline, SQLite tier read and written off the event loop by the async methods.
+
+    Writes never evict from disk; prune() drops expired rows and the oldest ones beyond disk_max and
+    is run periodically by CachePruner.
+    """
+
+    def __init__(self, db_path: Optional[Path] = EXPLANATION_DB_PATH, memory_max: int = MEMORY_MAX_ENTRIES,
+                 disk_max: int = DISK_MAX_ENTRIES, ttl: int = CACHE_TTL):
+        self.memory_max = memory_max
+        self.disk_max = disk_max
+        self.ttl = ttl
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0, "pruned": 0}
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()  # Memory tier and stats
+        self._db_lock = threading.Lock()  # SQLite connection, only held by worker threads on the async paths
+        self._disk_entries = 0  # As of the last prune
+
+        # db_path=None keeps the cache memory-only
+        self._conn = None
+        if db_path is not None:
+            self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS explanations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_explanations_created ON explanations (created_at)")
+            self._conn.commit()
+            self._disk_entries = self._conn.execute(_COUNT_EXPLANATIONS).fetchone()[0]
+
+    def _remember(self, key: str, value: str, created_at: float):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _get_memory(self, key: str, now: float) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[1] < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return entry[0]
+                del self._memory[key]
+            if self._conn is None:
+                self.stats["misses"] += 1
+            return None
+
+    def _get_disk(self, key: str, now: float) -> Optional[str]:
+        with self._db_lock:
+            row = self._conn.execute(_SELECT_EXPLANATION, (key,)).fetchone()
+        with self._lock:
+            if row is not None and now - row[1] < self.ttl:
+                self._remember(key, row[0], row[1])
+                self.stats["disk_hits"] += 1
+                return row[0]
+            self.stats["misses"] += 1
+            return None
+
+    def _set_memory(self, key: str, value: str, now: float):
+        with self._lock:
+            self._remember(key, value, now)
+            self.stats["writes"] += 1
+
+    def _set_disk(self, key: str, value: str, now: float):
+        with self._db_lock:
+            self._conn.execute(_UPSERT_EXPLANATION, (key, value, now))
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is None and self._conn is not None:
+            value = self._get_disk(key, now)
+        return value
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        self._set_memory(key, value, now)
+        if self._conn is not None:
+            self._set_disk(key, value, now)
+
+    async def get_async(self, key: str) -> Optional[str]:
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is None and self._conn is not None:
+            value = await asyncio.to_thread(self._get_disk, key, now)
+        return value
+
+    async def set_async(self, key: str, value: str):
+        now = time.time()
+        self._set_memory(key, value, now)
+        if self._conn is not None:
+            await asyncio.to_thread(self._set_disk, key, value, now)
+
+    def prune(self) -> int:
+        """Drop expired rows, then the oldest ones beyond disk_max, and return how many were removed"""
+        if self._conn is None:
+            return 0
+        with self._db_lock:
+            with self._conn:
+                removed = self._conn.execute(_DELETE_EXPIRED, (time.time() - self.ttl,)).rowcount
+                count = self._conn.execute(_COUNT_EXPLANATIONS).fetchone()[0]
+                if count > self.disk_max:
+                    removed += self._conn.execute(_DELETE_OLDEST, (count - self.disk_max,)).rowcount
+            self._disk_entries = self._conn.execute(_COUNT_EXPLANATIONS).fetchone()[0]
+        with self._lock:
+            self.stats["pruned"] += removed
+        return removed
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            hits = lookups - self.stats["misses"]
+            summary = dict(self.stats, memory_entries=len(self._memory),
+                           hit_rate=round(hits / lookups, 3) if lookups else 0.0)
+        if self._conn is not None:
+            summary["disk_entries"] = self._disk_entries
+        return summary
+
+class CachePruner(PeriodicTask):
+    """Prunes the cache's disk tier every interval, in a worker thread"""
+
+    failure_message = "Explanation cache prune failed"
+
+    def __init__(self, cache: ExplanationCache, interval: int = PRUNE_INTERVAL):
+        super().__init__(interval)
+        self.cache = cache
+
+    async def run_once(self):
+        removed = await asyncio.to_thread(self.cache.prune)
+        if removed:
+            logger.info(f"🧹 Pruned {removed} cached explanations")
+
+async def prewarm(words_path: Path, limit: Optional[int] = None) -> Dict[str, int]:
+    """Fill the cache with gender explanations for every vocabulary entry"""
+    from mistral_client import MistralFeedbackClient
+
+    with open(words_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    unique = list(dict.fromkeys((entry["word"], entry["gender"]) for entry in entries))
+    if limit:
+        unique = unique[:limit]
+
+    # No per-call deadline here: the whole vocabulary queues behind the concurrency cap
+    client = MistralFeedbackClient(deadline=None)
+    await asyncio.gather(*(client.explain_gender_rule_async(word, gender) for word, gender in unique))
+    client.cache.prune()
+    return client.cache.summary()
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Manage the Mistral explanation cache")
+    parser.add_argument("--prewarm", action="store_true", help="Generate gender explanations for words.json")
+    parser.add_argument("--words", type=Path, default=Path(__file__).parent / "words.json")
+    parser.add_argument("--limit", type=int, default=None, help="Only pre-warm the first N words")
+    args = parser.parse_args()
+
+    if args.prewarm:
+        print(f"🔥 Pre-warming explanation cache from {args.words}...")
+        print(asyncio.run(prewarm(args.words, args.limit)))
+    else:
+        print(ExplanationCache().summary())
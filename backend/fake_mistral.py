@@ -0,0 +1,67 @@
+"""
+Local stand-in for the Mistral SDK client with configurable latency, for tests, benchmarks and offline dev
+
+Select it with MISTRAL_BACKEND=fake (no API key needed). It mimics the parts of the SDK we call:
+chat.complete, chat.complete_async and chat.stream_async.
+"""
+
+import asyncio
+import os
+import re
+import time
+from types import SimpleNamespace
+from typing import AsyncIterator, List
+
+FAKE_LATENCY = float(os.getenv("FAKE_MISTRAL_LATENCY_SECONDS", "0.3"))  # Time to first token
+FAKE_TOKEN_DELAY = float(os.getenv("FAKE_MISTRAL_TOKEN_DELAY_SECONDS", "0.02"))
+
+def _answer(messages: List[dict]) -> str:
+    prompt = messages[-1]["content"]
+    word = re.search(r'"([^"]+)"', prompt)
+    subject = word.group(1) if word else "this word"
+    return f"(fake) '{subject}' follows the usual French gender agreement pattern for its ending."
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"\S+\s*", text)
+
+def _completion(text: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+def _chunk(token: str):
+    return SimpleNamespace(data=SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))]))
+
+class _FakeChat:
+    def __init__(self, latency: float, token_delay: float):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.calls = 0
+
+    def complete(self, model: str, messages: List[dict], **kwargs):
+        self.calls += 1
+        text = _answer(messages)
+        time.sleep(self.latency + self.token_delay * len(_tokens(text)))
+        return _completion(text)
+
+    async def complete_async(self, model: str, messages: List[dict], **kwargs):
+        self.calls += 1
+        text = _answer(messages)
+        await asyncio.sleep(self.latency + self.token_delay * len(_tokens(text)))
+        return _completion(text)
+
+    async def stream_async(self, model: str, messages: List[dict], **kwargs) -> AsyncIterator:
+        self.calls += 1
+        text = _answer(messages)
+        await asyncio.sleep(self.latency)
+
+        async def events():
+            for token in _tokens(text):
+                await asyncio.sleep(self.token_delay)
+                yield _chunk(token)
+
+        return events()
+
+class FakeMistral:
+    model_name = "fake-mistral"  # Keeps fake explanations out of the real model's cache entries
+
+    def __init__(self, latency: float = FAKE_LATENCY, token_delay: float = FAKE_TOKEN_DELAY):
+        self.chat = _FakeChat(latency, token_delay)
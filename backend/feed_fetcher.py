@@ -0,0 +1,144 @@
+"""
+Concurrent async RSS fetching with per-feed timeouts, conditional GET and circuit breakers
+"""
+
+import asyncio
+import logging
+import os
+import time
+import httpx
+from typing import Dict, List, Optional, Tuple
+from telemetry import FEED_FETCH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RSS_FEEDS = [
+    "https://www.lemonde.fr/rss/une.xml",
+    "https://www.franceinfo.fr/rss/une.xml",
+    "https://www.liberation.fr/rss/",
+    "https://rss.cnn.com/rss/edition.rss"  # Backup international feed
+]
+# Comma separated override, e.g. the local fixture feeds served by the benchmarks
+RSS_FEEDS = [url.strip() for url in os.getenv("RSS_FEED_URLS", "").split(",") if url.strip()] or DEFAULT_RSS_FEEDS
+
+HEADLINES_PER_FEED = 10
+FEED_TIMEOUT = float(os.getenv("FEED_TIMEOUT_SECONDS", "5"))
+USER_AGENT = "VocaTinder/2.0 (+https://github.com/Abmstpha/Vocatinder)"
+
+class CircuitBreaker:
+    """Stops calling a feed after repeated failures, then lets one probe through after a cooldown"""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 600):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            # (Re)open the circuit, a failed half-open probe restarts the cooldown
+            self.opened_at = time.monotonic()
+
+def _parse_feed(content: bytes):
+    import feedparser  # Only the background refresher needs it
+    return feedparser.parse(content)
+
+class AsyncFeedFetcher:
+    def __init__(self, feeds: List[str] = RSS_FEEDS, timeout: float = FEED_TIMEOUT,
+                 max_connections: int = 10, failure_threshold: int = 3, reset_timeout: float = 600):
+        self.feeds = feeds
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.breakers: Dict[str, CircuitBreaker] = {
+            url: CircuitBreaker(failure_threshold, reset_timeout) for url in feeds
+        }
+        # ETag / Last-Modified validators and the entries they describe, per feed
+        self._validators: Dict[str, Dict[str, str]] = {}
+        self._entries: Dict[str, List[Tuple[str, str]]] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+        return self._client
+
+    async def fetch_feed(self, feed_url: str) -> List[Tuple[str, str]]:
+        """Fetch (headline, feed_url) pairs for one feed, reusing cached entries on 304"""
+        breaker = self.breakers.setdefault(feed_url, CircuitBreaker())
+        if not breaker.allow():
+            FEED_FETCH_SECONDS.labels(feed=feed_url, outcome="circuit_open").observe(0)
+            return []
+        start = time.perf_counter()
+
+        headers = {}
+        validators = self._validators.get(feed_url, {})
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        try:
+            response = await asyncio.wait_for(
+                self._get_client().get(feed_url, headers=headers), timeout=self.timeout
+            )
+            if response.status_code == 304:
+                breaker.record_success()
+                FEED_FETCH_SECONDS.labels(feed=feed_url, outcome="not_modified").observe(time.perf_counter() - start)
+                return self._entries.get(feed_url, [])
+
+            response.raise_for_status()
+            feed = await asyncio.to_thread(_parse_feed, response.content)
+            if not feed.entries:
+                raise ValueError("feed has no entries")
+        except Exception as e:
+            breaker.record_failure()
+            FEED_FETCH_SECONDS.labels(feed=feed_url, outcome="error").observe(time.perf_counter() - start)
+            logger.warning(f"Failed to fetch from {feed_url}: {e!r} (circuit {breaker.state})")
+            return []
+
+        breaker.record_success()
+        FEED_FETCH_SECONDS.labels(feed=feed_url, outcome="ok").observe(time.perf_counter() - start)
+        self._validators[feed_url] = {
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", "")
+        }
+        entries = [
+            (entry.title, feed_url) for entry in feed.entries[:HEADLINES_PER_FEED] if entry.get("title")
+        ]
+        self._entries[feed_url] = entries
+        return entries
+
+    async def fetch_all(self) -> List[Tuple[str, str]]:
+        """Fetch every feed concurrently so one slow feed cannot hold up the others"""
+        results = await asyncio.gather(*(self.fetch_feed(url) for url in self.feeds))
+        return [headline for entries in results for headline in entries]
+
+    def circuit_states(self) -> Dict[str, str]:
+        return {url: breaker.state for url, breaker in self.breakers.items()}
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
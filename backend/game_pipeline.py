@@ -0,0 +1,147 @@
+"""
+Lazy, composable game generation: headline records flow through generator stages pulled on demand
+
+    source -> dedupe -> parse -> level gate -> noun extraction -> target selection -> corruption
+
+A source is any iterable of headline strings and a stage is any callable taking an iterator of
+record dicts and yielding records, so callers can swap sources or insert their own stages. Nothing
+runs ahead of demand beyond a parse batch or gate window: once take() has its challenges the whole
+chain stops, and later headlines are never extracted, targeted or corrupted.
+"""
+
+import itertools
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+import numpy as np
+import difficulty
+from telemetry import STAGE_ITEMS, STAGE_SECONDS, stage as timed_stage
+
+Record = Dict
+Stage = Callable[[Iterator[Record]], Iterator[Record]]
+
+LEVEL_GATE_WINDOW = 32
+DIFFICULTY_HISTORY_MAX = 2000
+
+def complexity_features(doc) -> Tuple[int, int, int]:
+    """Per-headline features in difficulty.FEATURES order"""
+    return (
+        sum(1 for token in doc if token.is_alpha),
+        sum(1 for token in doc if len(token.text) > 8),
+        sum(1 for token in doc if token.dep_ in ("mark", "advcl"))
+    )
+
+def run(source: Iterable[str], stages: Sequence[Stage]) -> Iterator[Record]:
+    records = ({"headline": headline} for headline in source)
+    for stage in stages:
+        records = stage(records)
+    return records
+
+def take(records: Iterator[Record], count: int) -> List[Record]:
+    """Pull count records and close the chain so upstream stages stop right away"""
+    try:
+        return list(itertools.islice(records, count))
+    finally:
+        close = getattr(records, "close", None)
+        if close is not None:
+            close()
+
+def dedupe(seen: Optional[Set[str]] = None) -> Stage:
+    seen = set() if seen is None else seen
+
+    def stage(records: Iterator[Record]) -> Iterator[Record]:
+        for record in records:
+            if record["headline"] not in seen:
+                seen.add(record["headline"])
+                yield record
+    return stage
+
+def parse(nlp, batch_size: int, n_process: int = 1) -> Stage:
+    """Parse with nlp.pipe (lazy, batch_size at a time) and attach features and difficulty.
+
+    nlp.pipe parses a whole batch before yielding its first Doc, so each batch is also scored
+    as one feature matrix.
+    """
+    def stage(records: Iterator[Record]) -> Iterator[Record]:
+        docs = nlp.pipe(((record["headline"], record) for record in records),
+                        as_tuples=True, batch_size=batch_size, n_process=n_process)
+        while True:
+            start = time.perf_counter()
+            batch = list(itertools.islice(docs, batch_size))
+            if not batch:
+                return
+            rows = [complexity_features(doc) for doc, _ in batch]
+            scores = difficulty.difficulty_scores(difficulty.feature_matrix(rows))
+            STAGE_SECONDS.labels(stage="spacy_parse").observe(time.perf_counter() - start)
+            STAGE_ITEMS.labels(stage="spacy_parse").inc(len(batch))
+            for (doc, record), row, score in zip(batch, rows, scores.tolist()):
+                record.update(zip(difficulty.FEATURES, row))
+                record["doc"] = doc
+                record["difficulty"] = score
+                yield record
+    return stage
+
+def level_gate(level: str, history: "OrderedDict[str, float]", window: int = LEVEL_GATE_WINDOW,
+               history_max: int = DIFFICULTY_HISTORY_MAX) -> Stage:
+    """Pass records inside the level's percentile band of recent headline difficulty.
+
+    history maps recently scored headlines to their difficulty and outlives a single run, so the
+    bands stay relative to the current pool; records are gated a window at a time so even the
+    first run has a distribution to compare against.
+    """
+    def gate(window_records: List[Record]) -> List[Record]:
+        with timed_stage("level_filter"):
+            for record in window_records:
+                history[record["headline"]] = record["difficulty"]
+                history.move_to_end(record["headline"])
+            while len(history) > history_max:
+                history.popitem(last=False)
+            scores = np.fromiter(history.values(), dtype=np.float32, count=len(history))
+            low, high = difficulty.level_cutoffs(scores, level)
+            return [record for record in window_records if low <= record["difficulty"] <= high]
+
+    def stage(records: Iterator[Record]) -> Iterator[Record]:
+        pending = []
+        for record in records:
+            pending.append(record)
+            if len(pending) >= window:
+                yield from gate(pending)
+                pending = []
+        if pending:
+            yield from gate(pending)
+    return stage
+
+def extract_nouns(nouns_from_doc: Callable[[object, str], List[Dict]]) -> Stage:
+    def stage(records: Iterator[Record]) -> Iterator[Record]:
+        for record in records:
+            start = time.perf_counter()
+            record["nouns"] = nouns_from_doc(record["doc"], record["headline"])
+            STAGE_SECONDS.labels(stage="noun_extraction").observe(time.perf_counter() - start)
+            if record["nouns"]:
+                yield record
+    return stage
+
+def select_target(choose: Callable[[str, object, List[Dict]], Optional[Dict]]) -> Stage:
+    def stage(records: Iterator[Record]) -> Iterator[Record]:
+        for record in records:
+            record["target_noun"] = choose(record["headline"], record["doc"], record["nouns"])
+            if record["target_noun"]:
+                yield record
+    return stage
+
+def corrupt(corrupt_sentence: Callable[[str, Dict], Tuple[str, bool]]) -> Stage:
+    """Turn targeted records into challenges (the Doc is dropped here)"""
+    def stage(records: Iterator[Record]) -> Iterator[Record]:
+        for record in records:
+            with timed_stage("corruption"):
+                display_sentence, is_correct = corrupt_sentence(record["headline"], record["target_noun"])
+            STAGE_ITEMS.labels(stage="corruption").inc()
+            yield {
+                "original_sentence": record["headline"],
+                "display_sentence": display_sentence,
+                "target_noun": record["target_noun"],
+                "is_correct": is_correct,
+                "round_type": "sentence_check",
+                "difficulty": record["difficulty"]
+            }
+    return stage
@@ -0,0 +1,198 @@
+"""
+Compiled gender lexicon built from words.json: O(1) lemma lookup plus a suffix trie for ending rules
+
+    python gender_lexicon.py build    # dedupe words.json and write gender_lexicon.json
+    python gender_lexicon.py stats    # show what the compiled lexicon contains
+"""
+
+import json
+import os
+import sys
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).parent
+WORDS_PATH = BACKEND_DIR / "words.json"
+LEXICON_PATH = Path(os.getenv("GENDER_LEXICON_PATH", BACKEND_DIR / "gender_lexicon.json"))
+
+# Ending rules, the longest matching suffix wins
+SUFFIX_RULES = {
+    "tion": "feminine", "sion": "feminine", "ure": "feminine", "ence": "feminine", "ance": "feminine",
+    "ette": "feminine", "elle": "feminine", "esse": "feminine",
+    "ment": "masculine", "age": "masculine", "isme": "masculine", "eau": "masculine", "ou": "masculine"
+}
+
+# Gendered determiners that, just before a noun, tell its gender
+MASCULINE_DETERMINERS = frozenset({"le", "du", "au", "un", "ce", "cet", "mon", "ton", "son"})
+FEMININE_DETERMINERS = frozenset({"la", "une", "cette", "ma", "ta", "sa"})
+DETERMINER_WINDOW = 3
+
+def normalize(word: str) -> str:
+    return unicodedata.normalize("NFC", word.strip().lower())
+
+def strip_accents(word: str) -> str:
+    decomposed = unicodedata.normalize("NFD", word)
+    return "".join(char for char in decomposed if unicodedata.category(char) != "Mn")
+
+def compile_lexicon(words_path: Path = WORDS_PATH) -> Dict:
+    """Dedupe words.json into a word -> gender map (accented and unaccented keys)"""
+    with open(words_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    words: Dict[str, str] = {}
+    conflicts: List[str] = []
+    for entry in entries:
+        key = normalize(entry["word"])
+        gender = entry["gender"]
+        if words.get(key, gender) != gender:
+            conflicts.append(key)
+        words.setdefault(key, gender)
+
+    # Unaccented aliases help with headlines typed without accents, never override a real entry
+    for key, gender in list(words.items()):
+        words.setdefault(strip_accents(key), gender)
+
+    return {
+        "source_entries": len(entries),
+        "unique_entries": len({normalize(entry["word"]) for entry in entries}),
+        "conflicts": sorted(set(conflicts)),
+        "words": words,
+        "suffix_rules": SUFFIX_RULES
+    }
+
+class SuffixTrie:
+    """Trie over reversed suffixes, so one walk from the word's end finds the longest rule"""
+
+    def __init__(self, rules: Dict[str, str]):
+        self.root: Dict = {}
+        for suffix, gender in rules.items():
+            node = self.root
+            for char in reversed(suffix):
+                node = node.setdefault(char, {})
+            node["$"] = gender
+
+    def lookup(self, word: str) -> Optional[str]:
+        node, gender = self.root, None
+        for char in reversed(word):
+            node = node.get(char)
+            if node is None:
+                break
+            gender = node.get("$", gender)
+        return gender
+
+class GenderLexicon:
+    def __init__(self, artifact: Dict):
+        self.words: Dict[str, str] = artifact["words"]
+        self.suffixes = SuffixTrie(artifact["suffix_rules"])
+        self.stats = {"lookups": 0, "hits": 0, "conflicts": 0, "suffix_hits": 0}
+
+    @classmethod
+    def load(cls, path: Path = LEXICON_PATH, words_path: Path = WORDS_PATH) -> "GenderLexicon":
+        """Load the compiled artifact, compiling it from words.json if it has not been built"""
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                artifact = json.load(f)
+        else:
+            artifact = compile_lexicon(words_path)
+        return cls(artifact)
+
+    def lookup(self, word: str, lemma: Optional[str] = None) -> Optional[str]:
+        """Constant-time gender lookup by surface form first, so "chanteuse" isn't read as its lemma"""
+        self.stats["lookups"] += 1
+        for candidate in (word, lemma):
+            if not candidate:
+                continue
+            key = normalize(candidate)
+            gender = self.words.get(key) or self.words.get(strip_accents(key))
+            if gender:
+                self.stats["hits"] += 1
+                return gender
+        return None
+
+    def suffix_gender(self, word: str) -> Optional[str]:
+        gender = self.suffixes.lookup(normalize(word))
+        if gender:
+            self.stats["suffix_hits"] += 1
+        return gender
+
+    def summary(self) -> Dict:
+        """Counters plus the hit rate, where hits the sentence contradicted don't count"""
+        lookups = self.stats["lookups"]
+        useful_hits = self.stats["hits"] - self.stats["conflicts"]
+        return dict(self.stats, entries=len(self.words),
+                    hit_rate=round(useful_hits / lookups, 3) if lookups else 0.0)
+
+_lexicon: Optional[GenderLexicon] = None
+_lexicon_lock = threading.Lock()
+
+def get_lexicon() -> GenderLexicon:
+    """Process-wide lexicon, loaded once"""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                _lexicon = GenderLexicon.load()
+    return _lexicon
+
+def determiner_gender(text: str) -> Optional[str]:
+    text = text.lower()
+    if text in MASCULINE_DETERMINERS:
+        return "masculine"
+    if text in FEMININE_DETERMINERS:
+        return "feminine"
+    return None
+
+def sentence_gender(token) -> Optional[str]:
+    """Gender the sentence itself marks on a noun: its own determiner, else its morphology"""
+    for child in token.children:
+        if child.dep_ == "det":
+            gender = determiner_gender(child.text)
+            if gender:
+                return gender
+
+    gender_feature = token.morph.get("Gender") if token.morph else None
+    if gender_feature and len(gender_feature) == 1:
+        return "masculine" if gender_feature[0] == "Masc" else "feminine"
+    return None
+
+def determine_gender(token, doc, default: Optional[str] = None) -> Optional[str]:
+    """Gender of a parsed noun: lexicon, then what the sentence marks, a nearby determiner, ending rules.
+
+    Epicene nouns and homographs (la ministre, la tour) have one lexicon gender, so a gendered
+    determiner or morphology on the noun overrides the lexicon and counts as a conflict.
+    Returns default when none of them decide.
+    """
+    lexicon = get_lexicon()
+    gender = lexicon.lookup(token.text, token.lemma_)
+    marked = sentence_gender(token)
+    if gender:
+        if marked and marked != gender:
+            lexicon.stats["conflicts"] += 1
+            return marked
+        return gender
+    if marked:
+        return marked
+
+    # Parses sometimes attach the determiner elsewhere, so look just before the noun too
+    for i in range(max(0, token.i - DETERMINER_WINDOW), token.i):
+        gender = determiner_gender(doc[i].text)
+        if gender:
+            return gender
+
+    return lexicon.suffix_gender(token.text) or default
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if command == "build":
+        artifact = compile_lexicon()
+        with open(LEXICON_PATH, "w", encoding="utf-8") as f:
+            json.dump(artifact, f, ensure_ascii=False, separators=(",", ":"))
+        print(f"✅ {artifact['source_entries']} entries -> {artifact['unique_entries']} unique words "
+              f"({len(artifact['conflicts'])} gender conflicts), written to {LEXICON_PATH.name}")
+    elif command == "stats":
+        lexicon = GenderLexicon.load()
+        print(lexicon.summary())
+    else:
+        print(__doc__)
@@ -0,0 +1,191 @@
+"""
+Process-wide headline store fed by a background RSS ingestion worker and persisted to SQLite
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from background import PeriodicTask
+from feed_fetcher import AsyncFeedFetcher
+from near_duplicates import MinHashIndex, pack, signature, unpack
+from telemetry import STAGE_ITEMS, stage
+
+logger = logging.getLogger(__name__)
+
+HEADLINE_DB_PATH = Path(os.getenv("HEADLINE_DB_PATH", Path(__file__).parent / "headlines.db"))
+MAX_STORED_HEADLINES = int(os.getenv("HEADLINE_STORE_MAX", "2000"))
+REFRESH_INTERVAL = int(os.getenv("HEADLINE_REFRESH_SECONDS", "300"))  # 5 minutes
+
+class HeadlineStore:
+    def __init__(self, db_path: Path = HEADLINE_DB_PATH, max_headlines: int = MAX_STORED_HEADLINES):
+        self.db_path = Path(db_path)
+        self.max_headlines = max_headlines
+        self.last_refresh = 0.0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS headlines ("
+            "text TEXT PRIMARY KEY, source TEXT, fetched_at REAL NOT NULL, signature BLOB)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(headlines)")}
+        if "signature" not in columns:
+            self._conn.execute("ALTER TABLE headlines ADD COLUMN signature BLOB")
+        self._conn.commit()
+
+        # Only one headline per near-duplicate cluster is stored; rewordings map to it in memory
+        self.index = MinHashIndex()
+        self._duplicates: Dict[str, str] = {}
+        self.near_duplicates = 0
+
+        # Newest first, mirrored in memory so game generation never touches disk
+        self._headlines: List[str] = []
+        missing = []
+        for text, blob in self._conn.execute(
+            "SELECT text, signature FROM headlines ORDER BY fetched_at DESC LIMIT ?", (self.max_headlines,)
+        ):
+            self._headlines.append(text)
+            if blob is None:
+                missing.append(text)  # Stored before signatures existed
+            else:
+                self.index.add(text, unpack(blob))
+        if missing:
+            self._conn.executemany(
+                "UPDATE headlines SET signature = ? WHERE text = ?",
+                [(pack(self._index_new(text)), text) for text in missing]
+            )
+            self._conn.commit()
+        if self._headlines:
+            logger.info(f"📋 Loaded {len(self._headlines)} stored headlines from {self.db_path.name}")
+
+    def __len__(self) -> int:
+        return len(self._headlines)
+
+    def _index_new(self, text: str):
+        sig = signature(text)
+        self.index.add(text, sig)
+        return sig
+
+    def add(self, headlines: List[Tuple[str, str]]) -> int:
+        """Insert or refresh (headline, source) pairs and return how many new stories were stored.
+
+        A near-duplicate of a stored headline refreshes that headline instead of being stored.
+        """
+        now = time.time()
+
+        with self._lock:
+            rows = {}
+            for text, source in headlines:
+                text = text.strip() if text else ""
+                if not text:
+                    continue
+                representative = self._duplicates.get(text)
+                if representative is not None:
+                    if representative in self.index:
+                        text = representative
+                    else:
+                        del self._duplicates[text]  # Its story was evicted, this wording stands on its own
+                if text in self.index:
+                    rows.setdefault(text, (text, source, now, None))
+                    continue
+
+                sig = signature(text)
+                representative = self.index.find(sig)
+                if representative is not None:
+                    self._duplicates[text] = representative
+                    self.near_duplicates += 1
+                    rows.setdefault(representative, (representative, source, now, None))
+                    continue
+                self.index.add(text, sig)
+                rows[text] = (text, source, now, pack(sig))
+
+            new_count = sum(1 for row in rows.values() if row[3] is not None)
+            self._conn.executemany(
+                "INSERT INTO headlines (text, source, fetched_at, signature) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(text) DO UPDATE SET fetched_at = excluded.fetched_at",
+                list(rows.values())
+            )
+            # Keep only the newest headlines on disk
+            self._conn.execute(
+                "DELETE FROM headlines WHERE text NOT IN "
+                "(SELECT text FROM headlines ORDER BY fetched_at DESC LIMIT ?)",
+                (self.max_headlines,)
+            )
+            self._conn.commit()
+
+            self._headlines = [
+                row[0] for row in self._conn.execute(
+                    "SELECT text FROM headlines ORDER BY fetched_at DESC LIMIT ?", (self.max_headlines,)
+                )
+            ]
+            self._forget_evicted()
+            self.last_refresh = now
+
+        return new_count
+
+    def _forget_evicted(self):
+        if len(self.index) > len(self._headlines):
+            stored = set(self._headlines)
+            for text in [text for text in self.index.keys() if text not in stored]:
+                self.index.remove(text)
+        if len(self._duplicates) > self.max_headlines:
+            # Rewordings whose story was evicted, or just too many: they are cheap to re-detect
+            self._duplicates = {text: rep for text, rep in self._duplicates.items() if rep in self.index}
+            if len(self._duplicates) > self.max_headlines:
+                self._duplicates.clear()
+
+    def recent(self, limit: int = 50) -> List[str]:
+        """Return a copy of the newest headlines"""
+        return self._headlines[:limit]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class HeadlineRefresher(PeriodicTask):
+    failure_message = "Headline refresh failed"
+
+    def __init__(self, store: HeadlineStore, interval: int = REFRESH_INTERVAL,
+                 fetcher: Optional[AsyncFeedFetcher] = None, on_ingest: Optional[Callable[[], None]] = None):
+        super().__init__(interval)
+        self.store = store
+        self.fetcher = fetcher if fetcher is not None else AsyncFeedFetcher()
+        self.on_ingest = on_ingest  # Called after new headlines land in the store
+
+    async def refresh_once(self) -> int:
+        """Fetch every feed once and ingest the results into the store"""
+        logger.debug("🔄 Scraping fresh headlines...")
+        with stage("rss_fetch"):
+            headlines = await self.fetcher.fetch_all()
+        with stage("headline_ingest"):
+            new_count = await asyncio.to_thread(self.store.add, headlines)
+        STAGE_ITEMS.labels(stage="headline_ingest").inc(new_count)
+        logger.info(f"✅ Ingested {len(headlines)} headlines ({new_count} new, "
+                    f"{self.store.near_duplicates} near-duplicates skipped so far, {len(self.store)} stored)")
+        if new_count and self.on_ingest is not None:
+            self.on_ingest()
+        return new_count
+
+    async def run_once(self):
+        await self.refresh_once()
+
+    async def stop(self):
+        await super().stop()
+        await self.fetcher.aclose()
+
+_store: Optional[HeadlineStore] = None
+_store_lock = threading.Lock()
+
+def get_headline_store() -> HeadlineStore:
+    """Return the process-wide headline store, opening it on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = HeadlineStore()
+    return _store
@@ -1,17 +1,21 @@
+import logging
 import os
 from typing import Dict, List, Any
 from langchain_core.tools import tool
 from langchain_mistralai import ChatMistralAI
 from langgraph.prebuilt import create_react_agent
-import spacy
+from nlp_models import get_nlp
+import corruption
+from gender_lexicon import determine_gender
 import random
 import json
 
+logger = logging.getLogger(__name__)
+
 @tool
 def analyze_sentence_structure(sentence: str) -> str:
     """Analyze French sentence structure to identify key grammatical elements"""
-    nlp = spacy.load("fr_core_news_sm")
-    doc = nlp(sentence)
+    doc = get_nlp()(sentence)
     
     analysis = {
         "nouns": [],
@@ -39,41 +43,13 @@ def analyze_sentence_structure(sentence: str) -> str:
 @tool
 def identify_target_nouns(sentence: str) -> str:
     """Identify nouns with clear gender markers that would make good learning targets"""
-    nlp = spacy.load("fr_core_news_sm")
-    doc = nlp(sentence)
+    doc = get_nlp()(sentence)
     candidates = []
     
-    def determine_gender_enhanced(token, doc):
-        """Enhanced gender determination with fallbacks"""
-        # Check surrounding articles (3 words before and after)
-        for i in range(max(0, token.i - 3), min(len(doc), token.i + 3)):
-            context_token = doc[i]
-            text_lower = context_token.text.lower()
-            
-            # Masculine indicators
-            if text_lower in ["le", "du", "au", "un", "ce", "cet", "mon", "ton", "son"]:
-                return "masculine"
-            # Feminine indicators  
-            elif text_lower in ["la", "de la", "à la", "une", "cette", "ma", "ta", "sa"]:
-                return "feminine"
-        
-        # Fallback: Use common French word endings
-        word_lower = token.text.lower()
-        
-        # Common feminine endings
-        if word_lower.endswith(('tion', 'sion', 'ure', 'ence', 'ance', 'ette', 'elle', 'esse')):
-            return "feminine"
-        # Common masculine endings
-        elif word_lower.endswith(('ment', 'age', 'isme', 'eau', 'ou')):
-            return "masculine"
-        
-        # Default to masculine (more common in French)
-        return "masculine"
-    
     for token in doc:
         if token.pos_ == "NOUN" and len(token.text) > 2:
-            # Use enhanced gender determination
-            gender = determine_gender_enhanced(token, doc)
+            # Default to masculine (more common in French) when nothing else decides
+            gender = determine_gender(token, doc, default="masculine")
             article_context = ""
             
             # Find the closest article for context
@@ -127,13 +103,14 @@ def select_optimal_target(candidates_json: str) -> str:
         return json.dumps({"error": f"Error processing candidates: {str(e)}"})
 
 class FrenchGrammarAgent:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, nlp=None):
         self.llm = ChatMistralAI(
             model="mistral-small-latest",
             mistral_api_key=api_key,
             temperature=0.3
         )
-        self.nlp = spacy.load("fr_core_news_sm")
+        # Share the caller's pipeline instead of loading a second copy of the model
+        self.nlp = nlp if nlp is not None else get_nlp()
         
         # Create ReAct agent with tools
         self.agent = create_react_agent(
@@ -146,11 +123,11 @@ class FrenchGrammarAgent:
         )
     
     
-    def intelligent_word_selection(self, sentence: str, language_level: str = "beginner") -> Dict:
+    def intelligent_word_selection(self, sentence: str, language_level: str = "beginner", doc=None) -> Dict:
         """Use ReAct agent to select the best target word for educational purposes"""
         try:
-            # Extract nouns first as fallback
-            nouns = self._extract_nouns_with_gender(sentence)
+            # Extract nouns first as fallback, reusing the caller's parse when given
+            nouns = self._extract_nouns_with_gender(sentence, doc)
             if not nouns:
                 raise Exception("No suitable nouns found")
             
@@ -159,64 +136,39 @@ class FrenchGrammarAgent:
             return best_noun
             
         except Exception as e:
-            print(f"Word selection error: {e}")
-            return self._fallback_word_selection(sentence)
+            logger.warning(f"Word selection error: {e}")
+            return self._fallback_word_selection(sentence, doc)
     
-    def _extract_nouns_with_gender(self, sentence: str) -> List[Dict]:
+    def _extract_nouns_with_gender(self, sentence: str, doc=None) -> List[Dict]:
         """Extract nouns with gender information from sentence"""
-        doc = self.nlp(sentence)
+        if doc is None:
+            doc = self.nlp(sentence)
         nouns_with_gender = []
         
         for token in doc:
             if token.pos_ == "NOUN" and len(token.text) > 2:
-                # Determine gender based on surrounding articles
-                gender = self._determine_gender(token, doc)
-                print(f"DEBUG: Word '{token.text}' detected gender: {gender}")
+                # Default to masculine (more common in French) when nothing else decides
+                gender = determine_gender(token, doc, default="masculine")
+                logger.debug(f"Word '{token.text}' detected gender: {gender}")
                 
-                # Always add the noun since _determine_gender now never returns "unknown"
+                # Always add the noun, a default gender is always given
                 nouns_with_gender.append({
                     "word": token.text,
                     "gender": gender,
-                    "lemma": token.lemma_
+                    "lemma": token.lemma_,
+                    "agreement_spans": corruption.agreement_spans(token, gender)
                 })
         
-        print(f"DEBUG: Found {len(nouns_with_gender)} nouns with gender")
+        logger.debug(f"Found {len(nouns_with_gender)} nouns with gender")
         return nouns_with_gender
     
-    def _fallback_word_selection(self, sentence: str) -> Dict[str, Any]:
+    def _fallback_word_selection(self, sentence: str, doc=None) -> Dict[str, Any]:
         """Fallback word selection using spaCy"""
-        nouns = self._extract_nouns_with_gender(sentence)
+        nouns = self._extract_nouns_with_gender(sentence, doc)
         if not nouns:
             raise Exception("No suitable nouns found in sentence")
         return random.choice(nouns)
     
-    def _determine_gender(self, token, doc):
-        """Determine gender using context and morphology"""
-        # Check surrounding articles (3 words before and after)
-        for i in range(max(0, token.i - 3), min(len(doc), token.i + 3)):
-            context_token = doc[i]
-            text_lower = context_token.text.lower()
-            
-            # Masculine indicators
-            if text_lower in ["le", "du", "au", "un", "ce", "cet", "mon", "ton", "son"]:
-                return "masculine"
-            # Feminine indicators  
-            elif text_lower in ["la", "de la", "à la", "une", "cette", "ma", "ta", "sa"]:
-                return "feminine"
-        
-        # Fallback: Use common French word endings
-        word_lower = token.text.lower()
-        
-        # Common feminine endings
-        if word_lower.endswith(('tion', 'sion', 'ure', 'ence', 'ance', 'ette', 'elle', 'esse')):
-            return "feminine"
-        # Common masculine endings
-        elif word_lower.endswith(('ment', 'age', 'isme', 'eau', 'ou')):
-            return "masculine"
-        
-        # Default to masculine (more common in French)
-        return "masculine"
-    
     def _get_article_context(self, token, doc):
         """Get article context for a noun"""
         context = []
@@ -237,51 +189,15 @@ class FrenchGrammarAgent:
     def intelligent_sentence_restructuring(self, sentence: str, target_noun: Dict, language_level: str = "beginner") -> tuple[str, bool]:
         """Use ReAct agent to intelligently restructure sentences"""
         try:
-            # Skip ReAct agent to avoid timeouts, use direct logic
-            should_corrupt = random.choice([True, False])
-            
-            if not should_corrupt:
-                return sentence, True
-            
-            # Apply corruption based on target noun gender
-            corrupted = sentence
-            original_gender = target_noun["gender"]
-            
-            if original_gender == "masculine":
-                corrupted = corrupted.replace(" le ", " la ")
-                corrupted = corrupted.replace(" Le ", " La ")
-                corrupted = corrupted.replace(" un ", " une ")
-                corrupted = corrupted.replace(" Un ", " Une ")
-            else:
-                corrupted = corrupted.replace(" la ", " le ")
-                corrupted = corrupted.replace(" La ", " Le ")
-                corrupted = corrupted.replace(" une ", " un ")
-                corrupted = corrupted.replace(" Une ", " Un ")
-            
-            return corrupted, False
+            # Skip ReAct agent to avoid timeouts, use the span-based corruption engine directly
+            return corruption.corrupt_sentence(sentence, target_noun)
             
         except Exception as e:
-            print(f"Sentence restructuring failed: {e}")
+            logger.warning(f"Sentence restructuring failed: {e}")
             # Fallback to simple corruption
             return self._fallback_sentence_corruption(sentence, target_noun)
 
     def _fallback_sentence_corruption(self, sentence: str, target_noun: Dict) -> tuple[str, bool]:
-        should_corrupt = random.choice([True, False])
-        if not should_corrupt:
-            return sentence, True
-        
-        corrupted = sentence
-        original_gender = target_noun["gender"]
-        
-        if original_gender == "masculine":
-            corrupted = corrupted.replace(" le ", " la ")
-            corrupted = corrupted.replace(" Le ", " La ")
-            corrupted = corrupted.replace(" un ", " une ")
-            corrupted = corrupted.replace(" Un ", " Une ")
-        else:
-            corrupted = corrupted.replace(" la ", " le ")
-            corrupted = corrupted.replace(" La ", " Le ")
-            corrupted = corrupted.replace(" une ", " un ")
-            corrupted = corrupted.replace(" Une ", " Un ")
-        
-        return corrupted, False
+        # Text-only spans: flip the article right before the target word
+        fallback_noun = {"word": target_noun["word"], "gender": target_noun["gender"]}
+        return corruption.corrupt_sentence(sentence, fallback_noun)
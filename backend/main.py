@@ -1,28 +1,80 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
+from contextlib import asynccontextmanager
+import asyncio
 import json
-import random
 import os
 import uuid
 from pathlib import Path
-from data_pipeline import FrenchNewsProcessor, FALLBACK_SENTENCES
+from dotenv import load_dotenv
+load_dotenv()  # Before the imports below, which read their settings from the environment
+from telemetry import configure_logging, render_metrics
+configure_logging()  # Before the imports below, so their startup messages honour LOG_LEVEL
 from mistral_client import MistralFeedbackClient
-from typing import List, Dict, Optional
+from explanation_cache import CachePruner
+from nlp_engine import nlp_engine
+from nlp_models import loaded_models
+from headline_store import HeadlineRefresher, get_headline_store
+from challenge_pool import ChallengePool, ChallengeProducer, fallback_challenges
+from pregenerate_explanations import PregeneratedExplanations
+from session_store import SessionSweeper, create_session_store
+from vocabulary import VocabularyIndex
+from speculation import SpeculationBudget
+import signing
+import round_tokens
+from gender_lexicon import get_lexicon
+from profiling import ProfilingMiddleware, RequestProfiler
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 
 class StartGameRequest(BaseModel):
     language_level: str = "beginner"
+    mode: str = "news"  # "news" (sentence + word rounds) or "vocabulary" (word rounds only)
 
-app = FastAPI(title="VocaTinder - French Gender Learning API", version="2.0.0")
+# NEWS_GAMES=0 runs vocabulary games only: spaCy, LangChain and the RSS/challenge workers never load
+NEWS_GAMES_ENABLED = os.getenv("NEWS_GAMES", "1") == "1"
+# SESSION_PROGRESS=1 also mirrors each answer into the session store, for session-id status lookups.
+# Off by default: round tokens carry the game state, so answers never touch the session store.
+SESSION_PROGRESS = os.getenv("SESSION_PROGRESS", "0") == "1"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background_loads = [asyncio.create_task(asyncio.to_thread(mistral_client.warm_up))]
+    headline_refresher = challenge_producer = None
+    if NEWS_GAMES_ENABLED:
+        # Load and warm the spaCy pipeline in the background so /health can answer while it loads
+        background_loads.append(asyncio.create_task(asyncio.to_thread(nlp_engine.warm_up)))
+        # Periodically ingest RSS feeds into the shared, persisted headline store
+        headline_refresher = HeadlineRefresher(get_headline_store(), on_ingest=challenge_pool.refill_needed.set)
+        headline_refresher.start()
+        # Keep ready-made challenges per level so game starts never do NLP work inline
+        challenge_producer = ChallengeProducer(challenge_pool, nlp_engine.get_processor)
+        challenge_producer.start()
+    session_sweeper = SessionSweeper(session_store)
+    session_sweeper.start()
+    cache_pruner = CachePruner(mistral_client.cache)
+    cache_pruner.start()
+    yield
+    await cache_pruner.stop()
+    await session_sweeper.stop()
+    await asyncio.to_thread(session_store.close)
+    if challenge_producer is not None:
+        await challenge_producer.stop()
+    if headline_refresher is not None:
+        await headline_refresher.stop()
+    for task in background_loads:
+        if not task.done():
+            task.cancel()
+
+app = FastAPI(title="VocaTinder - French Gender Learning API", version="2.0.0", lifespan=lifespan)
 
 # Initialize processors
-news_processor = FrenchNewsProcessor()
 mistral_client = MistralFeedbackClient()
-
-# Store game sessions in memory (in production, use database)
-game_sessions = {}
+challenge_pool = ChallengePool()
+pregenerated_explanations = PregeneratedExplanations()
+speculation_budget = SpeculationBudget()
 
 # Store game progress for multi-round games
 class GameSession:
@@ -33,8 +85,29 @@ class GameSession:
         self.score = 0
         self.round_type = "sentence_check"  # Current round type
         self.current_target_noun = None
+    
+    def to_dict(self) -> Dict:
+        return {
+            "session_id": self.session_id,
+            "challenges": self.challenges,
+            "current_challenge_index": self.current_challenge_index,
+            "score": self.score,
+            "round_type": self.round_type,
+            "current_target_noun": self.current_target_noun
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "GameSession":
+        game_session = cls(data["session_id"])
+        game_session.challenges = data["challenges"]
+        game_session.current_challenge_index = data["current_challenge_index"]
+        game_session.score = data["score"]
+        game_session.round_type = data["round_type"]
+        game_session.current_target_noun = data["current_target_noun"]
+        return game_session
         
-active_games = {}
+# Active games, bounded by idle TTL and LRU eviction (SESSION_BACKEND=sqlite shares them across workers)
+session_store = create_session_store(GameSession.from_dict)
 
 # Pydantic models
 class GameRound(BaseModel):
@@ -54,6 +127,106 @@ class FeedbackResponse(BaseModel):
     explanation: str
     correct_answer: str
     next_round: Optional[GameRound]
+    score: int = 0  # Score so far in this game
+
+def sentence_round(round_id: str, challenge: Dict) -> GameRound:
+    return GameRound(
+        round_id=round_id,
+        round_type="sentence_check",
+        display_text=challenge["display_sentence"],
+        target_word=challenge["target_noun"]["word"],
+        correct_answer=challenge["is_correct"],
+        options={
+            "left": "Incorrect Grammar",
+            "right": "Correct Grammar"
+        }
+    )
+
+def word_round(round_id: str, challenge: Dict) -> GameRound:
+    target_word = challenge["target_noun"]["word"]
+    return GameRound(
+        round_id=round_id,
+        round_type="word_check",
+        display_text=target_word,
+        target_word=target_word,
+        correct_answer=(challenge["target_noun"]["gender"] == "masculine"),
+        options={
+            "left": "Feminine (LA)",
+            "right": "Masculine (LE)"
+        }
+    )
+
+def opening_round_type(challenge: Dict) -> str:
+    """A challenge opens with the sentence check, or the word itself for vocabulary games"""
+    return "word_check" if challenge.get("round_type") == "word_check" else "sentence_check"
+
+def token_round(round_info: Dict, challenge: Dict) -> GameRound:
+    """Build a round whose round_id is a signed token carrying the game state"""
+    round_id = round_tokens.issue(
+        round_info["game_id"], round_info["challenges"], round_info["index"],
+        round_info["round_type"], round_info["score"]
+    )
+    if round_info["round_type"] == "word_check":
+        return word_round(round_id, challenge)
+    return sentence_round(round_id, challenge)
+
+def sentence_answer_correct(challenge: Dict, user_choice: str) -> bool:
+    return (user_choice == "right" and challenge["is_correct"]) or \
+           (user_choice == "left" and not challenge["is_correct"])
+
+def gender_answer_correct(challenge: Dict, user_choice: str) -> bool:
+    correct_gender = challenge["target_noun"]["gender"]
+    return (user_choice == "right" and correct_gender == "masculine") or \
+           (user_choice == "left" and correct_gender == "feminine")
+
+async def sentence_error_explanation(challenge: Dict) -> str:
+    return await mistral_client.explain_sentence_error_async(
+        challenge["original_sentence"],
+        challenge["target_noun"]["word"],
+        challenge["target_noun"]["gender"]
+    )
+
+async def gender_rule_explanation(challenge: Dict) -> str:
+    # Vocabulary words are answered from the offline artifact without an LLM call
+    target_noun = challenge["target_noun"]
+    return pregenerated_explanations.get(target_noun["word"], target_noun["gender"]) or \
+        await mistral_client.explain_gender_rule_async(target_noun["word"], target_noun["gender"])
+
+def speculate(round_info: Dict, challenge: Dict):
+    """Start the explanation a wrong answer to this round would need, within the speculation budget"""
+    if round_info["round_type"] == "sentence_check":
+        kind, factory = "sentence_error", lambda: sentence_error_explanation(challenge)
+    else:
+        target_noun = challenge["target_noun"]
+        if pregenerated_explanations.get(target_noun["word"], target_noun["gender"]):
+            return  # Already answerable without an LLM call
+        kind, factory = "gender_rule", lambda: gender_rule_explanation(challenge)
+    
+    speculation_budget.start((round_info["game_id"], kind, round_info["index"]), factory)
+
+class GameManifest(BaseModel):
+    game_id: str
+    rounds: List[GameRound]  # Answered by position through /api/submit-answers; round_id only labels them
+    answer_key: str  # Signed, lets any request validate answers without server-side state
+
+class BatchAnswer(BaseModel):
+    round_index: int  # Position in GameManifest.rounds
+    user_choice: str  # "left" or "right"
+
+class BatchAnswerRequest(BaseModel):
+    answer_key: str
+    answers: List[BatchAnswer]
+
+class BatchAnswerResult(BaseModel):
+    round_index: int
+    is_correct: bool
+    explanation: str
+    correct_answer: str
+
+class BatchFeedbackResponse(BaseModel):
+    results: List[BatchAnswerResult]
+    score: int  # Correct answers so far in this game
+    answer_key: str  # Re-signed key recording the rounds answered, send it with the next batch
 
 # Enable CORS for frontend communication
 app.add_middleware(
@@ -64,8 +237,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling, the middleware is only installed when an admin token or sample rate is set
+profiler = RequestProfiler()
+if profiler.enabled:
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
 # Get the path to the words.json file in the backend folder
 WORDS_PATH = Path(__file__).parent / "words.json"
+# Level-indexed vocabulary, loaded once, serves word-only games without NLP or LLM work
+vocabulary = VocabularyIndex(WORDS_PATH)
 
 # Mount static files from React build folder (will be created after npm run build)
 # For development, React runs on port 3000, FastAPI on port 8000
@@ -76,198 +256,365 @@ async def serve_frontend():
     frontend_path = Path(__file__).parent.parent / "frontend" / "index.html"
     return FileResponse(frontend_path)
 
+def select_challenges(request: StartGameRequest, count: int = 10) -> List[Dict]:
+    if request.mode == "vocabulary" or not NEWS_GAMES_ENABLED:
+        return vocabulary.challenges(request.language_level, count)
+    
+    # Pop ready-made challenges, topping up from fallback data if the pool runs dry
+    challenges = challenge_pool.take(request.language_level, count)
+    if len(challenges) < count:
+        challenges += fallback_challenges(count - len(challenges))
+    return challenges
+
 @app.post("/api/start-game")
 async def start_game(request: StartGameRequest = StartGameRequest()) -> GameRound:
     """Start a new game and return the first round"""
     try:
-        session_id = str(uuid.uuid4())
-        
-        # Generate game data using the news processor with language level
-        news_processor = FrenchNewsProcessor()
-        game_data = news_processor.generate_game_data(num_rounds=10, language_level=request.language_level)
-        
-        if not game_data or len(game_data) < 10:
-            # Use fallback data if scraping fails
-            challenges = []
-            for i in range(10):
-                fallback = random.choice(FALLBACK_SENTENCES)
-                corrupted_sentence, is_correct = news_processor.corrupt_sentence(
-                    fallback["original_sentence"], 
-                    fallback["target_noun"]
-                )
-                challenges.append({
-                    "original_sentence": fallback["original_sentence"],
-                    "display_sentence": corrupted_sentence,
-                    "target_noun": fallback["target_noun"],
-                    "is_correct": is_correct
-                })
-        else:
-            challenges = game_data[:10]
+        challenges = select_challenges(request)
         
         # Create new game session
-        session_id = f"game_{random.randint(10000, 99999)}"
-        game_session = GameSession(session_id)
-        game_session.challenges = challenges
-        active_games[session_id] = game_session
+        session_id = f"game_{uuid.uuid4().hex}"
+        if SESSION_PROGRESS:
+            game_session = GameSession(session_id)
+            game_session.challenges = challenges
+            await asyncio.to_thread(session_store.put, game_session)
         
-        # Return first challenge
-        first_challenge = challenges[0]
-        round_id = f"{session_id}_challenge_0"
-        
-        return GameRound(
-            round_id=round_id,
-            round_type="sentence_check",
-            display_text=first_challenge["display_sentence"],
-            target_word=first_challenge["target_noun"]["word"],
-            correct_answer=first_challenge["is_correct"],
-            options={
-                "left": "Incorrect Grammar",
-                "right": "Correct Grammar"
-            }
-        )
+        # Return first challenge; round tokens carry the compact challenges, so any worker on any node can serve the game
+        round_info = {
+            "game_id": session_id,
+            "challenges": [round_tokens.compact_challenge(challenge) for challenge in challenges],
+            "index": 0,
+            "round_type": opening_round_type(challenges[0]),
+            "score": 0
+        }
+        speculate(round_info, challenges[0])
+        return token_round(round_info, challenges[0])
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate game: {str(e)}")
 
+async def evaluate_answer(answer: UserAnswer) -> Tuple[FeedbackResponse, Optional[Tuple], str]:
+    """Score an answer and advance the game using only the signed round token.
+    
+    Returns the feedback (explanation left empty for wrong answers), what still needs explaining
+    as (kind, challenge, speculative task or None) or None, and the text to append after it.
+    """
+    try:
+        round_info = round_tokens.read(answer.round_id)
+    except signing.InvalidToken as e:
+        raise HTTPException(status_code=400, detail=f"Invalid round ID: {e}")
+    
+    game_id, challenge_index = round_info["game_id"], round_info["index"]
+    current_challenge = round_tokens.challenge(round_info, challenge_index)
+    
+    target_noun = current_challenge["target_noun"]
+    correct_gender = target_noun["gender"]
+    
+    if round_info["round_type"] == "sentence_check":
+        user_correct = sentence_answer_correct(current_challenge, answer.user_choice)
+        score = round_info["score"] + int(user_correct)
+        
+        # Always proceed to Round 2 (Word Check) regardless of Round 1 result
+        target_word = target_noun["word"]
+        follow_up = f"Now identify the gender of '{target_word}'"
+        
+        next_info = dict(round_info, round_type="word_check", score=score)
+        await record_progress(round_info, challenge_index, score)
+        feedback = FeedbackResponse(
+            is_correct=user_correct,
+            explanation=f"Correct! {follow_up}" if user_correct else "",
+            correct_answer="Correct grammar" if user_correct else f"Correct: {current_challenge['original_sentence']}",
+            next_round=token_round(next_info, current_challenge),
+            score=score
+        )
+        speculative = speculation_budget.take((game_id, "sentence_error", challenge_index))
+        speculate(next_info, current_challenge)
+        if user_correct:
+            speculation_budget.discard(speculative)
+            return feedback, None, ""
+        return feedback, ("sentence_error", current_challenge, speculative), f" {follow_up}"
+    
+    # Check gender answer
+    user_gender_correct = gender_answer_correct(current_challenge, answer.user_choice)
+    score = round_info["score"] + int(user_gender_correct)
+    
+    # Move to next challenge
+    next_index = challenge_index + 1
+    next_round = None
+    if next_index < len(round_info["challenges"]):
+        await record_progress(round_info, next_index, score)
+        next_challenge = round_tokens.challenge(round_info, next_index)
+        next_info = dict(round_info, index=next_index, round_type=opening_round_type(next_challenge), score=score)
+        next_round = token_round(next_info, next_challenge)
+        speculate(next_info, next_challenge)
+    elif SESSION_PROGRESS:
+        # Game complete, free the session right away instead of waiting for the TTL
+        await asyncio.to_thread(session_store.delete, game_id)
+    
+    feedback = FeedbackResponse(
+        is_correct=user_gender_correct,
+        explanation=f"Excellent! '{target_noun['word']}' is indeed {correct_gender}." if user_gender_correct else "",
+        correct_answer=f"'{target_noun['word']}' is {correct_gender}",
+        next_round=next_round,
+        score=score
+    )
+    speculative = speculation_budget.take((game_id, "gender_rule", challenge_index))
+    if user_gender_correct:
+        speculation_budget.discard(speculative)
+        return feedback, None, ""
+    return feedback, ("gender_rule", current_challenge, speculative), ""
+
+async def explain(pending: Tuple) -> str:
+    kind, challenge, speculative = pending
+    if speculative is not None:
+        explanation = await speculation_budget.claim(speculative)
+        if explanation is not None:
+            return explanation
+    if kind == "sentence_error":
+        return await sentence_error_explanation(challenge)
+    return await gender_rule_explanation(challenge)
+
+def stream_explanation(pending: Tuple) -> AsyncIterator[str]:
+    kind, challenge, speculative = pending
+    target_noun = challenge["target_noun"]
+    if speculative is not None:
+        # Started when the round was served, usually finished (or close) by now
+        async def speculative_stream():
+            yield await explain(pending)
+        return speculative_stream()
+    if kind == "sentence_error":
+        return mistral_client.stream_sentence_error(
+            challenge["original_sentence"], target_noun["word"], target_noun["gender"]
+        )
+    
+    async def gender_rule_stream():
+        pregenerated = pregenerated_explanations.get(target_noun["word"], target_noun["gender"])
+        if pregenerated:
+            yield pregenerated
+            return
+        async for chunk in mistral_client.stream_gender_rule(target_noun["word"], target_noun["gender"]):
+            yield chunk
+    return gender_rule_stream()
+
 @app.post("/api/submit-answer")
 async def submit_answer(answer: UserAnswer) -> FeedbackResponse:
     """Submit user answer and get feedback + next round"""
     try:
-        # Parse round_id to get session and challenge info
-        if "_challenge_" in answer.round_id:
-            session_id, challenge_part = answer.round_id.split("_challenge_")
-            challenge_index = int(challenge_part)
-            round_type = "sentence_check"
-        elif "_word_" in answer.round_id:
-            session_id, word_part = answer.round_id.split("_word_")
-            challenge_index = int(word_part)
-            round_type = "word_check"
-        else:
-            raise HTTPException(status_code=400, detail="Invalid round ID format")
+        feedback, pending, suffix = await evaluate_answer(answer)
+        if pending:
+            feedback.explanation = (await explain(pending)) + suffix
+        return feedback
         
-        game_session = active_games.get(session_id)
-        if not game_session:
-            raise HTTPException(status_code=404, detail="Game session not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to process answer: {str(e)}")
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/api/submit-answer/stream")
+async def submit_answer_stream(answer: UserAnswer) -> StreamingResponse:
+    """Submit an answer and stream the result as Server-Sent Events.
+    
+    Events: "verdict" (FeedbackResponse, sent immediately), "token" (explanation chunks as the
+    LLM produces them) and "done" (the full explanation).
+    """
+    try:
+        feedback, pending, suffix = await evaluate_answer(answer)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to process answer: {str(e)}")
+    
+    async def events():
+        yield sse_event("verdict", feedback.model_dump())
+        explanation = feedback.explanation
+        if pending:
+            parts = []
+            stream = stream_explanation(pending)
+            try:
+                async for chunk in stream:
+                    parts.append(chunk)
+                    yield sse_event("token", chunk)
+            finally:
+                await stream.aclose()  # Right away when the client disconnects, not at garbage collection
+            if suffix:
+                parts.append(suffix)
+                yield sse_event("token", suffix)
+            explanation = "".join(parts)
+        yield sse_event("done", {"explanation": explanation})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/start-game/batch")
+async def start_game_batch(request: StartGameRequest = StartGameRequest()) -> GameManifest:
+    """Start a game and return every round at once, with a signed answer key for batch scoring"""
+    try:
+        challenges = [round_tokens.compact_challenge(challenge) for challenge in select_challenges(request)]
+        game_id = f"game_{uuid.uuid4().hex[:12]}"
         
-        current_challenge = game_session.challenges[challenge_index]
+        # Manifest round ids are labels, not round tokens: /api/submit-answer doesn't accept them
+        rounds = [
+            (sentence_round if round_type == "sentence_check" else word_round)(f"{game_id}#{index}", challenge)
+            for index, (round_type, challenge) in enumerate(round_tokens.manifest_rounds(challenges))
+        ]
+        answer_key = round_tokens.issue_answer_key(game_id, challenges)
+        return GameManifest(game_id=game_id, rounds=rounds, answer_key=answer_key)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate game: {str(e)}")
+
+@app.post("/api/submit-answers")
+async def submit_answers(batch: BatchAnswerRequest) -> BatchFeedbackResponse:
+    """Score a batch of answers against a signed answer key, explaining wrong ones concurrently.
+    
+    The returned answer key records the rounds answered and the game score so far; rounds already
+    answered in it are rejected, so the score in a key never counts a round twice.
+    """
+    try:
+        key = round_tokens.read_answer_key(batch.answer_key)
+    except signing.InvalidToken as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    manifest_rounds = round_tokens.manifest_rounds(key["challenges"])
+    
+    # Each round is answered at most once per game, so a game can never score more than its rounds
+    if len(batch.answers) > len(manifest_rounds) - len(key["answered"]):
+        raise HTTPException(status_code=400, detail=f"At most {len(manifest_rounds)} answers per game")
+    round_indexes = [answer.round_index for answer in batch.answers]
+    if len(set(round_indexes)) != len(round_indexes):
+        raise HTTPException(status_code=400, detail="Duplicate round index in batch")
+    for round_index in round_indexes:
+        if not 0 <= round_index < len(manifest_rounds):
+            raise HTTPException(status_code=400, detail=f"Invalid round index {round_index}")
+        if round_index in key["answered"]:
+            raise HTTPException(status_code=409, detail=f"Round {round_index} was already answered")
+    
+    results = []
+    pending = []  # (result position, explanation key)
+    explanations = {}  # Explanation key -> coroutine, each distinct explanation is requested once
+    for answer in batch.answers:
+        round_type, challenge = manifest_rounds[answer.round_index]
+        target_noun = challenge["target_noun"]
         
         if round_type == "sentence_check":
-            user_correct = (answer.user_choice == "right" and current_challenge["is_correct"]) or \
-                          (answer.user_choice == "left" and not current_challenge["is_correct"])
-            
-            if user_correct:
-                game_session.score += 1
-            
-            # Always proceed to Round 2 (Word Check) regardless of Round 1 result
-            target_noun = current_challenge["target_noun"]
-            target_word = target_noun["word"]
-            correct_gender = target_noun["gender"]
-            
-            # Get appropriate explanation
-            if user_correct:
-                explanation = f"Correct! Now identify the gender of '{target_word}'"
-            else:
-                explanation = mistral_client.explain_sentence_error(
-                    current_challenge["original_sentence"],
-                    current_challenge["target_noun"]["word"],
-                    current_challenge["target_noun"]["gender"]
-                )
-                explanation += f" Now identify the gender of '{target_word}'"
-            
-            word_round_id = f"{session_id}_word_{challenge_index}"
-            
-            next_round = GameRound(
-                round_id=word_round_id,
-                round_type="word_check",
-                display_text=target_word,
-                target_word=target_word,
-                correct_answer=(correct_gender == "masculine"),
-                options={
-                    "left": "Feminine (LA)",
-                    "right": "Masculine (LE)"
-                }
-            )
-            
-            return FeedbackResponse(
-                is_correct=user_correct,
-                explanation=explanation,
-                correct_answer="Correct grammar" if user_correct else f"Correct: {current_challenge['original_sentence']}",
-                next_round=next_round
-            )
+            is_correct = sentence_answer_correct(challenge, answer.user_choice)
+            correct_answer = "Correct grammar" if is_correct else f"Correct: {challenge['original_sentence']}"
+            explanation = "Correct!"
+            explanation_key = ("sentence_error", challenge["original_sentence"], target_noun["word"], target_noun["gender"])
+            explain_wrong = sentence_error_explanation
+        else:
+            is_correct = gender_answer_correct(challenge, answer.user_choice)
+            correct_answer = f"'{target_noun['word']}' is {target_noun['gender']}"
+            explanation = f"Excellent! '{target_noun['word']}' is indeed {target_noun['gender']}."
+            explanation_key = ("gender_rule", target_noun["word"], target_noun["gender"])
+            explain_wrong = gender_rule_explanation
+        if not is_correct:
+            if explanation_key not in explanations:
+                explanations[explanation_key] = explain_wrong(challenge)
+            pending.append((len(results), explanation_key))
         
-        elif round_type == "word_check":
-            # Check gender answer
-            target_noun = current_challenge["target_noun"]
-            correct_gender = target_noun["gender"]
-            user_gender_correct = (answer.user_choice == "right" and correct_gender == "masculine") or \
-                                 (answer.user_choice == "left" and correct_gender == "feminine")
-            
-            if user_gender_correct:
-                game_session.score += 1
-                explanation = f"Excellent! '{target_noun['word']}' is indeed {correct_gender}."
-            else:
-                explanation = mistral_client.explain_gender_rule(
-                    target_noun["word"], 
-                    correct_gender
-                )
-            
-            # Move to next challenge
-            game_session.current_challenge_index += 1
-            
-            if game_session.current_challenge_index >= len(game_session.challenges):
-                # Game complete
-                return FeedbackResponse(
-                    is_correct=user_gender_correct,
-                    explanation=explanation,
-                    correct_answer=f"'{target_noun['word']}' is {correct_gender}",
-                    next_round=None
-                )
-            
-            # Next challenge
-            next_challenge = game_session.challenges[game_session.current_challenge_index]
-            next_round_id = f"{session_id}_challenge_{game_session.current_challenge_index}"
-            
-            next_round = GameRound(
-                round_id=next_round_id,
-                round_type="sentence_check",
-                display_text=next_challenge["display_sentence"],
-                target_word=next_challenge["target_noun"]["word"],
-                correct_answer=next_challenge["is_correct"],
-                options={
-                    "left": "Incorrect Grammar",
-                    "right": "Correct Grammar"
-                }
-            )
-            
-            return FeedbackResponse(
-                is_correct=user_gender_correct,
-                explanation=explanation,
-                correct_answer=f"'{target_noun['word']}' is {correct_gender}",
-                next_round=next_round
-            )
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to process answer: {str(e)}")
+        results.append(BatchAnswerResult(
+            round_index=answer.round_index,
+            is_correct=is_correct,
+            explanation=explanation,
+            correct_answer=correct_answer
+        ))
+    
+    explained = dict(zip(explanations, await asyncio.gather(*explanations.values())))
+    for position, explanation_key in pending:
+        results[position].explanation = explained[explanation_key]
+    
+    score = key["score"] + sum(result.is_correct for result in results)
+    answer_key = round_tokens.issue_answer_key(
+        key["game_id"], key["challenges"], key["answered"].union(round_indexes), score
+    )
+    return BatchFeedbackResponse(results=results, score=score, answer_key=answer_key)
+
+async def record_progress(round_info: Dict, index: int, score: int):
+    """Mirror progress into the session record when SESSION_PROGRESS=1; the round token stays authoritative"""
+    if SESSION_PROGRESS:
+        # The SQLite backend may commit here, so keep it off the event loop
+        await asyncio.to_thread(store_progress, round_info["game_id"], index, score)
+
+def store_progress(game_id: str, index: int, score: int):
+    game_session = session_store.get(game_id)
+    if game_session:
+        game_session.current_challenge_index = index
+        game_session.score = score
+        session_store.put(game_session)  # Backends may hand out copies
 
 @app.get("/api/game-status/{session_id}")
 async def get_game_status(session_id: str):
-    """Get current game progress"""
-    game_session = active_games.get(session_id)
-    if not game_session:
-        raise HTTPException(status_code=404, detail="Game session not found")
+    """Get current game progress, from a round token (any worker) or a session id"""
+    if "." in session_id:
+        try:
+            round_info = round_tokens.read(session_id)
+        except signing.InvalidToken as e:
+            raise HTTPException(status_code=400, detail=f"Invalid round ID: {e}")
+        session_id = round_info["game_id"]
+        current_index, total, score = round_info["index"], len(round_info["challenges"]), round_info["score"]
+    else:
+        game_session = await asyncio.to_thread(session_store.get, session_id) if SESSION_PROGRESS else None
+        if not game_session:
+            raise HTTPException(status_code=404, detail="Game session not found, pass the current round_id instead")
+        current_index, total, score = game_session.current_challenge_index, len(game_session.challenges), game_session.score
     
     return {
         "session_id": session_id,
-        "current_challenge": game_session.current_challenge_index + 1,
-        "total_challenges": len(game_session.challenges),
-        "score": game_session.score,
-        "progress_percentage": round((game_session.current_challenge_index / len(game_session.challenges)) * 100)
+        "current_challenge": current_index + 1,
+        "total_challenges": total,
+        "score": score,
+        "progress_percentage": round((current_index / total) * 100)
     }
 
+@app.get("/api/profiles")
+async def list_profiles(x_profile_token: Optional[str] = Header(default=None)):
+    """List recent request profiles, newest first (requires PROFILE_ADMIN_TOKEN)"""
+    if not profiler.authorized(x_profile_token):
+        raise HTTPException(status_code=404, detail="Not found")
+    return {"profiles": await asyncio.to_thread(profiler.list_profiles)}
+
+@app.get("/api/profiles/{name}")
+async def get_profile(name: str, x_profile_token: Optional[str] = Header(default=None)):
+    """Fetch one profile as folded stacks, ready for flamegraph.pl or speedscope"""
+    if not profiler.authorized(x_profile_token):
+        raise HTTPException(status_code=404, detail="Not found")
+    profile = await asyncio.to_thread(profiler.read_profile, name)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics for pipeline stages, feeds, Mistral calls and session store operations"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "message": "🇫🇷 French Gender Swipe API is running!"}
+    """Health check endpoint, only healthy once the NLP engine has loaded (when news games are on)"""
+    if NEWS_GAMES_ENABLED and not nlp_engine.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": nlp_engine.status, "message": nlp_engine.error or "Loading French NLP model..."}
+        )
+    return {
+        "status": "healthy",
+        "message": "🇫🇷 French Gender Swipe API is running!",
+        "challenge_pool": challenge_pool.sizes(),
+        "sessions": await asyncio.to_thread(session_store.metrics),
+        "news_games": NEWS_GAMES_ENABLED,
+        "gender_lexicon": get_lexicon().summary(),
+        "speculation": speculation_budget.metrics(),
+        "explanation_cache": mistral_client.cache.summary(),
+        "spacy_models": loaded_models()
+    }
 
 if __name__ == "__main__":
     import uvicorn
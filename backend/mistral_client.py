@@ -2,52 +2,286 @@
 Mistral AI client for enhanced feedback and explanations
 """
 
+import asyncio
 import os
-from mistralai import Mistral
-from dotenv import load_dotenv
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from explanation_cache import ExplanationCache, make_key
+from telemetry import MISTRAL_CALL_SECONDS
 
-load_dotenv()
+# Bound concurrent LLM calls per process and give each one a deadline (queueing included)
+MAX_CONCURRENT_CALLS = int(os.getenv("MISTRAL_MAX_CONCURRENCY", "8"))
+CALL_DEADLINE = float(os.getenv("MISTRAL_DEADLINE_SECONDS", "8"))
+# Longest gap allowed between two chunks of a streamed explanation
+STREAM_IDLE_TIMEOUT = float(os.getenv("MISTRAL_STREAM_IDLE_SECONDS", "5"))
+# "mistral" for the real API, "fake" for the local stand-in in fake_mistral.py
+MISTRAL_BACKEND = os.getenv("MISTRAL_BACKEND", "mistral")
+DEFAULT_MODEL = "mistral-small-latest"
 
 class MistralFeedbackClient:
-    def __init__(self):
-        api_key = os.getenv('MISTRAL_API_KEY')
-        if not api_key:
-            raise ValueError("MISTRAL_API_KEY not found in environment variables")
-        
-        self.client = Mistral(api_key=api_key)
-        self.model = "mistral-small-latest"
-    
-    def explain_gender_rule(self, word: str, correct_gender: str) -> str:
-        """Get explanation for why a word has a specific gender"""
-        prompt = f"""Explain in 1-2 sentences why the French word "{word}" is {correct_gender}. 
+    """Explanations from Mistral, with fallback text whenever the API is unavailable.
+
+    The SDK is imported and the client built on first use (or by warm_up), so importing this module
+    is cheap and a missing MISTRAL_API_KEY only means fallback explanations.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_CALLS, deadline: Optional[float] = CALL_DEADLINE,
+                 cache: Optional[ExplanationCache] = None, client=None,
+                 stream_idle_timeout: Optional[float] = STREAM_IDLE_TIMEOUT):
+        if client is None and MISTRAL_BACKEND == "fake":
+            from fake_mistral import FakeMistral
+            client = FakeMistral()
+
+        self._client = client
+        self._api_key = os.getenv('MISTRAL_API_KEY')
+        self.model = getattr(client, "model_name", DEFAULT_MODEL)
+        self.deadline = deadline
+        self.stream_idle_timeout = stream_idle_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.cache = cache if cache is not None else ExplanationCache()
+        # Cache key -> [shared completion task, waiters], so concurrent misses make one API call
+        self._in_flight: Dict[str, List] = {}
+
+    @property
+    def available(self) -> bool:
+        return self._client is not None or bool(self._api_key)
+
+    @property
+    def client(self):
+        if self._client is None:
+            if not self._api_key:
+                raise ValueError("MISTRAL_API_KEY not found in environment variables")
+            from mistralai import Mistral
+            self._client = Mistral(api_key=self._api_key)
+        return self._client
+
+    def warm_up(self) -> bool:
+        """Import the SDK and build the client ahead of the first explanation, if a key is set"""
+        if not self.available:
+            return False
+        self.client
+        return True
+
+    @staticmethod
+    def _gender_rule_prompt(word: str, correct_gender: str) -> str:
+        return f"""Explain in 1-2 sentences why the French word "{word}" is {correct_gender}.
         Include any relevant grammar rules or patterns. Keep it concise and educational.
         Respond in English for learning purposes."""
-        
+
+    @staticmethod
+    def _sentence_error_prompt(sentence: str, target_word: str, correct_gender: str) -> str:
+        return f"""This French sentence has a gender agreement error: "{sentence}"
+        The word "{target_word}" should be {correct_gender}.
+        Explain the error in 1-2 sentences. Keep it educational and concise.
+        Respond in English."""
+
+    @staticmethod
+    def _observe(call: str, start: float, outcome: str):
+        MISTRAL_CALL_SECONDS.labels(call=call, outcome=outcome).observe(time.perf_counter() - start)
+
+    def _complete(self, prompt: str, max_tokens: int) -> str:
+        start = time.perf_counter()
         try:
             response = self.client.chat.complete(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=100,
+                max_tokens=max_tokens,
                 temperature=0.3
             )
+        except Exception:
+            self._observe("complete", start, "error")
+            raise
+        self._observe("complete", start, "ok")
+        return response.choices[0].message.content.strip()
+
+    async def _complete_async(self, prompt: str, max_tokens: int) -> str:
+        """Non-blocking completion, limited by the concurrency cap and the per-call deadline"""
+        async def call():
+            async with self._semaphore:
+                response = await self.client.chat.complete_async(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=max_tokens,
+                    temperature=0.3
+                )
             return response.choices[0].message.content.strip()
+
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(call(), timeout=self.deadline)
+        except asyncio.TimeoutError:
+            self._observe("complete_async", start, "timeout")
+            raise
+        except Exception:
+            self._observe("complete_async", start, "error")
+            raise
+        self._observe("complete_async", start, "ok")
+        return result
+
+    def _cached_complete(self, key: str, prompt: str, max_tokens: int) -> str:
+        explanation = self.cache.get(key)
+        if explanation is None:
+            explanation = self._complete(prompt, max_tokens)
+            self.cache.set(key, explanation)
+        return explanation
+
+    async def _single_flight(self, key: str, factory: Callable[[], Awaitable[str]]) -> str:
+        """Await the in-flight call for key, starting it if none; cancelled once no caller waits"""
+        entry = self._in_flight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(factory())
+            entry = self._in_flight[key] = [task, 0]
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        entry[1] += 1
+        try:
+            return await asyncio.shield(entry[0])
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not entry[0].done():
+                entry[0].cancel()
+
+    async def _cached_complete_async(self, key: str, prompt: str, max_tokens: int) -> str:
+        explanation = await self.cache.get_async(key)
+        if explanation is not None:
+            return explanation
+
+        async def complete_and_cache() -> str:
+            explanation = await self._complete_async(prompt, max_tokens)
+            await self.cache.set_async(key, explanation)
+            return explanation
+        return await self._single_flight(key, complete_and_cache)
+
+    def explain_gender_rule(self, word: str, correct_gender: str) -> str:
+        """Get explanation for why a word has a specific gender"""
+        key = make_key("gender_rule", self.model, word, correct_gender)
+        try:
+            return self._cached_complete(key, self._gender_rule_prompt(word, correct_gender), max_tokens=100)
         except Exception as e:
             return f"The word '{word}' is {correct_gender}."
-    
+
     def explain_sentence_error(self, sentence: str, target_word: str, correct_gender: str) -> str:
         """Explain why a sentence has incorrect gender agreement"""
-        prompt = f"""This French sentence has a gender agreement error: "{sentence}"
-        The word "{target_word}" should be {correct_gender}.
-        Explain the error in 1-2 sentences. Keep it educational and concise.
-        Respond in English."""
-        
+        key = make_key("sentence_error", self.model, sentence, target_word, correct_gender)
         try:
-            response = self.client.chat.complete(
+            return self._cached_complete(
+                key, self._sentence_error_prompt(sentence, target_word, correct_gender), max_tokens=120
+            )
+        except Exception as e:
+            return f"Gender agreement error: '{target_word}' should use {correct_gender} articles."
+
+    async def explain_gender_rule_async(self, word: str, correct_gender: str) -> str:
+        """Async version of explain_gender_rule that never blocks the event loop"""
+        key = make_key("gender_rule", self.model, word, correct_gender)
+        try:
+            return await self._cached_complete_async(
+                key, self._gender_rule_prompt(word, correct_gender), max_tokens=100
+            )
+        except Exception as e:
+            return f"The word '{word}' is {correct_gender}."
+
+    async def explain_sentence_error_async(self, sentence: str, target_word: str, correct_gender: str) -> str:
+        """Async version of explain_sentence_error that never blocks the event loop"""
+        key = make_key("sentence_error", self.model, sentence, target_word, correct_gender)
+        try:
+            return await self._cached_complete_async(
+                key, self._sentence_error_prompt(sentence, target_word, correct_gender), max_tokens=120
+            )
+        except Exception as e:
+            return f"Gender agreement error: '{target_word}' should use {correct_gender} articles."
+
+    async def _stream(self, key: str, prompt: str, max_tokens: int, fallback: str) -> AsyncIterator[str]:
+        """Yield explanation chunks as the LLM produces them, caching the full text at the end"""
+        cached = await self.cache.get_async(key)
+        if cached is not None:
+            yield cached
+            return
+        if key in self._in_flight:
+            # The same explanation is already being generated, wait for it rather than call again
+            try:
+                yield await self._single_flight(key, None)
+            except Exception:
+                yield fallback
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        pump = asyncio.create_task(self._pump_stream(prompt, max_tokens, queue))
+        parts = []
+        drained = False
+        try:
+            while (delta := await queue.get()) is not None:
+                parts.append(delta)
+                yield delta
+            drained = True
+        finally:
+            if not drained:
+                pump.cancel()  # The consumer went away, stop reading upstream
+
+        if not await pump:
+            if not parts:
+                yield fallback
+            return
+        if parts:
+            await self.cache.set_async(key, "".join(parts).strip())
+
+    async def _pump_stream(self, prompt: str, max_tokens: int, queue: asyncio.Queue) -> bool:
+        """Read the upstream stream into queue, then None; returns whether it completed.
+
+        The concurrency slot is held only while the upstream stream runs, never while a slow
+        client drains the queue. As in _complete_async, the deadline covers waiting for a slot and
+        opening the stream; after that each chunk must arrive within stream_idle_timeout.
+        """
+        start = time.perf_counter()
+        first_token = True
+        acquired = False
+
+        async def open_stream():
+            nonlocal acquired
+            await self._semaphore.acquire()
+            acquired = True
+            return await self.client.chat.stream_async(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=120,
+                max_tokens=max_tokens,
                 temperature=0.3
             )
-            return response.choices[0].message.content.strip()
+
+        try:
+            events = (await asyncio.wait_for(open_stream(), timeout=self.deadline)).__aiter__()
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.__anext__(), timeout=self.stream_idle_timeout)
+                except StopAsyncIteration:
+                    break
+                delta = event.data.choices[0].delta.content
+                if delta:
+                    if first_token:
+                        self._observe("stream_first_token", start, "ok")
+                        first_token = False
+                    queue.put_nowait(delta)
         except Exception as e:
-            return f"Gender agreement error: '{target_word}' should use {correct_gender} articles."
+            self._observe("stream", start, "timeout" if isinstance(e, asyncio.TimeoutError) else "error")
+            return False
+        finally:
+            if acquired:
+                self._semaphore.release()
+            queue.put_nowait(None)
+        self._observe("stream", start, "ok")
+        return True
+
+    def stream_gender_rule(self, word: str, correct_gender: str) -> AsyncIterator[str]:
+        """Streaming version of explain_gender_rule"""
+        return self._stream(
+            make_key("gender_rule", self.model, word, correct_gender),
+            self._gender_rule_prompt(word, correct_gender),
+            max_tokens=100,
+            fallback=f"The word '{word}' is {correct_gender}."
+        )
+
+    def stream_sentence_error(self, sentence: str, target_word: str, correct_gender: str) -> AsyncIterator[str]:
+        """Streaming version of explain_sentence_error"""
+        return self._stream(
+            make_key("sentence_error", self.model, sentence, target_word, correct_gender),
+            self._sentence_error_prompt(sentence, target_word, correct_gender),
+            max_tokens=120,
+            fallback=f"Gender agreement error: '{target_word}' should use {correct_gender} articles."
+        )
@@ -0,0 +1,100 @@
+"""
+Near-duplicate headline detection: character shingles, MinHash signatures and an LSH band index
+
+Two feeds running the same story with slightly different wording get MinHash signatures that agree
+on most positions. Banding the signature means a lookup only compares against headlines sharing at
+least one band bucket, so finding a match stays sub-linear as the index grows.
+"""
+
+import os
+import random
+import re
+import zlib
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+from gender_lexicon import normalize, strip_accents
+
+SHINGLE_SIZE = 5  # Characters, robust to a changed word or punctuation in short titles
+NUM_PERM = 64
+BANDS = 16  # 4 rows per band: pairs around 0.5 similarity or more share a bucket with high probability
+SIMILARITY_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.6"))
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed seed: signatures are persisted, so the permutations must not change between runs
+_rng = random.Random(20240601)
+PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+Signature = Tuple[int, ...]
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hashed character n-grams of the accent-free, punctuation-free lowercase text"""
+    cleaned = re.sub(r"[\W_]+", " ", strip_accents(normalize(text))).strip()
+    if len(cleaned) <= size:
+        return {zlib.crc32(cleaned.encode("utf-8"))}
+    return {zlib.crc32(cleaned[i:i + size].encode("utf-8")) for i in range(len(cleaned) - size + 1)}
+
+def signature(text: str) -> Signature:
+    hashes = shingles(text)
+    return tuple(min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH for a, b in PERMUTATIONS)
+
+def similarity(first: Signature, second: Signature) -> float:
+    """Estimated Jaccard similarity: the share of positions where the signatures agree"""
+    return sum(x == y for x, y in zip(first, second)) / len(first)
+
+def pack(sig: Signature) -> bytes:
+    return array("I", sig).tobytes()
+
+def unpack(blob: bytes) -> Signature:
+    values = array("I")
+    values.frombytes(blob)
+    return tuple(values)
+
+class MinHashIndex:
+    def __init__(self, bands: int = BANDS, threshold: float = SIMILARITY_THRESHOLD):
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.threshold = threshold
+        self._signatures: Dict[str, Signature] = {}
+        self._buckets: Dict[Tuple[int, Signature], Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    def keys(self) -> List[str]:
+        return list(self._signatures)
+
+    def _band_keys(self, sig: Signature) -> List[Tuple[int, Signature]]:
+        return [(band, sig[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def add(self, key: str, sig: Signature):
+        self._signatures[key] = sig
+        for band_key in self._band_keys(sig):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def remove(self, key: str):
+        sig = self._signatures.pop(key, None)
+        if sig is None:
+            return
+        for band_key in self._band_keys(sig):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def find(self, sig: Signature) -> Optional[str]:
+        """The most similar indexed key at or above the threshold, if any"""
+        candidates = set()
+        for band_key in self._band_keys(sig):
+            candidates.update(self._buckets.get(band_key, ()))
+
+        best, best_score = None, self.threshold
+        for key in candidates:
+            score = similarity(sig, self._signatures[key])
+            if score >= best_score:
+                best, best_score = key, score
+        return best
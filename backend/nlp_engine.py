@@ -0,0 +1,71 @@
+"""
+Process-wide NLP engine: loads the spaCy pipeline and grammar agent once and shares them
+"""
+
+import logging
+import threading
+from typing import Optional
+from data_pipeline import FrenchNewsProcessor
+from nlp_models import DEFAULT_MODEL, get_nlp
+from gender_lexicon import get_lexicon
+
+logger = logging.getLogger(__name__)
+
+WARMUP_SENTENCE = "Le président français a donné une conférence de presse."
+
+class NLPEngine:
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        self.model_name = model_name
+        self.nlp = None
+        self.lexicon = None
+        self.news_processor: Optional[FrenchNewsProcessor] = None
+        self.ready = False
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def status(self) -> str:
+        if self.ready:
+            return "ready"
+        return "failed" if self.error else "loading"
+
+    def load(self) -> "NLPEngine":
+        """Load the spaCy model once, build the shared processor/agent and warm them up"""
+        if self.ready:
+            return self
+
+        with self._lock:
+            if self.ready:
+                return self
+
+            try:
+                self.nlp = get_nlp(self.model_name)
+                self.lexicon = get_lexicon()
+                self.news_processor = FrenchNewsProcessor(nlp=self.nlp)
+
+                # First call initializes lazy pipeline state, keep it off the request path
+                self.nlp(WARMUP_SENTENCE)
+                self.error = None
+                self.ready = True
+                logger.info(f"✅ NLP engine ready ({self.model_name})")
+            except Exception as e:
+                self.error = str(e)
+                logger.error(f"⚠️  NLP engine failed to load: {e}")
+                raise
+
+        return self
+
+    def warm_up(self) -> bool:
+        """Boot-time load that records failures instead of raising"""
+        try:
+            self.load()
+        except Exception:
+            return False
+        return True
+
+    def get_processor(self) -> FrenchNewsProcessor:
+        """Return the shared news processor, loading the engine if needed"""
+        return self.load().news_processor
+
+# Single engine shared by every request in this process
+nlp_engine = NLPEngine()
@@ -0,0 +1,49 @@
+"""
+Registry of loaded spaCy pipelines so every tool, agent and processor shares one copy per config
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "fr_core_news_sm"
+
+# Components we never read (entities), comma separated, e.g. SPACY_DISABLE="ner,senter"
+DEFAULT_DISABLED = tuple(
+    name.strip() for name in os.getenv("SPACY_DISABLE", "ner").split(",") if name.strip()
+)
+
+_models: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+_lock = threading.Lock()
+
+def get_nlp(model_name: str = DEFAULT_MODEL, disable: Optional[Iterable[str]] = None):
+    """Return the cached pipeline for (model, disabled components), loading it on first use"""
+    disabled = tuple(sorted(DEFAULT_DISABLED if disable is None else disable))
+    key = (model_name, disabled)
+
+    nlp = _models.get(key)
+    if nlp is not None:
+        return nlp
+
+    with _lock:
+        nlp = _models.get(key)
+        if nlp is None:
+            import spacy  # Deferred so importing the app does not pay for spaCy
+            try:
+                nlp = spacy.load(model_name, disable=list(disabled))
+            except OSError:
+                logger.error(f"⚠️  spaCy model '{model_name}' not found. Run: python -m spacy download {model_name}")
+                raise
+            _models[key] = nlp
+            logger.info(f"✅ Loaded spaCy model {model_name} (disabled: {', '.join(disabled) or 'none'})")
+    return nlp
+
+def loaded_models() -> Dict[str, list]:
+    """Describe the pipelines currently held in the registry"""
+    return {
+        f"{name}[-{','.join(disabled)}]": list(nlp.pipe_names)
+        for (name, disabled), nlp in _models.items()
+    }
@@ -0,0 +1,190 @@
+"""
+Offline batch job that pre-generates gender explanations for every words.json entry
+
+    python pregenerate_explanations.py                  # Mistral backend (needs MISTRAL_API_KEY)
+    python pregenerate_explanations.py --backend stub   # local stand-in, no network
+
+Progress is checkpointed to a JSON-lines file per backend model so an interrupted run resumes where
+it stopped. Stub runs write to their own artifact, which the game refuses to serve.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from explanation_cache import normalize
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).parent
+WORDS_PATH = BACKEND_DIR / "words.json"
+ARTIFACT_PATH = Path(os.getenv("GENDER_EXPLANATIONS_PATH", BACKEND_DIR / "gender_explanations.json"))
+STUB_ARTIFACT_PATH = BACKEND_DIR / "gender_explanations.stub.json"
+
+def entry_key(word: str, gender: str) -> str:
+    return f"{normalize(word)}|{gender}"
+
+class StubBackend:
+    """Deterministic local backend for development and tests"""
+    name = "stub"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def explain_gender_rule(self, word: str, gender: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        article = "le" if gender == "masculine" else "la"
+        return f"'{word}' is {gender}: say '{article} {word}'."
+
+class MistralBackend:
+    """Calls Mistral directly and lets errors propagate so the job can retry them"""
+    name = "mistral"
+
+    def __init__(self):
+        from mistral_client import MistralFeedbackClient
+        self.client = MistralFeedbackClient()
+        if not self.client.available:
+            raise ValueError("MISTRAL_API_KEY not found in environment variables")
+        self.name = self.client.model
+
+    def explain_gender_rule(self, word: str, gender: str) -> str:
+        return self.client._complete(self.client._gender_rule_prompt(word, gender), max_tokens=100)
+
+BACKENDS = {"stub": StubBackend, "mistral": MistralBackend}
+DEFAULT_OUTPUTS = {"stub": STUB_ARTIFACT_PATH, "mistral": ARTIFACT_PATH}
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart"""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_call = 0.0
+
+    def wait(self):
+        now = time.monotonic()
+        if now < self._next_call:
+            time.sleep(self._next_call - now)
+            now = self._next_call
+        self._next_call = now + self.interval
+
+def call_with_retry(fn, *args, retries: int = 4, base_delay: float = 1.0):
+    """Call fn with exponential backoff and jitter between failed attempts"""
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = base_delay * (2 ** attempt) * (1 + random.random() * 0.25)
+            print(f"⚠️  {e!r}, retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+            time.sleep(delay)
+
+def load_vocabulary(words_path: Path = WORDS_PATH) -> List[Tuple[str, str]]:
+    """Unique (word, gender) pairs from words.json, in file order"""
+    with open(words_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    return list(dict.fromkeys((entry["word"], entry["gender"]) for entry in entries))
+
+def checkpoint_path_for(artifact_path: Path, model: str) -> Path:
+    """Checkpoint of one backend model, so a run never resumes from another model's output"""
+    safe_model = "".join(char if char.isalnum() or char in "-_" else "_" for char in model)
+    return artifact_path.with_suffix(f".{safe_model}.checkpoint.jsonl")
+
+def load_checkpoint(checkpoint_path: Path) -> Dict[str, str]:
+    done = {}
+    if checkpoint_path.exists():
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partially written last line from an interrupted run
+                done[record["key"]] = record["explanation"]
+    return done
+
+def run(backend, words_path: Path = WORDS_PATH, artifact_path: Path = ARTIFACT_PATH,
+        rate: float = 2.0, retries: int = 4, limit: Optional[int] = None) -> Dict[str, str]:
+    vocabulary = load_vocabulary(words_path)
+    if limit:
+        vocabulary = vocabulary[:limit]
+
+    checkpoint_path = checkpoint_path_for(artifact_path, backend.name)
+    explanations = load_checkpoint(checkpoint_path)
+    pending = [(word, gender) for word, gender in vocabulary if entry_key(word, gender) not in explanations]
+    print(f"📚 {len(vocabulary)} entries, {len(explanations)} checkpointed, {len(pending)} to generate")
+
+    limiter = RateLimiter(rate)
+    failed = 0
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        for i, (word, gender) in enumerate(pending, 1):
+            limiter.wait()
+            try:
+                explanation = call_with_retry(backend.explain_gender_rule, word, gender, retries=retries)
+            except Exception as e:
+                failed += 1
+                print(f"❌ Giving up on '{word}': {e!r}")
+                continue
+
+            key = entry_key(word, gender)
+            explanations[key] = explanation
+            checkpoint.write(json.dumps({"key": key, "explanation": explanation}, ensure_ascii=False) + "\n")
+            checkpoint.flush()
+            if i % 50 == 0:
+                print(f"   {i}/{len(pending)} generated")
+
+    artifact = {
+        "model": backend.name,
+        "generated_at": int(time.time()),
+        "explanations": explanations
+    }
+    with open(artifact_path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(",", ":"))
+
+    print(f"✅ Wrote {len(explanations)} explanations to {artifact_path} ({failed} failed)")
+    return explanations
+
+class PregeneratedExplanations:
+    """Read-only lookup over the artifact, served on the answer hot path (stub artifacts are refused)"""
+
+    def __init__(self, artifact_path: Path = ARTIFACT_PATH):
+        self.explanations: Dict[str, str] = {}
+        self.model = None
+        if artifact_path.exists():
+            with open(artifact_path, "r", encoding="utf-8") as f:
+                artifact = json.load(f)
+            if artifact.get("model") == StubBackend.name:
+                logger.warning(f"⚠️  Ignoring {artifact_path.name}: generated by the stub backend")
+                return
+            self.explanations = artifact.get("explanations", {})
+            self.model = artifact.get("model")
+            logger.info(f"📚 Loaded {len(self.explanations)} pre-generated {self.model} gender explanations")
+
+    def __len__(self) -> int:
+        return len(self.explanations)
+
+    def get(self, word: str, gender: str) -> Optional[str]:
+        return self.explanations.get(entry_key(word, gender))
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Pre-generate gender explanations for the vocabulary")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="mistral")
+    parser.add_argument("--words", type=Path, default=WORDS_PATH)
+    parser.add_argument("--output", type=Path, default=None,
+                        help=f"Artifact path (default: {ARTIFACT_PATH.name}, {STUB_ARTIFACT_PATH.name} for the stub)")
+    parser.add_argument("--rate", type=float, default=2.0, help="Maximum requests per second")
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=None, help="Only process the first N entries")
+    args = parser.parse_args()
+
+    output = args.output or DEFAULT_OUTPUTS[args.backend]
+    run(BACKENDS[args.backend](), args.words, output, args.rate, args.retries, args.limit)
@@ -0,0 +1,178 @@
+"""
+Opt-in per-request profiling for the game endpoints, saved as flame-graph-ready folded stacks
+
+A request is profiled when it carries the admin token (X-Profile header or ?profile= query) or is
+picked by PROFILE_SAMPLE_RATE. Profiles are written to PROFILE_DIR in the collapsed-stack format read
+by flamegraph.pl and speedscope. The middleware is only installed when one of those is configured,
+so the normal path pays nothing when profiling is off.
+"""
+
+import asyncio
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", Path(__file__).parent / "profiles"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_SECONDS", "0.001"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+PROFILED_PATHS = frozenset({
+    "/api/start-game", "/api/start-game/batch", "/api/submit-answer", "/api/submit-answer/stream",
+    "/api/submit-answers"
+})
+PROFILE_NAME = re.compile(r"^[\w.-]+\.folded$")
+
+def _fold(frame, thread_name: str) -> str:
+    """One 'thread;outer;...;inner' line, the format flame graph tools consume"""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+        frame = frame.f_back
+    parts.append(thread_name)
+    return ";".join(reversed(parts))
+
+def _idle(frame) -> bool:
+    """Threads parked on a lock or condition (idle pool workers, sleepers) only add noise"""
+    return frame.f_code.co_name == "wait" and frame.f_code.co_filename == threading.__file__
+
+class StackSampler:
+    """Samples the stacks of every thread at a fixed interval until stopped.
+
+    Sampling the whole process also catches work handed to worker threads (spaCy, SQLite), and
+    anything else running concurrently, which the profile metadata cannot separate out.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own and not _idle(frame):
+                    self.stacks[_fold(frame, names.get(ident, str(ident)))] += 1
+            self.samples += 1
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+class RequestProfiler:
+    def __init__(self, admin_token: str = PROFILE_ADMIN_TOKEN, sample_rate: float = PROFILE_SAMPLE_RATE,
+                 directory: Path = PROFILE_DIR, keep: int = PROFILE_KEEP):
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.directory = Path(directory)
+        self.keep = keep
+        self._active = threading.Lock()  # One profile at a time, samples cover the whole process
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.admin_token) or self.sample_rate > 0
+
+    def authorized(self, token: Optional[str]) -> bool:
+        return bool(self.admin_token) and token is not None and hmac.compare_digest(token, self.admin_token)
+
+    def wanted(self, scope: Dict) -> bool:
+        token = dict(scope["headers"]).get(b"x-profile", b"").decode("latin-1")
+        if not token:
+            token = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile", [""])[0]
+        if token:
+            return self.authorized(token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def begin(self) -> Optional[StackSampler]:
+        """Start sampling, or None when another request is being profiled"""
+        if not self._active.acquire(blocking=False):
+            return None
+        sampler = StackSampler()
+        sampler.start()
+        return sampler
+
+    def finish(self, sampler: StackSampler, name: str, path: str):
+        try:
+            sampler.stop()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            lines = [f"# {path} {sampler.duration * 1000:.1f}ms {sampler.samples} samples"]
+            lines += [f"{stack} {count}" for stack, count in sampler.stacks.most_common()]
+            (self.directory / name).write_text("\n".join(lines) + "\n", encoding="utf-8")
+            self._prune()
+        finally:
+            self._active.release()
+
+    def _prune(self):
+        profiles = sorted(self.directory.glob("*.folded"), key=lambda path: path.stat().st_mtime, reverse=True)
+        for stale in profiles[self.keep:]:
+            stale.unlink(missing_ok=True)
+
+    def list_profiles(self) -> List[Dict]:
+        if not self.directory.exists():
+            return []
+        profiles = sorted(self.directory.glob("*.folded"), key=lambda path: path.stat().st_mtime, reverse=True)
+        result = []
+        for path in profiles:
+            with path.open(encoding="utf-8") as profile:
+                header = profile.readline().lstrip("# ").strip()
+            result.append({"name": path.name, "summary": header, "bytes": path.stat().st_size,
+                           "created": path.stat().st_mtime})
+        return result
+
+    def read_profile(self, name: str) -> Optional[str]:
+        if not PROFILE_NAME.match(name):
+            return None
+        path = self.directory / name
+        return path.read_text(encoding="utf-8") if path.is_file() else None
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling opted-in requests to the game endpoints"""
+
+    def __init__(self, app, profiler: RequestProfiler, paths=PROFILED_PATHS):
+        self.app = app
+        self.profiler = profiler
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths or not self.profiler.wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = self.profiler.begin()
+        if sampler is None:
+            await self.app(scope, receive, send)
+            return
+
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}_{scope['path'].strip('/').replace('/', '-')}_{uuid.uuid4().hex[:8]}.folded"
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", name.encode("ascii"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            await asyncio.to_thread(self.profiler.finish, sampler, name, scope["path"])
@@ -0,0 +1,106 @@
+"""
+Signed round tokens: the round_id carries everything needed to validate and advance a game
+
+Payload: game id, the game's challenges in compact form, challenge index, round type and score so
+far. Any worker on any node holding VOCATINDER_SIGNING_KEY can verify a token and serve the next
+round with no shared session or challenge storage.
+
+Batch games use an answer key instead: the same challenges plus the manifest rounds answered so far
+and the running score, re-signed after every batch of answers.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+import signing
+
+ROUND_TYPE_CODES = {"sentence_check": "s", "word_check": "w"}
+ROUND_TYPES = {code: round_type for round_type, code in ROUND_TYPE_CODES.items()}
+
+def compact_challenge(challenge: Dict) -> List:
+    """Minimal [type, sentence, word, gender, is_correct, display] form embedded in signed tokens.
+
+    display is only kept when it differs from the original sentence (corrupted sentences).
+    """
+    sentence = challenge.get("original_sentence", "")
+    display = challenge.get("display_sentence", sentence)
+    return [
+        "w" if challenge.get("round_type") == "word_check" else "s",
+        sentence,
+        challenge["target_noun"]["word"],
+        challenge["target_noun"]["gender"],
+        challenge.get("is_correct", True),
+        "" if display == sentence else display
+    ]
+
+def expand_challenge(compact: List) -> Dict:
+    round_type, sentence, word, gender, is_correct, *rest = compact  # Older answer keys have no display
+    return {
+        "round_type": ROUND_TYPES[round_type],
+        "original_sentence": sentence,
+        "display_sentence": (rest[0] if rest else "") or sentence,
+        "target_noun": {"word": word, "gender": gender},
+        "is_correct": is_correct
+    }
+
+def issue(game_id: str, challenges: List[List], index: int, round_type: str, score: int) -> str:
+    """Sign a round token; challenges are in compact_challenge form"""
+    return signing.sign({
+        "g": game_id,
+        "c": challenges,
+        "i": index,
+        "t": ROUND_TYPE_CODES[round_type],
+        "s": score
+    })
+
+def read(token: str) -> Dict:
+    """Verify a round token and return its fields, raises signing.InvalidToken"""
+    payload = signing.verify(token)
+    try:
+        round_info = {
+            "game_id": payload["g"],
+            "challenges": payload["c"],
+            "index": int(payload["i"]),
+            "round_type": ROUND_TYPES[payload["t"]],
+            "score": int(payload["s"])
+        }
+    except (KeyError, TypeError, ValueError):
+        raise signing.InvalidToken("Malformed round token")
+    if not isinstance(round_info["challenges"], list):
+        raise signing.InvalidToken("Malformed round token")
+    if not 0 <= round_info["index"] < len(round_info["challenges"]):
+        raise signing.InvalidToken("Round index out of range")
+    return round_info
+
+def challenge(round_info: Dict, index: int) -> Dict:
+    """The full challenge at index, rebuilt from the token"""
+    return expand_challenge(round_info["challenges"][index])
+
+def manifest_rounds(challenges: List[List]) -> List[Tuple[str, Dict]]:
+    """(round_type, challenge) per batch manifest round: the sentence check, unless the challenge
+    is word-only, then the word check"""
+    rounds = []
+    for compact in challenges:
+        challenge = expand_challenge(compact)
+        if challenge["round_type"] != "word_check":
+            rounds.append(("sentence_check", challenge))
+        rounds.append(("word_check", challenge))
+    return rounds
+
+def issue_answer_key(game_id: str, challenges: List[List], answered: Iterable[int] = (), score: int = 0) -> str:
+    """Sign a batch answer key; challenges are in compact_challenge form"""
+    return signing.sign({"g": game_id, "c": challenges, "a": sorted(answered), "s": score})
+
+def read_answer_key(token: str) -> Dict:
+    """Verify an answer key and return its fields, raises signing.InvalidToken"""
+    payload = signing.verify(token)
+    try:
+        key = {
+            "game_id": payload["g"],
+            "challenges": payload["c"],
+            "answered": {int(index) for index in payload.get("a", [])},
+            "score": int(payload.get("s", 0))
+        }
+    except (AttributeError, KeyError, TypeError, ValueError):
+        raise signing.InvalidToken("Malformed answer key")
+    if not isinstance(key["challenges"], list):
+        raise signing.InvalidToken("Malformed answer key")
+    return key
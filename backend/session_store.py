@@ -0,0 +1,329 @@
+"""
+Bounded game session storage with idle TTL, LRU eviction and a periodic sweeper
+
+SESSION_BACKEND=memory keeps sessions in this process; SESSION_BACKEND=sqlite shares them between
+worker processes on one host through a SQLite file in WAL mode, and keeps them across restarts.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from background import PeriodicTask
+from telemetry import SESSION_STORE_SECONDS, timed
+
+logger = logging.getLogger(__name__)
+
+SESSION_IDLE_TTL = int(os.getenv("SESSION_IDLE_TTL_SECONDS", "1800"))  # 30 minutes
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "10000"))
+SWEEP_INTERVAL = int(os.getenv("SESSION_SWEEP_SECONDS", "60"))
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")
+SESSION_DB_PATH = Path(os.getenv("SESSION_DB_PATH", Path(__file__).parent / "sessions.db"))
+SESSION_BATCH_SIZE = int(os.getenv("SESSION_BATCH_SIZE", "64"))
+SESSION_FLUSH_SECONDS = float(os.getenv("SESSION_FLUSH_SECONDS", "0.05"))
+
+class SessionStore(ABC):
+    """Interface for session backends, sessions are looked up by their session_id attribute"""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def put(self, session: Any):
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        ...
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """Drop idle sessions and return how many were removed"""
+
+    @abstractmethod
+    def metrics(self) -> Dict[str, int]:
+        ...
+
+    def flush(self):
+        """Persist buffered writes, if the backend buffers any"""
+
+    def close(self):
+        self.flush()
+
+class InMemorySessionStore(SessionStore):
+    def __init__(self, idle_ttl: int = SESSION_IDLE_TTL, max_entries: int = SESSION_MAX_ENTRIES):
+        self.idle_ttl = idle_ttl
+        self.max_entries = max_entries
+        # session_id -> (session, last access), least recently used first
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evicted_lru": 0, "expired": 0}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            session, last_access = entry
+            if now - last_access > self.idle_ttl:
+                del self._sessions[session_id]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._sessions[session_id] = (session, now)
+            self._sessions.move_to_end(session_id)
+            self._stats["hits"] += 1
+            return session
+
+    def put(self, session: Any):
+        with self._lock:
+            self._sessions[session.session_id] = (session, time.monotonic())
+            self._sessions.move_to_end(session.session_id)
+            while len(self._sessions) > self.max_entries:
+                self._sessions.popitem(last=False)
+                self._stats["evicted_lru"] += 1
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def sweep(self) -> int:
+        cutoff = time.monotonic() - self.idle_ttl
+        removed = 0
+        with self._lock:
+            # Entries are ordered by last access, so stop at the first fresh one
+            while self._sessions:
+                session_id, (_, last_access) = next(iter(self._sessions.items()))
+                if last_access > cutoff:
+                    break
+                del self._sessions[session_id]
+                removed += 1
+            self._stats["expired"] += removed
+        return removed
+
+    def metrics(self) -> Dict[str, int]:
+        return dict(self._stats, live_sessions=len(self._sessions))
+
+# Constant statements, so sqlite3's statement cache prepares each of them once per connection
+_CREATE_SESSIONS = """CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    last_access REAL NOT NULL
+)"""
+_CREATE_ACCESS_INDEX = "CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access)"
+_SELECT_SESSION = "SELECT body, last_access FROM sessions WHERE session_id = ?"
+_UPSERT_SESSION = """INSERT INTO sessions (session_id, body, last_access) VALUES (?, ?, ?)
+ON CONFLICT (session_id) DO UPDATE SET body = excluded.body, last_access = excluded.last_access"""
+_TOUCH_SESSION = "UPDATE sessions SET last_access = MAX(last_access, ?) WHERE session_id = ?"
+_DELETE_SESSION = "DELETE FROM sessions WHERE session_id = ?"
+_DELETE_IDLE = "DELETE FROM sessions WHERE last_access < ?"
+_DELETE_OVERFLOW = """DELETE FROM sessions WHERE session_id IN (
+    SELECT session_id FROM sessions ORDER BY last_access DESC LIMIT -1 OFFSET ?
+)"""
+_COUNT_SESSIONS = "SELECT COUNT(*) FROM sessions"
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions shared by worker processes through one SQLite file in WAL mode.
+
+    Sessions are stored as JSON from session.to_dict() and rebuilt with decode(). Writes and access
+    touches are buffered and committed together once batch_size are pending or the oldest is
+    flush_interval old; this process reads its own buffered writes, other workers see them after
+    the commit. Wall-clock time is used for access times since workers share them.
+    """
+
+    def __init__(self, decode: Callable[[Dict], Any], db_path: Path = SESSION_DB_PATH,
+                 idle_ttl: int = SESSION_IDLE_TTL, max_entries: int = SESSION_MAX_ENTRIES,
+                 batch_size: int = SESSION_BATCH_SIZE, flush_interval: float = SESSION_FLUSH_SECONDS):
+        self.decode = decode
+        self.idle_ttl = idle_ttl
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evicted_lru": 0, "expired": 0, "commits": 0, "rows_written": 0}
+
+        # session_id -> (body or None for a deletion, last access); touches are access-time-only updates
+        self._pending_writes: Dict[str, tuple] = {}
+        self._pending_touches: Dict[str, float] = {}
+        self._oldest_pending: Optional[float] = None
+
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints, enough for game state
+        self._conn.execute(_CREATE_SESSIONS)
+        self._conn.execute(_CREATE_ACCESS_INDEX)
+        self._conn.commit()
+
+    def get(self, session_id: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            pending = self._pending_writes.get(session_id)
+            if pending is not None:
+                body, last_access = pending
+            else:
+                row = self._conn.execute(_SELECT_SESSION, (session_id,)).fetchone()
+                body, last_access = row if row else (None, None)
+                last_access = max(last_access or 0.0, self._pending_touches.get(session_id, 0.0))
+            if body is None:
+                self._stats["misses"] += 1
+                return None
+            if now - last_access > self.idle_ttl:
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                self._queue(session_id, None, now)
+                return None
+            self._stats["hits"] += 1
+            if pending is not None:
+                self._pending_writes[session_id] = (body, now)
+            else:
+                self._pending_touches[session_id] = now
+                self._maybe_flush(now)
+        return self.decode(json.loads(body))
+
+    def put(self, session: Any):
+        body = json.dumps(session.to_dict(), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._queue(session.session_id, body, time.time())
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._queue(session_id, None, time.time())
+
+    def _queue(self, session_id: str, body: Optional[str], now: float):
+        self._pending_writes[session_id] = (body, now)
+        self._pending_touches.pop(session_id, None)
+        self._maybe_flush(now)
+
+    def _maybe_flush(self, now: float):
+        if self._oldest_pending is None:
+            self._oldest_pending = now
+        pending = len(self._pending_writes) + len(self._pending_touches)
+        if pending >= self.batch_size or now - self._oldest_pending >= self.flush_interval:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending_writes and not self._pending_touches:
+            self._oldest_pending = None
+            return
+        upserts = [(sid, body, at) for sid, (body, at) in self._pending_writes.items() if body is not None]
+        deletes = [(sid,) for sid, (body, _) in self._pending_writes.items() if body is None]
+        touches = [(at, sid) for sid, at in self._pending_touches.items()]
+        with self._conn:  # One transaction per batch
+            if upserts:
+                self._conn.executemany(_UPSERT_SESSION, upserts)
+            if deletes:
+                self._conn.executemany(_DELETE_SESSION, deletes)
+            if touches:
+                self._conn.executemany(_TOUCH_SESSION, touches)
+        self._stats["commits"] += 1
+        self._stats["rows_written"] += len(upserts) + len(deletes) + len(touches)
+        self._pending_writes.clear()
+        self._pending_touches.clear()
+        self._oldest_pending = None
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def sweep(self) -> int:
+        with self._lock:
+            self._flush_locked()
+            with self._conn:
+                expired = self._conn.execute(_DELETE_IDLE, (time.time() - self.idle_ttl,)).rowcount
+                evicted = self._conn.execute(_DELETE_OVERFLOW, (self.max_entries,)).rowcount
+            self._stats["expired"] += expired
+            self._stats["evicted_lru"] += evicted
+        return expired + evicted
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            live = self._conn.execute(_COUNT_SESSIONS).fetchone()[0]
+            pending = len(self._pending_writes) + len(self._pending_touches)
+        return dict(self._stats, live_sessions=live, pending_writes=pending)
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+class TimedSessionStore(SessionStore):
+    """Records the latency of every operation of the wrapped backend"""
+
+    def __init__(self, store: SessionStore, backend: str):
+        self.store = store
+        self.backend = backend
+        self.flush_interval = getattr(store, "flush_interval", None)
+
+    def get(self, session_id: str) -> Optional[Any]:
+        with timed(SESSION_STORE_SECONDS, backend=self.backend, operation="get"):
+            return self.store.get(session_id)
+
+    def put(self, session: Any):
+        with timed(SESSION_STORE_SECONDS, backend=self.backend, operation="put"):
+            self.store.put(session)
+
+    def delete(self, session_id: str):
+        with timed(SESSION_STORE_SECONDS, backend=self.backend, operation="delete"):
+            self.store.delete(session_id)
+
+    def sweep(self) -> int:
+        with timed(SESSION_STORE_SECONDS, backend=self.backend, operation="sweep"):
+            return self.store.sweep()
+
+    def flush(self):
+        with timed(SESSION_STORE_SECONDS, backend=self.backend, operation="flush"):
+            self.store.flush()
+
+    def metrics(self) -> Dict[str, int]:
+        return self.store.metrics()
+
+    def close(self):
+        self.store.close()
+
+def create_session_store(decode: Callable[[Dict], Any], backend: str = SESSION_BACKEND) -> SessionStore:
+    """Build the session backend chosen by SESSION_BACKEND"""
+    if backend == "sqlite":
+        store = SQLiteSessionStore(decode)
+    elif backend == "memory":
+        store = InMemorySessionStore()
+    else:
+        raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
+    return TimedSessionStore(store, backend)
+
+class SessionSweeper(PeriodicTask):
+    """Sweeps idle sessions every sweep interval, and flushes buffered writes in between.
+
+    Flushes and sweeps run in a worker thread, since the SQLite backend commits and deletes there.
+    """
+
+    failure_message = "Session sweep failed"
+
+    def __init__(self, store: SessionStore, interval: int = SWEEP_INTERVAL):
+        # Wake up often enough to flush buffered writes on time
+        super().__init__(min(interval, getattr(store, "flush_interval", None) or interval))
+        self.store = store
+        self.sweep_interval = interval
+        self._next_sweep = time.monotonic() + interval
+
+    async def run_once(self):
+        if time.monotonic() < self._next_sweep:
+            await asyncio.to_thread(self.store.flush)
+            return
+        self._next_sweep = time.monotonic() + self.sweep_interval
+        removed = await asyncio.to_thread(self.store.sweep)
+        if removed:
+            live = (await asyncio.to_thread(self.store.metrics))["live_sessions"]
+            logger.info(f"🧹 Swept {removed} idle game sessions ({live} live)")
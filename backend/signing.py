@@ -0,0 +1,47 @@
+"""
+Compact HMAC-signed tokens for state the client carries back to the server (answer keys, round tokens)
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+from typing import Any, Dict
+
+_env_key = os.getenv("VOCATINDER_SIGNING_KEY")
+if not _env_key:
+    # Fine for a single process; every worker must share VOCATINDER_SIGNING_KEY to accept each other's tokens
+    logging.getLogger(__name__).warning("⚠️  VOCATINDER_SIGNING_KEY not set, using a random per-process signing key")
+SIGNING_KEY = _env_key.encode("utf-8") if _env_key else secrets.token_bytes(32)
+
+SIGNATURE_BYTES = 16
+
+class InvalidToken(ValueError):
+    pass
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def _signature(body: str, key: bytes) -> str:
+    return _b64encode(hmac.new(key, body.encode("ascii"), hashlib.sha256).digest()[:SIGNATURE_BYTES])
+
+def sign(payload: Dict[str, Any], key: bytes = SIGNING_KEY) -> str:
+    """Serialize and sign a JSON payload as '<body>.<signature>'"""
+    body = _b64encode(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return f"{body}.{_signature(body, key)}"
+
+def verify(token: str, key: bytes = SIGNING_KEY) -> Dict[str, Any]:
+    """Return the payload of a token we signed, raise InvalidToken otherwise"""
+    body, _, signature = token.partition(".")
+    if not body or not signature or not hmac.compare_digest(signature, _signature(body, key)):
+        raise InvalidToken("Invalid token signature")
+    try:
+        return json.loads(_b64decode(body))
+    except ValueError:
+        raise InvalidToken("Malformed token payload")
@@ -0,0 +1,81 @@
+"""
+Budgeted speculative execution: start likely-needed explanation calls as soon as a round is served
+"""
+
+import asyncio
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+SPECULATION_ENABLED = os.getenv("SPECULATIVE_EXPLANATIONS", "1") == "1"
+SPECULATION_MAX_IN_FLIGHT = int(os.getenv("SPECULATION_MAX_IN_FLIGHT", "32"))
+SPECULATION_MAX_PENDING = int(os.getenv("SPECULATION_MAX_PENDING", "1024"))
+
+class SpeculationBudget:
+    """Caps how many speculative tasks run at once, speculation is skipped rather than queued.
+
+    Started tasks are kept by key until taken; this map is process-local, so an answer landing on
+    another worker simply misses the speculation and explains normally.
+    """
+
+    def __init__(self, max_in_flight: int = SPECULATION_MAX_IN_FLIGHT, enabled: bool = SPECULATION_ENABLED,
+                 max_pending: int = SPECULATION_MAX_PENDING):
+        self.max_in_flight = max_in_flight
+        self.max_pending = max_pending
+        self.enabled = enabled
+        self.in_flight = 0
+        self.stats = {"started": 0, "skipped": 0, "used": 0, "cancelled": 0}
+        self._pending: "OrderedDict[Hashable, asyncio.Task]" = OrderedDict()
+
+    def start(self, key: Hashable, factory: Callable[[], Awaitable[str]]) -> Optional[asyncio.Task]:
+        if key in self._pending:
+            return self._pending[key]  # Same round served again
+        if not self.enabled or self.in_flight >= self.max_in_flight:
+            self.stats["skipped"] += 1
+            return None
+        task = asyncio.create_task(factory())
+        self.in_flight += 1
+        self.stats["started"] += 1
+        task.add_done_callback(self._finished)
+        self._pending[key] = task
+        while len(self._pending) > self.max_pending:
+            # Oldest rounds were most likely abandoned
+            _, stale = self._pending.popitem(last=False)
+            self.discard(stale)
+        return task
+
+    def take(self, key: Hashable) -> Optional[asyncio.Task]:
+        """Remove and return the speculative task started for key, if any"""
+        return self._pending.pop(key, None)
+
+    def _finished(self, task: asyncio.Task):
+        self.in_flight -= 1
+        if not task.cancelled():
+            task.exception()  # Mark exceptions as retrieved, callers fall back on their own
+
+    async def claim(self, task: asyncio.Task) -> Optional[str]:
+        """Await a speculative result, None if it failed or was cancelled.
+
+        Shielded, so a request cancelled while waiting doesn't cancel the speculation too and
+        mistake its own cancellation for a cancelled speculation.
+        """
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                return None
+            raise  # The awaiting request itself was cancelled
+        except Exception:
+            return None
+        self.stats["used"] += 1
+        return result
+
+    def discard(self, task: Optional[asyncio.Task]):
+        """Drop speculation that turned out not to be needed"""
+        if task is not None and not task.done():
+            task.cancel()
+            self.stats["cancelled"] += 1
+
+    def metrics(self) -> Dict[str, int]:
+        return dict(self.stats, in_flight=self.in_flight, max_in_flight=self.max_in_flight,
+                    pending=len(self._pending), enabled=int(self.enabled))
@@ -0,0 +1,67 @@
+"""
+Structured instrumentation: Prometheus metrics for the game pipeline and a level-gated logger
+
+Metrics are served on /metrics. When running several worker processes, point
+PROMETHEUS_MULTIPROC_DIR at an empty directory so every worker's samples are aggregated.
+Log verbosity is set with LOG_LEVEL (DEBUG, INFO, WARNING...), INFO by default.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_SECONDS = Histogram(
+    "vocatinder_stage_seconds", "Latency of game generation pipeline stages", ["stage"], buckets=LATENCY_BUCKETS
+)
+STAGE_ITEMS = Counter("vocatinder_stage_items_total", "Items processed by pipeline stages", ["stage"])
+STAGE_ERRORS = Counter("vocatinder_stage_errors_total", "Pipeline stage failures", ["stage"])
+FEED_FETCH_SECONDS = Histogram(
+    "vocatinder_feed_fetch_seconds", "RSS fetch latency per feed", ["feed", "outcome"], buckets=LATENCY_BUCKETS
+)
+MISTRAL_CALL_SECONDS = Histogram(
+    "vocatinder_mistral_call_seconds", "Mistral call latency, queueing for the concurrency cap included",
+    ["call", "outcome"], buckets=LATENCY_BUCKETS
+)
+SESSION_STORE_SECONDS = Histogram(
+    "vocatinder_session_store_seconds", "Session store operation latency", ["backend", "operation"],
+    buckets=LATENCY_BUCKETS
+)
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a pipeline stage and count its failures"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage=name).inc()
+        raise
+    finally:
+        STAGE_SECONDS.labels(stage=name).observe(time.perf_counter() - start)
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Prometheus text exposition of this process, or of every worker in multiprocess mode"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+def configure_logging(level: str = LOG_LEVEL):
+    logging.basicConfig(level=level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
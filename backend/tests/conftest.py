@@ -0,0 +1,38 @@
+"""
+Shared test setup: backend modules are imported top-level, as main.py does, and every external
+dependency points at a local stand-in before any of them reads its environment
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+_scratch = tempfile.TemporaryDirectory(prefix="vocatinder-tests-")
+SCRATCH_DIR = Path(_scratch.name)
+os.environ.update({
+    "VOCATINDER_SIGNING_KEY": "test-signing-key",
+    "NEWS_GAMES": "0",
+    "MISTRAL_BACKEND": "fake",
+    "MISTRAL_API_KEY": "",  # Keeps .env from enabling the LangChain agent
+    "FAKE_MISTRAL_LATENCY_SECONDS": "0",
+    "FAKE_MISTRAL_TOKEN_DELAY_SECONDS": "0",
+    "HEADLINE_DB_PATH": str(SCRATCH_DIR / "headlines.db"),
+    "EXPLANATION_DB_PATH": str(SCRATCH_DIR / "explanations.db"),
+    "SESSION_DB_PATH": str(SCRATCH_DIR / "sessions.db"),
+    "GENDER_EXPLANATIONS_PATH": str(SCRATCH_DIR / "gender_explanations.json"),
+})
+
+@pytest.fixture(scope="session")
+def app_client():
+    """The app in-process (lifespan included) serving vocabulary games with the fake Mistral client"""
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
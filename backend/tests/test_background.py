@@ -0,0 +1,37 @@
+import asyncio
+
+from background import PeriodicTask
+
+class Counter(PeriodicTask):
+    failure_message = "Counter failed"
+
+    def __init__(self, interval: float, fail_first: int = 0):
+        super().__init__(interval)
+        self.runs = 0
+        self.fail_first = fail_first
+
+    async def run_once(self):
+        self.runs += 1
+        if self.runs <= self.fail_first:
+            raise RuntimeError("boom")
+
+def test_runs_until_stopped_and_survives_failures(caplog):
+    task = Counter(interval=0.01, fail_first=2)
+
+    async def scenario():
+        task.start()
+        first = task._task
+        task.start()  # Already running, no second loop
+        await asyncio.sleep(0.1)
+        await task.stop()
+        runs = task.runs
+        await asyncio.sleep(0.03)
+        return first, runs
+
+    first, runs = asyncio.run(scenario())
+    assert first is not None and task._task is None
+    assert runs > 3 and task.runs == runs
+    assert caplog.text.count("Counter failed: boom") == 2
+
+def test_stop_before_start_is_a_no_op():
+    asyncio.run(Counter(interval=1).stop())
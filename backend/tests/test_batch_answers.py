@@ -0,0 +1,88 @@
+import pytest
+
+import main
+import round_tokens
+
+def start(app_client) -> dict:
+    response = app_client.post("/api/start-game/batch", json={"language_level": "beginner", "mode": "vocabulary"})
+    assert response.status_code == 200
+    return response.json()
+
+def right_choice(game_round: dict) -> str:
+    return "right" if game_round["correct_answer"] else "left"
+
+def wrong_choice(game_round: dict) -> str:
+    return "left" if game_round["correct_answer"] else "right"
+
+def submit(app_client, answer_key: str, answers):
+    return app_client.post("/api/submit-answers", json={
+        "answer_key": answer_key,
+        "answers": [{"round_index": index, "user_choice": choice} for index, choice in answers]
+    })
+
+def test_manifest_round_ids_are_labels_not_round_tokens(app_client):
+    manifest = start(app_client)
+    assert [game_round["round_id"] for game_round in manifest["rounds"]] == \
+        [f"{manifest['game_id']}#{index}" for index in range(len(manifest["rounds"]))]
+    response = app_client.post("/api/submit-answer", json={"round_id": manifest["rounds"][0]["round_id"],
+                                                           "user_choice": "left"})
+    assert response.status_code == 400
+
+def test_answer_key_carries_answered_rounds_and_running_score(app_client):
+    manifest = start(app_client)
+    rounds = manifest["rounds"]
+
+    first = submit(app_client, manifest["answer_key"], [(0, right_choice(rounds[0])), (1, wrong_choice(rounds[1]))])
+    assert first.status_code == 200
+    first = first.json()
+    assert [result["is_correct"] for result in first["results"]] == [True, False]
+    assert first["score"] == 1
+    assert round_tokens.read_answer_key(first["answer_key"])["answered"] == {0, 1}
+
+    rest = [(index, right_choice(game_round)) for index, game_round in enumerate(rounds) if index > 1]
+    second = submit(app_client, first["answer_key"], rest).json()
+    assert second["score"] == len(rounds) - 1
+
+@pytest.mark.parametrize("answers, status", [
+    ([(0, "right"), (0, "left")], 400),  # Duplicate in one batch
+    ([(99, "right")], 400),              # Out of range
+    ([(-1, "right")], 400),
+])
+def test_invalid_batches_are_rejected(app_client, answers, status):
+    assert submit(app_client, start(app_client)["answer_key"], answers).status_code == status
+
+def test_oversized_batch_is_rejected(app_client):
+    manifest = start(app_client)
+    answers = [(index, "right") for index in range(len(manifest["rounds"]))] * 2
+    assert submit(app_client, manifest["answer_key"], answers).status_code == 400
+
+def test_rounds_already_answered_are_rejected_without_new_calls(app_client):
+    manifest = start(app_client)
+    rounds = manifest["rounds"]
+    answered = submit(app_client, manifest["answer_key"], [(0, wrong_choice(rounds[0]))]).json()
+
+    calls = main.mistral_client._client.chat.calls
+    replay = submit(app_client, answered["answer_key"], [(0, right_choice(rounds[0]))])
+    assert replay.status_code == 409
+    assert main.mistral_client._client.chat.calls == calls
+
+def test_tampered_answer_key_is_rejected(app_client):
+    body, _, signature = start(app_client)["answer_key"].partition(".")
+    assert submit(app_client, f"{body}x.{signature}", [(0, "right")]).status_code == 400
+
+def test_each_wrong_challenge_is_explained_once(app_client, monkeypatch):
+    manifest = start(app_client)
+    rounds = manifest["rounds"]
+    explained = []
+
+    async def gender_rule_explanation(challenge):
+        explained.append(challenge["target_noun"]["word"])
+        return "explanation"
+
+    monkeypatch.setattr(main, "gender_rule_explanation", gender_rule_explanation)
+    response = submit(app_client, manifest["answer_key"],
+                      [(index, wrong_choice(game_round)) for index, game_round in enumerate(rounds)]).json()
+
+    assert response["score"] == 0
+    assert all(result["explanation"] == "explanation" for result in response["results"])
+    assert sorted(explained) == sorted({game_round["target_word"] for game_round in rounds})
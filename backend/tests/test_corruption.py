@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+
+import pytest
+
+from corruption import agreement_spans, apply_spans, corrupt_sentence, flip_adjective, text_spans
+
+class Morph:
+    """Stand-in for spaCy's MorphAnalysis, get() returns a list of values"""
+
+    def __init__(self, **features):
+        self.features = features
+
+    def get(self, field):
+        value = self.features.get(field)
+        return [value] if value else []
+
+def token(sentence: str, text: str, dep: str, pos: str, **morph) -> SimpleNamespace:
+    return SimpleNamespace(text=text, idx=sentence.index(text), dep_=dep, pos_=pos, morph=Morph(**morph))
+
+def noun(*children) -> SimpleNamespace:
+    return SimpleNamespace(children=list(children))
+
+class FixedChoice:
+    def __init__(self, value):
+        self.value = value
+
+    def choice(self, options):
+        return self.value
+
+def test_determiner_and_adjective_spans():
+    sentence = "Le nouveau président parle"
+    spans = agreement_spans(noun(
+        token(sentence, "nouveau", "amod", "ADJ", Gender="Masc", Number="Sing"),
+        token(sentence, "Le", "det", "DET")
+    ), "masculine")
+    assert spans == [(0, 2, "La"), (3, 10, "nouvelle")]
+    assert apply_spans(sentence, spans) == "La nouvelle président parle"
+
+def test_feminine_noun_flips_to_masculine():
+    sentence = "Une belle maison blanche"
+    spans = agreement_spans(noun(
+        token(sentence, "Une", "det", "DET"),
+        token(sentence, "belle", "amod", "ADJ", Gender="Fem"),
+        token(sentence, "blanche", "amod", "ADJ", Gender="Fem")
+    ), "feminine")
+    assert apply_spans(sentence, spans) == "Un beau maison blanc"
+
+@pytest.mark.parametrize("adjective, morph", [
+    ("rouge", {}),                                   # Same form in both genders
+    ("sévère", {}),                                  # Invariable despite the "ère" ending
+    ("grands", {"Gender": "Masc", "Number": "Plur"}), # Plural forms aren't flipped
+    ("grande", {"Gender": "Fem"}),                   # Agrees with another noun
+    ("protecteur", {"Gender": "Masc"})               # Ending with no derivable feminine
+])
+def test_adjectives_without_a_known_flip_are_left_alone(adjective, morph):
+    sentence = f"Le {adjective} projet"
+    spans = agreement_spans(noun(token(sentence, adjective, "amod", "ADJ", **morph)), "masculine")
+    assert spans == []
+
+def test_other_dependents_are_ignored():
+    sentence = "Le chat de la voisine"
+    assert agreement_spans(noun(token(sentence, "voisine", "nmod", "NOUN")), "masculine") == []
+
+@pytest.mark.parametrize("adjective, gender, flipped", [
+    ("Vieux", "masculine", "Vieille"),
+    ("public", "masculine", "publique"),
+    ("actif", "masculine", "active"),
+    ("intérieur", "masculine", "intérieure"),
+    ("rêveuse", "feminine", "rêveur"),
+    ("grande", "feminine", "grand"),
+    ("chère", "feminine", "cher"),
+    ("publique", "feminine", "public"),
+    ("unique", "feminine", None),
+    ("vert", "feminine", None)
+])
+def test_flip_adjective(adjective, gender, flipped):
+    assert flip_adjective(adjective, gender) == flipped
+
+def test_apply_spans_with_length_changes():
+    sentence = "Du pain et du vin"
+    assert apply_spans(sentence, [(0, 2, "De la"), (11, 13, "de la")]) == "De la pain et de la vin"
+    assert apply_spans(sentence, []) == sentence
+
+def test_text_spans_flips_the_word_before_the_noun():
+    sentence = "Selon le ministre, la réforme avance"
+    assert text_spans(sentence, "réforme", "feminine") == [(19, 21, "le")]
+    assert text_spans(sentence, "budget", "masculine") == []
+    assert text_spans("Réforme adoptée", "Réforme", "feminine") == []
+
+def test_corrupt_sentence_uses_stored_spans():
+    sentence = "La voiture rouge"
+    target = {"word": "voiture", "gender": "feminine", "agreement_spans": [(0, 2, "Le")]}
+    assert corrupt_sentence(sentence, target, FixedChoice(True)) == ("Le voiture rouge", False)
+    assert corrupt_sentence(sentence, target, FixedChoice(False)) == (sentence, True)
+    assert corrupt_sentence(sentence, dict(target, agreement_spans=[]), FixedChoice(True)) == (sentence, True)
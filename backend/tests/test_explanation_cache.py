@@ -0,0 +1,110 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import explanation_cache
+from explanation_cache import ExplanationCache, make_key
+from fake_mistral import FakeMistral
+from mistral_client import MistralFeedbackClient
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(explanation_cache, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+def test_keys_are_normalized_and_scoped_by_model():
+    assert make_key("gender_rule", "m", "Maison ", "feminine") == make_key("gender_rule", "m", "maison", "feminine")
+    assert make_key("gender_rule", "m", "maison", "feminine") != make_key("gender_rule", "other", "maison", "feminine")
+
+def test_memory_tier_evicts_least_recently_used(clock):
+    cache = ExplanationCache(db_path=None, memory_max=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"  # "b" is now least recently used
+    cache.set("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+    assert cache.summary()["evictions"] == 1
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = ExplanationCache(tmp_path / "explanations.db", ttl=60)
+    cache.set("a", "A")
+    clock.value += 59
+    assert cache.get("a") == "A"
+    clock.value += 2
+    assert cache.get("a") is None
+
+def test_disk_tier_survives_a_restart(tmp_path, clock):
+    ExplanationCache(tmp_path / "explanations.db").set("a", "A")
+    cache = ExplanationCache(tmp_path / "explanations.db")
+    assert asyncio.run(cache.get_async("a")) == "A"
+    summary = cache.summary()
+    assert summary["disk_hits"] == 1 and summary["disk_entries"] == 1
+    assert cache.get("a") == "A" and cache.summary()["memory_hits"] == 1
+
+def test_prune_drops_expired_then_oldest_rows(tmp_path, clock):
+    cache = ExplanationCache(tmp_path / "explanations.db", disk_max=2, ttl=100)
+    cache.set("expired", "X")
+    clock.value += 150
+    for key in ("old", "mid", "new"):
+        asyncio.run(cache.set_async(key, key.upper()))
+        clock.value += 1
+
+    assert cache.prune() == 2
+    summary = cache.summary()
+    assert summary["pruned"] == 2 and summary["disk_entries"] == 2
+
+    fresh = ExplanationCache(tmp_path / "explanations.db", disk_max=2, ttl=100)
+    assert [fresh.get(key) for key in ("old", "mid", "new")] == [None, "MID", "NEW"]
+
+def test_pruner_runs_in_the_background(tmp_path):
+    cache = ExplanationCache(tmp_path / "explanations.db", disk_max=1)
+    cache.set("a", "A")
+    cache.set("b", "B")
+
+    async def run_pruner():
+        pruner = explanation_cache.CachePruner(cache, interval=3600)
+        pruner.start()
+        await asyncio.sleep(0.1)
+        await pruner.stop()
+
+    asyncio.run(run_pruner())
+    assert cache.summary()["disk_entries"] == 1
+
+def feedback_client(latency: float = 0.05) -> MistralFeedbackClient:
+    return MistralFeedbackClient(cache=ExplanationCache(db_path=None), client=FakeMistral(latency, token_delay=0))
+
+def test_concurrent_misses_share_one_call():
+    client = feedback_client()
+
+    async def scenario():
+        return await asyncio.gather(*(client.explain_gender_rule_async("maison", "feminine") for _ in range(20)))
+
+    explanations = asyncio.run(scenario())
+    assert len(set(explanations)) == 1
+    assert client._client.chat.calls == 1
+    assert client._in_flight == {}
+    assert asyncio.run(client.explain_gender_rule_async("maison", "feminine")) == explanations[0]
+    assert client._client.chat.calls == 1
+
+def test_shared_call_is_cancelled_with_its_last_waiter():
+    client = feedback_client(latency=3600)
+
+    async def scenario():
+        first = asyncio.create_task(client.explain_gender_rule_async("maison", "feminine"))
+        second = asyncio.create_task(client.explain_gender_rule_async("maison", "feminine"))
+        await asyncio.sleep(0.01)
+        (shared, _), = client._in_flight.values()
+        first.cancel()
+        await asyncio.sleep(0.01)
+        still_running = not shared.done()
+        second.cancel()
+        await asyncio.gather(first, second, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        return still_running, shared.cancelled()
+
+    still_running, cancelled = asyncio.run(scenario())
+    assert still_running and cancelled
+    assert client._in_flight == {}
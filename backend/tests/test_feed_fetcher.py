@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from benchmarks.common import fixture_feed_server
+from feed_fetcher import AsyncFeedFetcher, CircuitBreaker
+
+@pytest.fixture(scope="module")
+def feed_urls():
+    with fixture_feed_server() as urls:
+        yield urls
+
+def fetch_count(feed_url: str, outcome: str) -> float:
+    return REGISTRY.get_sample_value(
+        "vocatinder_feed_fetch_seconds_count", {"feed": feed_url, "outcome": outcome}
+    ) or 0.0
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=600)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+def test_breaker_half_opens_after_cooldown_and_closes_on_success():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "half-open" and breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+def test_failed_half_open_probe_restarts_cooldown():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=600)
+    breaker.record_failure()
+    breaker.opened_at -= 600
+    assert breaker.state == "half-open"
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+def test_conditional_get_reuses_entries_on_304(feed_urls):
+    feed_url = feed_urls[0]
+    fetcher = AsyncFeedFetcher([feed_url])
+
+    async def fetch_twice():
+        try:
+            return await fetcher.fetch_feed(feed_url), await fetcher.fetch_feed(feed_url)
+        finally:
+            await fetcher.aclose()
+
+    not_modified_before = fetch_count(feed_url, "not_modified")
+    first, second = asyncio.run(fetch_twice())
+
+    assert first and all(url == feed_url for _, url in first)
+    assert fetcher._validators[feed_url]["last_modified"]
+    assert second == first
+    assert fetch_count(feed_url, "not_modified") == not_modified_before + 1
+
+def test_failing_feed_opens_circuit_without_blocking_others(feed_urls):
+    good_url = feed_urls[0]
+    missing_url = good_url.rsplit("/", 1)[0] + "/missing.xml"
+    fetcher = AsyncFeedFetcher([good_url, missing_url], failure_threshold=2)
+
+    async def fetch_rounds(rounds: int):
+        try:
+            return [await fetcher.fetch_all() for _ in range(rounds)]
+        finally:
+            await fetcher.aclose()
+
+    circuit_open_before = fetch_count(missing_url, "circuit_open")
+    results = asyncio.run(fetch_rounds(3))
+
+    assert all(headlines and all(url == good_url for _, url in headlines) for headlines in results)
+    assert fetcher.circuit_states() == {good_url: "closed", missing_url: "open"}
+    assert fetch_count(missing_url, "error") == 2
+    assert fetch_count(missing_url, "circuit_open") == circuit_open_before + 1
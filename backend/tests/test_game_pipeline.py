@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import game_pipeline
+
+class FakeNLP:
+    """nlp.pipe stand-in: lazily 'parses' whitespace-split words, counting the texts it has read"""
+
+    def __init__(self):
+        self.parsed = 0
+
+    def pipe(self, items, as_tuples, batch_size, n_process):
+        for text, context in items:
+            self.parsed += 1
+            doc = [SimpleNamespace(text=word, is_alpha=word.isalpha(), dep_="") for word in text.split()]
+            yield doc, context
+
+def source(count: int, pulled: list, closed: list):
+    try:
+        for index in range(count):
+            pulled.append(index)
+            yield f"Titre numéro {index // 2}"  # Every headline twice
+    finally:
+        closed.append(True)
+
+def pipeline(nlp, extracted: list, batch_size: int = 4, window: int = 4):
+    def nouns_from_doc(doc, headline):
+        extracted.append(headline)
+        return [{"word": "titre", "gender": "masculine"}]
+
+    return [
+        game_pipeline.dedupe(),
+        game_pipeline.parse(nlp, batch_size=batch_size),
+        game_pipeline.level_gate("beginner", OrderedDict(), window=window),
+        game_pipeline.extract_nouns(nouns_from_doc),
+        game_pipeline.select_target(lambda headline, doc, nouns: nouns[0]),
+        game_pipeline.corrupt(lambda sentence, target: (sentence, True)),
+    ]
+
+def test_take_stops_every_stage_once_it_has_enough():
+    pulled, closed, extracted = [], [], []
+    nlp = FakeNLP()
+    challenges = game_pipeline.take(game_pipeline.run(source(1000, pulled, closed), pipeline(nlp, extracted)), 3)
+
+    assert len(challenges) == 3
+    assert len(extracted) == 3
+    assert nlp.parsed <= 8 and len(pulled) <= 12  # A parse batch and gate window, not the whole feed
+    assert closed == [True]
+
+def test_challenges_carry_features_and_skip_duplicates():
+    pulled, closed, extracted = [], [], []
+    challenges = game_pipeline.take(
+        game_pipeline.run(source(12, pulled, closed), pipeline(FakeNLP(), extracted)), 100
+    )
+
+    assert [challenge["original_sentence"] for challenge in challenges] == [f"Titre numéro {index}" for index in range(6)]
+    assert all(challenge["difficulty"] == 2.0 for challenge in challenges)  # Two short alphabetic words
+    assert all(challenge["round_type"] == "sentence_check" for challenge in challenges)
+
+def test_records_without_nouns_or_target_are_dropped():
+    records = [{"headline": "a", "doc": None}, {"headline": "b", "doc": None}]
+    with_nouns = game_pipeline.extract_nouns(lambda doc, headline: [] if headline == "a" else [{"word": "b"}])
+    targeted = game_pipeline.select_target(lambda headline, doc, nouns: None)
+    assert [record["headline"] for record in with_nouns(iter(records))] == ["b"]
+    assert list(targeted(with_nouns(iter(records)))) == []
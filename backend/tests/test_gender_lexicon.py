@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import pytest
+
+import gender_lexicon
+from gender_lexicon import GenderLexicon, determine_gender
+
+class Morph:
+    def __init__(self, **features):
+        self.features = features
+
+    def __bool__(self):
+        return bool(self.features)
+
+    def get(self, field):
+        value = self.features.get(field)
+        return [value] if value else []
+
+def parse(sentence: str, noun_text: str, lemma: str = "", determiner: str = "", **morph):
+    """Tokens of a whitespace-split sentence, the noun optionally owning its determiner"""
+    doc = [SimpleNamespace(text=text, i=i, dep_="", children=[]) for i, text in enumerate(sentence.split())]
+    noun = next(token for token in doc if token.text == noun_text)
+    noun.lemma_ = lemma or noun_text
+    noun.morph = Morph(**morph)
+    if determiner:
+        noun.children = [SimpleNamespace(text=determiner, dep_="det")]
+    return noun, doc
+
+@pytest.fixture
+def lexicon(monkeypatch):
+    lexicon = GenderLexicon({
+        "words": {"ministre": "masculine", "tour": "masculine", "chanteur": "masculine",
+                  "chanteuse": "feminine", "maison": "feminine"},
+        "suffix_rules": gender_lexicon.SUFFIX_RULES
+    })
+    monkeypatch.setattr(gender_lexicon, "_lexicon", lexicon)
+    return lexicon
+
+def test_lexicon_answers_when_the_sentence_agrees(lexicon):
+    assert determine_gender(*parse("La maison brûle", "maison", determiner="La")) == "feminine"
+    assert determine_gender(*parse("Maison à vendre", "Maison")) == "feminine"
+    assert lexicon.stats["conflicts"] == 0
+
+@pytest.mark.parametrize("sentence, noun, determiner, morph", [
+    ("La ministre parle", "ministre", "La", {"Gender": "Masc"}),  # Determiner beats a wrong tagger guess
+    ("Visite de la tour Eiffel", "tour", "la", {}),
+    ("Cette ministre parle", "ministre", "Cette", {}),
+    ("Ministre inquiète", "Ministre", "", {"Gender": "Fem"})
+])
+def test_sentence_overrides_an_epicene_or_homograph_entry(lexicon, sentence, noun, determiner, morph):
+    assert determine_gender(*parse(sentence, noun, determiner=determiner, **morph)) == "feminine"
+    summary = lexicon.summary()
+    assert summary["conflicts"] == 1 and summary["hit_rate"] == 0.0
+
+def test_surface_form_is_looked_up_before_the_lemma(lexicon):
+    assert lexicon.lookup("chanteuse", lemma="chanteur") == "feminine"
+    assert determine_gender(*parse("Une chanteuse arrive", "chanteuse", lemma="chanteur")) == "feminine"
+
+def test_misses_fall_back_to_nearby_determiners_then_endings(lexicon):
+    assert determine_gender(*parse("La nouvelle réforme", "réforme")) == "feminine"
+    assert determine_gender(*parse("Grande manifestation", "manifestation")) == "feminine"
+    assert determine_gender(*parse("Grand rassemblement", "rassemblement")) == "masculine"
+    assert determine_gender(*parse("Grand truc", "truc"), default="masculine") == "masculine"
+    assert determine_gender(*parse("Grand truc", "truc")) is None
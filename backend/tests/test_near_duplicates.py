@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import pytest
+
+import headline_store
+from headline_store import HeadlineStore
+from near_duplicates import MinHashIndex, pack, signature, similarity, unpack
+
+STORY = "Le gouvernement annonce une nouvelle réforme des retraites"
+REWORDED = "Le gouvernement annonce une nouvelle réforme des retraites, ce mardi"
+OTHER = "Tempête sur la Bretagne : des milliers de foyers privés d'électricité"
+THIRD = "La France remporte la finale de la coupe du monde de rugby"
+
+def test_rewordings_are_similar_and_other_stories_are_not():
+    assert similarity(signature(STORY), signature(REWORDED)) >= 0.6
+    assert similarity(signature(STORY), signature(OTHER)) < 0.3
+    assert signature("Réforme  des retraites !") == signature("reforme des retraites")
+
+def test_signatures_round_trip_through_storage():
+    assert unpack(pack(signature(STORY))) == signature(STORY)
+
+def test_index_clusters_rewordings_under_one_key():
+    index = MinHashIndex()
+    index.add(STORY, signature(STORY))
+    index.add(OTHER, signature(OTHER))
+    assert index.find(signature(REWORDED)) == STORY
+    assert index.find(signature(THIRD)) is None
+
+    index.remove(STORY)
+    assert STORY not in index and len(index) == 1
+    assert index.find(signature(REWORDED)) is None
+    assert index._buckets and all(STORY not in bucket for bucket in index._buckets.values())
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "headlines.db"
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(headline_store, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+def test_add_stores_one_headline_per_story(db_path):
+    store = HeadlineStore(db_path)
+    assert store.add([(STORY, "a"), (REWORDED, "b"), (OTHER, "b"), (STORY, "c"), ("  ", "c")]) == 2
+    assert sorted(store.recent()) == sorted([STORY, OTHER])
+    assert store.near_duplicates == 1
+
+    assert store.add([(REWORDED, "a"), (STORY, "b")]) == 0  # Known story, only refreshed
+    assert len(store) == 2
+
+def test_store_keeps_the_newest_headlines_and_reloads_them(db_path, clock):
+    store = HeadlineStore(db_path, max_headlines=2)
+    for headline in (STORY, OTHER, THIRD):
+        store.add([(headline, "feed")])
+        clock.value += 1
+    assert store.recent() == [THIRD, OTHER]
+    assert STORY not in store.index
+    store.close()
+
+    reloaded = HeadlineStore(db_path, max_headlines=2)
+    assert reloaded.recent() == [THIRD, OTHER]
+    assert reloaded.index.find(signature(REWORDED)) is None
+
+def test_rewording_of_an_evicted_story_is_stored_as_new(db_path, clock):
+    store = HeadlineStore(db_path, max_headlines=1)
+    store.add([(STORY, "a"), (REWORDED, "b")])
+    clock.value += 1
+    store.add([(OTHER, "a")])  # Evicts STORY
+    clock.value += 1
+
+    assert store.add([(REWORDED, "b")]) == 1
+    assert store.recent() == [REWORDED]
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from pregenerate_explanations import PregeneratedExplanations, StubBackend, run
+
+class RecordingBackend:
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = []
+
+    def explain_gender_rule(self, word: str, gender: str) -> str:
+        self.calls.append(word)
+        return f"{self.name}: {word} is {gender}"
+
+@pytest.fixture
+def words_path(tmp_path):
+    path = tmp_path / "words.json"
+    path.write_text(json.dumps([
+        {"word": "maison", "gender": "feminine"},
+        {"word": "chat", "gender": "masculine"},
+        {"word": "maison", "gender": "feminine"}
+    ]), encoding="utf-8")
+    return path
+
+def test_interrupted_run_resumes_from_its_checkpoint(tmp_path, words_path):
+    artifact_path = tmp_path / "explanations.json"
+    first = RecordingBackend("model-a")
+    run(first, words_path, artifact_path, rate=0, limit=1)
+    again = RecordingBackend("model-a")
+    explanations = run(again, words_path, artifact_path, rate=0)
+
+    assert first.calls == ["maison"] and again.calls == ["chat"]
+    assert set(explanations) == {"maison|feminine", "chat|masculine"}
+
+def test_checkpoints_are_not_shared_between_models(tmp_path, words_path):
+    artifact_path = tmp_path / "explanations.json"
+    run(StubBackend(), words_path, artifact_path, rate=0)
+    backend = RecordingBackend("mistral-small-latest")
+    run(backend, words_path, artifact_path, rate=0)
+
+    assert backend.calls == ["maison", "chat"]
+    served = PregeneratedExplanations(artifact_path)
+    assert served.model == "mistral-small-latest"
+    assert served.get("Maison", "feminine") == "mistral-small-latest: maison is feminine"
+
+def test_stub_artifacts_are_not_served(tmp_path, words_path):
+    artifact_path = tmp_path / "explanations.json"
+    run(StubBackend(), words_path, artifact_path, rate=0)
+
+    served = PregeneratedExplanations(artifact_path)
+    assert len(served) == 0 and served.get("maison", "feminine") is None
+
+def test_missing_artifact_serves_nothing(tmp_path):
+    assert len(PregeneratedExplanations(tmp_path / "missing.json")) == 0
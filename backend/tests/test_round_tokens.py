@@ -0,0 +1,112 @@
+import pytest
+
+import round_tokens
+import signing
+
+CHALLENGES = [
+    {
+        "original_sentence": "Le président a parlé.",
+        "display_sentence": "La président a parlé.",
+        "target_noun": {"word": "président", "gender": "masculine"},
+        "is_correct": False
+    },
+    {"target_noun": {"word": "voiture", "gender": "feminine"}, "round_type": "word_check"}
+]
+
+def issue(index: int = 0, round_type: str = "sentence_check", score: int = 0) -> str:
+    compact = [round_tokens.compact_challenge(challenge) for challenge in CHALLENGES]
+    return round_tokens.issue("game_1", compact, index, round_type, score)
+
+def tamper(token: str) -> str:
+    body, _, signature = token.partition(".")
+    flipped = "A" if body[5] != "A" else "B"
+    return f"{body[:5]}{flipped}{body[6:]}.{signature}"
+
+def test_sign_verify_round_trip():
+    payload = {"g": "game_1", "n": [1, 2, 3], "s": "é"}
+    assert signing.verify(signing.sign(payload)) == payload
+
+def test_tampered_body_is_rejected():
+    with pytest.raises(signing.InvalidToken):
+        signing.verify(tamper(signing.sign({"s": 1})))
+
+def test_tampered_signature_is_rejected():
+    body, _, signature = signing.sign({"s": 1}).partition(".")
+    with pytest.raises(signing.InvalidToken):
+        signing.verify(f"{body}.{signature[::-1]}")
+
+def test_other_key_is_rejected():
+    with pytest.raises(signing.InvalidToken):
+        signing.verify(signing.sign({"s": 1}, key=b"another-key"))
+
+@pytest.mark.parametrize("token", ["", ".", "no-dot", "abc.", ".abc", "a.b.c", "game_12345_challenge_3"])
+def test_malformed_tokens_are_rejected(token):
+    with pytest.raises(signing.InvalidToken):
+        signing.verify(token)
+
+def test_signed_non_json_body_is_rejected():
+    body = signing._b64encode(b"not json")
+    with pytest.raises(signing.InvalidToken):
+        signing.verify(f"{body}.{signing._signature(body, signing.SIGNING_KEY)}")
+
+def test_round_token_round_trip():
+    round_info = round_tokens.read(issue(index=1, round_type="word_check", score=3))
+    assert round_info["game_id"] == "game_1"
+    assert round_info["index"] == 1
+    assert round_info["round_type"] == "word_check"
+    assert round_info["score"] == 3
+    assert round_tokens.challenge(round_info, 0)["display_sentence"] == "La président a parlé."
+    assert round_tokens.challenge(round_info, 1)["target_noun"] == {"word": "voiture", "gender": "feminine"}
+
+def test_tampered_round_token_is_rejected():
+    with pytest.raises(signing.InvalidToken):
+        round_tokens.read(tamper(issue()))
+
+@pytest.mark.parametrize("payload", [
+    {"c": [], "i": 0, "t": "s", "s": 0},                      # No game id
+    {"g": "game_1", "c": [[]], "i": 0, "t": "x", "s": 0},     # Unknown round type
+    {"g": "game_1", "c": [[]], "i": "one", "t": "s", "s": 0}, # Non-numeric index
+    {"g": "game_1", "c": "abc", "i": 0, "t": "s", "s": 0},    # Challenges not a list
+    ["not", "an", "object"]
+])
+def test_malformed_round_tokens_are_rejected(payload):
+    with pytest.raises(signing.InvalidToken, match="Malformed"):
+        round_tokens.read(signing.sign(payload))
+
+@pytest.mark.parametrize("index", [-1, 2, 99])
+def test_out_of_range_round_index_is_rejected(index):
+    with pytest.raises(signing.InvalidToken, match="out of range"):
+        round_tokens.read(issue(index=index))
+
+def test_compact_challenge_keeps_display_only_when_it_differs():
+    correct = dict(CHALLENGES[0], display_sentence=CHALLENGES[0]["original_sentence"], is_correct=True)
+    assert round_tokens.compact_challenge(correct)[-1] == ""
+    assert round_tokens.expand_challenge(round_tokens.compact_challenge(correct))["display_sentence"] == \
+        correct["original_sentence"]
+
+def test_five_field_answer_keys_still_expand():
+    challenge = round_tokens.expand_challenge(["s", "La maison est belle.", "maison", "feminine", True])
+    assert challenge["round_type"] == "sentence_check"
+    assert challenge["display_sentence"] == "La maison est belle."
+
+def test_answer_key_round_trip():
+    compact = [round_tokens.compact_challenge(challenge) for challenge in CHALLENGES]
+    key = round_tokens.read_answer_key(round_tokens.issue_answer_key("game_1", compact, {2, 0}, 2))
+    assert key == {"game_id": "game_1", "challenges": compact, "answered": {0, 2}, "score": 2}
+    assert [round_type for round_type, _ in round_tokens.manifest_rounds(compact)] == \
+        ["sentence_check", "word_check", "word_check"]
+
+def test_answer_key_without_progress_starts_the_game():
+    key = round_tokens.read_answer_key(signing.sign({"g": "game_1", "c": []}))
+    assert key["answered"] == set() and key["score"] == 0
+
+@pytest.mark.parametrize("payload", [
+    {"c": []},
+    {"g": "game_1", "c": {}},
+    {"g": "game_1", "c": [], "a": ["x"]},
+    {"g": "game_1", "c": [], "a": 3},
+    {"g": "game_1", "c": [], "s": "many"}
+])
+def test_malformed_answer_keys_are_rejected(payload):
+    with pytest.raises(signing.InvalidToken, match="Malformed"):
+        round_tokens.read_answer_key(signing.sign(payload))
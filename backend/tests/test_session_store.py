@@ -0,0 +1,176 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import session_store
+from session_store import InMemorySessionStore, SQLiteSessionStore
+
+class Session:
+    def __init__(self, session_id: str, score: int = 0):
+        self.session_id = session_id
+        self.score = score
+
+    def to_dict(self):
+        return {"session_id": self.session_id, "score": self.score}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["session_id"], data["score"])
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable wall clock for the store's access times"""
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(session_store, "time", SimpleNamespace(time=lambda: now.value,
+                                                               monotonic=lambda: now.value))
+    return now
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "sessions.db"
+
+def sqlite_store(db_path, **options) -> SQLiteSessionStore:
+    settings = dict(idle_ttl=60, max_entries=100, batch_size=100, flush_interval=3600)
+    settings.update(options)
+    return SQLiteSessionStore(Session.from_dict, db_path, **settings)
+
+def test_buffered_writes_are_read_back_before_commit(db_path, clock):
+    store, other = sqlite_store(db_path), sqlite_store(db_path)
+    store.put(Session("a", score=3))
+
+    assert store.get("a").score == 3
+    assert other.get("a") is None
+    assert store.metrics()["pending_writes"] == 1 and store.metrics()["commits"] == 0
+
+    store.flush()
+    assert other.get("a").score == 3
+    assert store.metrics()["pending_writes"] == 0 and store.metrics()["commits"] == 1
+
+def test_batch_size_triggers_one_commit(db_path, clock):
+    store, other = sqlite_store(db_path, batch_size=3), sqlite_store(db_path)
+    for index in range(3):
+        store.put(Session(f"s{index}"))
+
+    metrics = store.metrics()
+    assert metrics["commits"] == 1 and metrics["rows_written"] == 3 and metrics["live_sessions"] == 3
+    assert all(other.get(f"s{index}") is not None for index in range(3))
+
+def test_flush_interval_commits_old_writes(db_path, clock):
+    store = sqlite_store(db_path, flush_interval=1)
+    store.put(Session("a"))
+    assert store.metrics()["commits"] == 0
+    clock.value += 2
+    store.put(Session("b"))
+    assert store.metrics()["commits"] == 1 and store.metrics()["live_sessions"] == 2
+
+def test_delete_is_buffered_too(db_path, clock):
+    store, other = sqlite_store(db_path), sqlite_store(db_path)
+    store.put(Session("a"))
+    store.flush()
+    store.delete("a")
+
+    assert store.get("a") is None
+    assert other.get("a") is not None
+    store.flush()
+    assert other.get("a") is None
+
+def test_idle_sessions_expire_on_get(db_path, clock):
+    store = sqlite_store(db_path, idle_ttl=60)
+    store.put(Session("a"))
+    clock.value += 61
+    assert store.get("a") is None
+    assert store.metrics()["expired"] == 1
+
+def test_access_keeps_a_session_alive(db_path, clock):
+    store = sqlite_store(db_path, idle_ttl=60)
+    store.put(Session("a"))
+    store.flush()
+    clock.value += 50
+    assert store.get("a") is not None  # Touch is buffered, then committed by the sweep
+    clock.value += 50
+    assert store.sweep() == 0
+    assert store.get("a") is not None
+
+def test_sweep_flushes_and_removes_idle_sessions(db_path, clock):
+    store = sqlite_store(db_path, idle_ttl=60)
+    store.put(Session("old"))
+    clock.value += 61
+    store.put(Session("new"))
+
+    assert store.sweep() == 1
+    metrics = store.metrics()
+    assert metrics["pending_writes"] == 0 and metrics["live_sessions"] == 1
+    assert store.get("old") is None and store.get("new") is not None
+
+def test_sweep_evicts_least_recently_used_overflow(db_path, clock):
+    store = sqlite_store(db_path, max_entries=2)
+    for session_id in ("a", "b", "c"):
+        store.put(Session(session_id))
+        clock.value += 1
+
+    assert store.sweep() == 1
+    assert store.metrics()["evicted_lru"] == 1
+    assert store.get("a") is None
+    assert store.get("b") is not None and store.get("c") is not None
+
+def test_close_commits_pending_writes(db_path, clock):
+    store = sqlite_store(db_path)
+    store.put(Session("a"))
+    store.close()
+    assert sqlite_store(db_path).get("a") is not None
+
+def test_sweeper_flushes_and_sweeps_in_a_worker_thread(db_path):
+    store = sqlite_store(db_path, flush_interval=0.01)
+    calls = []
+    for name in ("flush", "sweep"):
+        def record(method=getattr(store, name), name=name):
+            calls.append((name, threading.current_thread() is threading.main_thread()))
+            return method()
+        setattr(store, name, record)
+
+    async def run_sweeper():
+        sweeper = session_store.SessionSweeper(store, interval=0.05)
+        sweeper.start()
+        await asyncio.sleep(0.2)
+        await sweeper.stop()
+
+    asyncio.run(run_sweeper())
+    assert {name for name, _ in calls} == {"flush", "sweep"}
+    assert not any(on_event_loop for _, on_event_loop in calls)
+
+def test_in_memory_store_expires_idle_sessions_on_get(clock):
+    store = InMemorySessionStore(idle_ttl=60, max_entries=10)
+    store.put(Session("a"))
+    clock.value += 50
+    assert store.get("a") is not None  # Access refreshes the idle timer
+    clock.value += 50
+    assert store.get("a") is not None
+    clock.value += 61
+    assert store.get("a") is None
+    assert store.metrics()["expired"] == 1 and len(store) == 0
+
+def test_in_memory_store_delete(clock):
+    store = InMemorySessionStore(idle_ttl=60, max_entries=10)
+    store.put(Session("a"))
+    store.delete("a")
+    store.delete("missing")
+    assert store.get("a") is None
+
+def test_in_memory_store_sweeps_idle_and_overflow(clock):
+    store = InMemorySessionStore(idle_ttl=60, max_entries=2)
+    for session_id in ("a", "b", "c"):
+        store.put(Session(session_id))
+        clock.value += 1
+    assert store.get("a") is None  # Evicted as least recently used on put
+
+    clock.value += 61
+    store.put(Session("d"))  # Evicts "b", leaving "c" idle
+    assert store.sweep() == 1
+    assert store.metrics()["evicted_lru"] == 2 and store.metrics()["expired"] == 1
+    assert len(store) == 1 and store.get("d") is not None
+
+def test_session_store_is_abstract():
+    with pytest.raises(TypeError):
+        session_store.SessionStore()
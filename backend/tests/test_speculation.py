@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from speculation import SpeculationBudget
+
+def run(coroutine_function):
+    return asyncio.run(coroutine_function())
+
+def slow(result: str = "explanation", delay: float = 3600):
+    async def factory():
+        await asyncio.sleep(delay)
+        return result
+    return factory
+
+async def settle():
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+def test_started_task_is_taken_and_claimed():
+    async def scenario():
+        budget = SpeculationBudget(max_in_flight=2)
+        task = budget.start("round", slow(delay=0))
+        assert budget.start("round", slow()) is task  # Same round served again
+        assert await budget.claim(budget.take("round")) == "explanation"
+        assert budget.take("round") is None
+        return budget.metrics()
+
+    metrics = run(scenario)
+    assert metrics["started"] == 1 and metrics["used"] == 1
+    assert metrics["in_flight"] == 0 and metrics["pending"] == 0
+
+def test_speculation_beyond_the_cap_is_skipped_not_queued():
+    async def scenario():
+        budget = SpeculationBudget(max_in_flight=2)
+        started = [budget.start(index, slow()) for index in range(3)]
+        metrics = budget.metrics()
+        for task in started:
+            budget.discard(task)
+        await settle()
+        return started, metrics, budget.metrics()
+
+    started, during, after = run(scenario)
+    assert started[2] is None
+    assert during["in_flight"] == 2 and during["skipped"] == 1
+    assert after["in_flight"] == 0 and after["cancelled"] == 2
+
+def test_oldest_pending_speculation_is_cancelled_beyond_max_pending():
+    async def scenario():
+        budget = SpeculationBudget(max_in_flight=10, max_pending=2)
+        tasks = [budget.start(index, slow()) for index in range(3)]
+        await settle()
+        cancelled = [task.cancelled() for task in tasks]
+        for index in (1, 2):
+            budget.discard(budget.take(index))
+        await settle()
+        return cancelled, budget.take(0), budget.metrics()
+
+    cancelled, evicted, metrics = run(scenario)
+    assert cancelled == [True, False, False]
+    assert evicted is None
+    assert metrics["cancelled"] == 3 and metrics["in_flight"] == 0
+
+def test_claim_returns_none_for_failed_or_cancelled_speculation():
+    async def failing():
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        budget = SpeculationBudget()
+        failed = budget.start("failed", failing)
+        cancelled = budget.start("cancelled", slow())
+        budget.discard(cancelled)
+        results = await budget.claim(failed), await budget.claim(cancelled)
+        await settle()
+        return results + (budget.metrics(),)
+
+    failed, cancelled, metrics = run(scenario)
+    assert failed is None and cancelled is None
+    assert metrics["used"] == 0 and metrics["in_flight"] == 0
+
+def test_cancelled_request_propagates_and_leaves_the_speculation_running():
+    async def scenario():
+        budget = SpeculationBudget()
+        task = budget.start("round", slow(delay=0.05))
+        claimer = asyncio.create_task(budget.claim(task))
+        await settle()
+        claimer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await claimer
+        return await task  # Still finishes, and caches its explanation for the next request
+
+    assert run(scenario) == "explanation"
+
+def test_disabled_budget_starts_nothing():
+    async def scenario():
+        budget = SpeculationBudget(enabled=False)
+        return budget.start("round", slow()), budget.metrics()
+
+    task, metrics = run(scenario)
+    assert task is None and metrics["skipped"] == 1 and metrics["enabled"] == 0
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import time
+
+from explanation_cache import ExplanationCache
+from fake_mistral import FakeMistral, _chunk
+from mistral_client import MistralFeedbackClient
+
+FALLBACK = "The word 'maison' is feminine."
+
+class StallingChat:
+    """Streams one chunk, then never sends another"""
+
+    async def stream_async(self, **kwargs):
+        async def events():
+            yield _chunk("Maison ")
+            await asyncio.sleep(3600)
+        return events()
+
+class StallingMistral:
+    model_name = "stalling"
+
+    def __init__(self):
+        self.chat = StallingChat()
+
+def feedback_client(client, **options) -> MistralFeedbackClient:
+    return MistralFeedbackClient(cache=ExplanationCache(db_path=None), client=client, **options)
+
+def collect(client: MistralFeedbackClient):
+    async def run():
+        return [chunk async for chunk in client.stream_gender_rule("maison", "feminine")]
+    return asyncio.run(run())
+
+def test_stream_yields_chunks_and_caches_the_full_text():
+    client = feedback_client(FakeMistral(latency=0, token_delay=0))
+    chunks = collect(client)
+    assert len(chunks) > 1
+    assert collect(client) == ["".join(chunks).strip()]  # Served from the cache
+    assert client._client.chat.calls == 1
+
+def test_waiting_for_a_slot_counts_toward_the_deadline():
+    client = feedback_client(FakeMistral(latency=0, token_delay=0), max_concurrency=1, deadline=0.1)
+
+    async def run():
+        await client._semaphore.acquire()  # Every slot busy
+        started = time.monotonic()
+        chunks = [chunk async for chunk in client.stream_gender_rule("maison", "feminine")]
+        return chunks, time.monotonic() - started
+
+    chunks, elapsed = asyncio.run(run())
+    assert chunks == [FALLBACK]
+    assert elapsed < 1
+    assert client._client.chat.calls == 0
+
+def test_stalled_stream_times_out_and_frees_its_slot():
+    client = feedback_client(StallingMistral(), max_concurrency=1, stream_idle_timeout=0.1)
+    assert collect(client) == ["Maison "]
+    assert not client._semaphore.locked()
+    assert client.cache.summary()["writes"] == 0  # Partial text isn't cached
+
+def test_slot_is_freed_while_a_slow_client_reads():
+    client = feedback_client(FakeMistral(latency=0, token_delay=0), max_concurrency=1)
+
+    async def run():
+        stream = client.stream_gender_rule("maison", "feminine")
+        await stream.__anext__()
+        await asyncio.sleep(0.05)  # Upstream finishes while the client holds the stream
+        locked = client._semaphore.locked()
+        await stream.aclose()
+        return locked
+
+    assert asyncio.run(run()) is False
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+def test_sse_sends_verdict_then_tokens_then_done(app_client):
+    game_round = app_client.post("/api/start-game", json={"language_level": "beginner", "mode": "vocabulary"}).json()
+    wrong_choice = "left" if game_round["correct_answer"] else "right"
+    response = app_client.post("/api/submit-answer/stream",
+                               json={"round_id": game_round["round_id"], "user_choice": wrong_choice})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "verdict" and names[-1] == "done"
+    assert set(names[1:-1]) == {"token"}
+
+    verdict = events[0][1]
+    assert verdict["is_correct"] is False and verdict["next_round"]["round_id"]
+    tokens = "".join(data for name, data in events if name == "token")
+    assert events[-1][1]["explanation"] == tokens and tokens
+
+def test_sse_correct_answer_has_no_tokens(app_client):
+    game_round = app_client.post("/api/start-game", json={"language_level": "beginner", "mode": "vocabulary"}).json()
+    right_choice = "right" if game_round["correct_answer"] else "left"
+    response = app_client.post("/api/submit-answer/stream",
+                               json={"round_id": game_round["round_id"], "user_choice": right_choice})
+    events = parse_events(response.text)
+    assert [name for name, _ in events] == ["verdict", "done"]
+    assert events[1][1]["explanation"] == events[0][1]["explanation"]
@@ -0,0 +1,63 @@
+"""
+In-memory, level-indexed vocabulary from words.json for word-only games (no scraping, spaCy or LLM)
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+from gender_lexicon import SUFFIX_RULES, SuffixTrie, normalize
+
+WORDS_PATH = Path(__file__).parent / "words.json"
+LANGUAGE_LEVELS = ("beginner", "intermediate", "advanced")
+
+def word_level(word: str, gender: str, suffixes: SuffixTrie) -> str:
+    """Short regular words are beginner, long words or ones that break the ending rules are advanced"""
+    rule_gender = suffixes.lookup(normalize(word))
+    if (rule_gender and rule_gender != gender) or len(word) >= 10:
+        return "advanced"
+    if len(word) <= 6:
+        return "beginner"
+    return "intermediate"
+
+class VocabularyIndex:
+    def __init__(self, words_path: Path = WORDS_PATH):
+        with open(words_path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+
+        # Deduplicated entries as ready-to-serve noun records, plus index arrays per level
+        suffixes = SuffixTrie(SUFFIX_RULES)
+        self.nouns: List[Dict] = []
+        self.level_index: Dict[str, List[int]] = {level: [] for level in LANGUAGE_LEVELS}
+        seen = set()
+        for entry in entries:
+            key = (normalize(entry["word"]), entry["gender"])
+            if key in seen:
+                continue
+            seen.add(key)
+            level = word_level(entry["word"], entry["gender"], suffixes)
+            self.level_index[level].append(len(self.nouns))
+            self.nouns.append({
+                "word": entry["word"],
+                "gender": entry["gender"],
+                "article": "le" if entry["gender"] == "masculine" else "la",
+                "translation": entry.get("translation", ""),
+                "level": level
+            })
+
+    def __len__(self) -> int:
+        return len(self.nouns)
+
+    def sample(self, language_level: str, count: int) -> List[Dict]:
+        """Draw count distinct nouns for a level without scanning the vocabulary"""
+        indices = self.level_index.get(language_level, self.level_index["advanced"])
+        if len(indices) < count:
+            indices = range(len(self.nouns))
+        return [self.nouns[i] for i in random.sample(indices, count)]
+
+    def challenges(self, language_level: str, count: int) -> List[Dict]:
+        """Word-check-only challenges for a vocabulary game"""
+        return [
+            {"target_noun": noun, "round_type": "word_check"}
+            for noun in self.sample(language_level, count)
+        ]